@@ -0,0 +1,58 @@
+"""
+Micro-benchmark of the embedding index: top-k search over a memory-mapped matrix of random unit vectors.
+
+    python -m benchmarks.embeddings --entries 50000 --dimensions 256
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from src.models.Post import Post
+from src.services.EmbeddingIndexService import EmbeddingIndexService
+
+
+def build_index(directory: str, entries: int, dimensions: int) -> EmbeddingIndexService:
+    """An index of entries random posts; the embedding function returns random vectors."""
+    rng = np.random.default_rng(0)
+    index = EmbeddingIndexService(lambda texts: rng.standard_normal((len(texts), dimensions)), directory).load()
+    index.add_posts(Post(title=f"Post {i}", content="", tags=[], source_link=f"https://example.com/{i}")
+                    for i in range(entries))
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=50000)
+    parser.add_argument('--dimensions', type=int, default=256)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        build_index(directory, args.entries, args.dimensions)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = EmbeddingIndexService(lambda texts: [], directory).load()
+        load = time.perf_counter() - start
+
+        queries = np.random.default_rng(1).standard_normal((args.queries, args.dimensions)).astype(np.float32)
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, k=args.k, kind='post')
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+
+    print(f"{args.entries} entries x {args.dimensions} dimensions")
+    print(f"build {build * 1000:.0f} ms, load {load * 1000:.0f} ms")
+    print(f"search p50 {samples[len(samples) // 2] * 1000:.2f} ms, "
+          f"p99 {samples[int(len(samples) * 0.99)] * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
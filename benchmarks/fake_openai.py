@@ -0,0 +1,362 @@
+"""
+Local stand-in for the OpenAI chat completions and embeddings endpoints, with fault injection.
+
+Point OpenAIService at it with OPENAI_BASE_URL (or OpenAIConfig.base_url):
+
+    python -m benchmarks.fake_openai --port 8089 --latency lognormal:800,0.5 --rate-limit 0.1 --error-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=fake python main.py process_items
+
+Responses are well-formed posts (or headline picks) unless a fault is injected:
+
+    --latency        constant:MS | uniform:LO_MS,HI_MS | lognormal:MEDIAN_MS,SIGMA
+    --rate-limit     share of requests answered 429 with a Retry-After header
+    --rpm            requests per minute before every request is answered 429
+    --max-in-flight  concurrent requests before new ones are answered 429
+    --error-rate     share of requests answered 500, 502 or 503
+    --malformed-rate share of completions whose content is not valid JSON
+    --markdown-rate  share of posts with markdown in their content
+
+GET /stats returns the number of requests, by outcome.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional, Tuple
+
+_WORDS = ("engineering teams platform latency model agents startup cloud pricing developers open source "
+          "security inference chips regulation data product launch funding benchmark reliability").split()
+
+_MARKDOWN = "## Why it matters\n\n**Bold claim.** Here is a list:\n- one\n- two\n\n"
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parse a --latency spec into a function returning a delay in seconds."""
+    kind, _, values = spec.partition(':')
+    numbers = [float(value) for value in values.split(',') if value]
+    if kind == 'constant' and len(numbers) == 1:
+        return lambda rng: numbers[0] / 1000
+    if kind == 'uniform' and len(numbers) == 2:
+        return lambda rng: rng.uniform(numbers[0], numbers[1]) / 1000
+    if kind == 'lognormal' and len(numbers) == 2:
+        # The median of a lognormal distribution is exp(mu).
+        return lambda rng: rng.lognormvariate(0.0, numbers[1]) * numbers[0] / 1000
+    raise argparse.ArgumentTypeError(f"invalid latency {spec!r}; use constant:MS, uniform:LO,HI or lognormal:MEDIAN,SIGMA")
+
+
+@dataclass
+class FaultProfile:
+    """How the stand-in misbehaves."""
+    latency: Callable[[random.Random], float] = field(default_factory=lambda: parse_latency('constant:0'))
+    rate_limit: float = 0.0
+    retry_after: float = 1.0
+    rpm: Optional[int] = None
+    max_in_flight: Optional[int] = None
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    markdown_rate: float = 0.0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> 'FaultProfile':
+        return cls(latency=args.latency, rate_limit=args.rate_limit, retry_after=args.retry_after, rpm=args.rpm,
+                   max_in_flight=args.max_in_flight, error_rate=args.error_rate,
+                   malformed_rate=args.malformed_rate, markdown_rate=args.markdown_rate, seed=args.seed)
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the FaultProfile options to parser (shared with the load driver)."""
+    parser.add_argument('--latency', type=parse_latency, default=parse_latency('constant:0'),
+                        help='Response latency: constant:MS, uniform:LO,HI or lognormal:MEDIAN,SIGMA.')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Share of requests answered 429.')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds of injected 429s.')
+    parser.add_argument('--rpm', type=int, help='Requests per minute before requests are answered 429.')
+    parser.add_argument('--max-in-flight', type=int, help='Concurrent requests before requests are answered 429.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered 500/502/503.')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Share of completions that are not JSON.')
+    parser.add_argument('--markdown-rate', type=float, default=0.0, help='Share of posts containing markdown.')
+    parser.add_argument('--seed', type=int, help='Seed of the fault and latency draws.')
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering like the OpenAI API, according to a FaultProfile."""
+
+    daemon_threads = True
+
+    def __init__(self, profile: FaultProfile, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.profile = profile
+        self.stats: Counter = Counter()
+        self._rng = random.Random(profile.seed)
+        self._lock = threading.Lock()
+        self._window: deque = deque()
+        self._in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'FakeOpenAIServer':
+        """Serve on a background thread. Returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-openai', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def handle_error(self, request, client_address) -> None:
+        """Ignore clients dropping the connection; OpenAIService aborts streams it cannot use."""
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add amount to a /stats counter; handler threads update them concurrently."""
+        with self._lock:
+            self.stats[name] += amount
+
+    def snapshot(self) -> dict:
+        """A consistent copy of the /stats counters."""
+        with self._lock:
+            return dict(self.stats)
+
+    def draw(self) -> float:
+        """A uniform random number; the generator is shared between handler threads."""
+        with self._lock:
+            return self._rng.random()
+
+    def choice(self, options):
+        with self._lock:
+            return self._rng.choice(options)
+
+    def admit(self) -> Tuple[Optional[int], float]:
+        """
+        Decide the fate of a new request before its latency.
+
+        Returns:
+            Tuple[Optional[int], float]: The error status to answer (None to answer normally),
+            and the Retry-After seconds of a 429.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.stats['requests'] += 1
+            if self.profile.max_in_flight is not None and self._in_flight >= self.profile.max_in_flight:
+                return 429, self.profile.retry_after
+            if self.profile.rpm is not None:
+                while self._window and self._window[0] <= now - 60:
+                    self._window.popleft()
+                if len(self._window) >= self.profile.rpm:
+                    return 429, max(self._window[0] + 60 - now, 0.001)
+                self._window.append(now)
+            draw = self._rng.random()
+            if draw < self.profile.rate_limit:
+                return 429, self.profile.retry_after
+            if draw < self.profile.rate_limit + self.profile.error_rate:
+                return self._rng.choice((500, 502, 503)), 0.0
+            self._in_flight += 1
+            return None, 0.0
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def latency(self) -> float:
+        with self._lock:
+            return self.profile.latency(self._rng)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeOpenAIServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Stay quiet; /stats has the counts."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.server.snapshot())
+        else:
+            self._send_json(404, _error("Not found", "invalid_request_error"))
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        path = self.path.rstrip('/')
+        if not path.endswith(('/chat/completions', '/embeddings')):
+            self._send_json(404, _error("Not found", "invalid_request_error"))
+            return
+
+        status, retry_after = self.server.admit()
+        if status == 429:
+            self.server.count('rate_limited')
+            self._send_json(429, _error("Rate limit reached", "rate_limit_error", "rate_limit_exceeded"),
+                            {'Retry-After': f"{retry_after:g}", 'Retry-After-Ms': str(int(retry_after * 1000))})
+            return
+        if status is not None:
+            self.server.count('server_errors')
+            self._send_json(status, _error("The server had an error", "server_error"))
+            return
+
+        try:
+            time.sleep(self.server.latency())
+            if path.endswith('/embeddings'):
+                self._send_json(200, _embeddings(body))
+            elif body.get('stream'):
+                try:
+                    self._stream(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client aborted the stream, as OpenAIService does with unusable output.
+                    self.server.count('client_aborted')
+                    self.close_connection = True
+                    return
+            else:
+                self._send_json(200, self._completion(body))
+            self.server.count('ok')
+        finally:
+            self.server.release()
+
+    # ------------------------------------------------------------------
+    # Responses
+    # ------------------------------------------------------------------
+
+    def _contents(self, body: dict) -> List[str]:
+        """The message content of each of the n choices."""
+        messages = body.get('messages', [])
+        user = next((m.get('content', '') for m in reversed(messages) if m.get('role') == 'user'), '')
+        contents = []
+        for _ in range(body.get('n') or 1):
+            if self.server.draw() < self.server.profile.malformed_rate:
+                self.server.count('malformed')
+                contents.append(self.server.choice(('{"title": "Cut off', 'Sure! Here is your post:', '')))
+            elif '<new_list>' in user:
+                ids = re.findall(r'^\[(\w+)\]', user, re.MULTILINE)
+                contents.append(json.dumps({'chosen_headline_id': self.server.choice(ids) if ids else 'missing'}))
+            else:
+                markdown = self.server.draw() < self.server.profile.markdown_rate
+                self.server.count('markdown', markdown)
+                contents.append(json.dumps(_post(user, markdown)))
+        return contents
+
+    def _completion(self, body: dict) -> dict:
+        contents = self._contents(body)
+        return {
+            'id': f"chatcmpl-fake{random.getrandbits(32):08x}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+            'choices': [{'index': i, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}
+                        for i, content in enumerate(contents)],
+            'usage': _usage(body, contents),
+        }
+
+    def _stream(self, body: dict) -> None:
+        """Send the first choice as server-sent events, a few characters per chunk."""
+        content = self._contents({**body, 'n': 1})[0]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        chunk = {'id': f"chatcmpl-fake{random.getrandbits(32):08x}", 'object': 'chat.completion.chunk',
+                 'created': int(time.time()), 'model': body.get('model', 'fake')}
+        for start in range(0, len(content), 40):
+            delta = {'content': content[start:start + 40]}
+            self._write_event({**chunk, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': None}]})
+        self._write_event({**chunk, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})
+        if (body.get('stream_options') or {}).get('include_usage'):
+            self._write_event({**chunk, 'choices': [], 'usage': _usage(body, [content])})
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_event(self, data: dict) -> None:
+        self._write_chunk(f"data: {json.dumps(data)}\n\n".encode('utf-8'))
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, data: dict, headers: Optional[dict] = None) -> None:
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _error(message: str, error_type: str, code: Optional[str] = None) -> dict:
+    return {'error': {'message': message, 'type': error_type, 'param': None, 'code': code}}
+
+
+def _post(article: str, markdown: bool) -> dict:
+    """A plausible post of about 1300 characters drawn from the article's words."""
+    rng = random.Random(article)
+    words = re.findall(r'[A-Za-z]{4,}', article) or _WORDS
+    sentences = []
+    while sum(len(sentence) + 1 for sentence in sentences) < 1300:
+        sentence = ' '.join(rng.choice(words) for _ in range(rng.randint(8, 16)))
+        sentences.append(sentence[0].upper() + sentence[1:] + '.')
+    content = (_MARKDOWN if markdown else '') + ' '.join(sentences)
+    return {
+        'title': ' '.join(rng.choice(words) for _ in range(6)).capitalize(),
+        'content': content,
+        'tags': [f"#{rng.choice(_WORDS)}" for _ in range(rng.randint(3, 5))],
+    }
+
+
+def _usage(body: dict, contents: List[str]) -> dict:
+    """Token counts estimated at four characters per token."""
+    prompt = sum(len(str(message.get('content', ''))) for message in body.get('messages', [])) // 4
+    completion = sum(len(content) for content in contents) // 4
+    return {'prompt_tokens': prompt, 'completion_tokens': completion, 'total_tokens': prompt + completion,
+            'prompt_tokens_details': {'cached_tokens': 0}}
+
+
+def _embeddings(body: dict) -> dict:
+    """Deterministic pseudo-random unit vectors, one per input."""
+    inputs = body.get('input', [])
+    inputs = [inputs] if isinstance(inputs, str) else inputs
+    dimensions = body.get('dimensions') or 1536
+    data = []
+    for i, text in enumerate(inputs):
+        rng = random.Random(hashlib.sha1(str(text).encode('utf-8')).digest())
+        vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+        norm = sum(value * value for value in vector) ** 0.5
+        data.append({'object': 'embedding', 'index': i, 'embedding': [value / norm for value in vector]})
+    tokens = sum(len(str(text)) for text in inputs) // 4
+    return {'object': 'list', 'data': data, 'model': body.get('model', 'fake'),
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Local OpenAI stand-in with fault injection.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(FaultProfile.from_args(args), args.host, args.port)
+    print(f"Serving on {server.base_url} (OPENAI_BASE_URL)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.snapshot()))
+
+
+if __name__ == '__main__':
+    main()
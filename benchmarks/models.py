@@ -0,0 +1,54 @@
+"""
+Micro-benchmark of building models from stored rows: plain constructor vs. from_dynamodb_item.
+
+    python -m benchmarks.models --rows 10000
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from src.models.Post import Post
+from src.models.RSSItem import RSSItem
+
+
+def make_rows(count: int):
+    """Rows shaped like model_dump output, as DynamoDB returns them."""
+    start = datetime(2024, 9, 16, tzinfo=timezone.utc)
+    items, posts = [], []
+    for i in range(count):
+        item = RSSItem(
+            title=f"Headline {i}",
+            link=f"https://techcrunch.com/2024/09/16/story-{i}/",
+            creator="Jane Doe",
+            pub_date=start - timedelta(minutes=i),
+            categories=["AI", "Startups"],
+            guid=f"https://techcrunch.com/?p={i}",
+            description="A short teaser.",
+        )
+        items.append(item.model_dump())
+        post = Post(title=f"Post {i}", content="Body " * 50, tags=["ai", "startups"], source_link=str(item.link))
+        posts.append(post.model_dump())
+    return items, posts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare model construction from stored rows.')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    items, posts = make_rows(args.rows)
+    cases = {
+        'RSSItem(**row)': lambda: [RSSItem(**row) for row in items],
+        'RSSItem.from_dynamodb_item': lambda: [RSSItem.from_dynamodb_item(row) for row in items],
+        'Post(**row)': lambda: [Post(**row) for row in posts],
+        'Post.from_dynamodb_item': lambda: [Post.from_dynamodb_item(row) for row in posts],
+    }
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:<28} {best / args.rows * 1e6:8.2f} us/row")
+
+
+if __name__ == '__main__':
+    main()
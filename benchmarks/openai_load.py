@@ -0,0 +1,137 @@
+"""
+Load driver for the generation layer: pushes generate_post/choose_post through OpenAIService at a set concurrency.
+
+By default it starts benchmarks.fake_openai in-process with the given faults, so retry and
+concurrency settings can be tuned offline against rate limiting and errors:
+
+    python -m benchmarks.openai_load --requests 200 --concurrency 16 --latency lognormal:800,0.5 --rpm 300
+    python -m benchmarks.openai_load --task choose_post --rate-limit 0.2 --retry-after 0.5 --max-retries 4
+    python -m benchmarks.openai_load --base-url http://127.0.0.1:8089/v1   # an already running stand-in
+
+It reports calls/sec, latency percentiles of successful calls, failures by exception type,
+how many HTTP requests the server saw per call, and the app's own OpenAI metrics.
+"""
+
+import argparse
+import json
+import logging
+import time
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.fake_openai import FakeOpenAIServer, FaultProfile, add_fault_arguments
+from benchmarks.pipeline import summarize
+from src.models.OpenAIConfig import OpenAIConfig
+from src.models.Post import Post
+from src.models.RSSItem import RSSItem
+from src.services.OpenAIService import OpenAIService
+from src.utils import metrics
+
+_ARTICLE = ("A startup says its inference chips cut the cost of serving large language models by half. "
+            "Developers get an open source runtime, and cloud providers are already testing the platform. ") * 20
+
+
+def make_candidates(count: int) -> List[RSSItem]:
+    now = datetime.now(timezone.utc)
+    return [RSSItem(title=f"Headline number {i} about inference chips", link=f"https://example.com/story/{i}",
+                    creator="Reporter", pub_date=now - timedelta(minutes=i), categories=["AI"], guid=f"story-{i}",
+                    description="Summary", outlet="Example") for i in range(count)]
+
+
+def make_posts(count: int) -> List[Post]:
+    return [Post(title=f"Earlier post {i}", content="Content of an earlier post.", tags=["#ai"],
+                 source_link=f"https://example.com/earlier/{i}") for i in range(count)]
+
+
+def run_load(service: OpenAIService, task: str, requests: int, concurrency: int) -> Dict:
+    """Call task requests times on concurrency threads; returns the latency summary and failures."""
+    candidates, posted = make_candidates(20), make_posts(10)
+    calls: Dict[str, Callable[[], object]] = {
+        'generate_post': lambda: service.generate_post(_ARTICLE, candidates[0], posted),
+        'choose_post': lambda: service.choose_post(candidates, posted),
+    }
+
+    def one(index: int):
+        name = task if task != 'mixed' else ('choose_post', 'generate_post')[index % 2]
+        start = time.perf_counter()
+        try:
+            calls[name]()
+            return time.perf_counter() - start, None
+        except Exception as e:  # pylint: disable=broad-except
+            return time.perf_counter() - start, type(e).__name__
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, error in outcomes if error is None]
+    return {
+        'elapsed_s': elapsed,
+        'calls_per_s': requests / elapsed,
+        'succeeded': len(latencies),
+        'failed': dict(Counter(error for _, error in outcomes if error is not None)),
+        'latency': summarize(latencies) if latencies else None,
+    }
+
+
+def server_stats(base_url: str) -> Optional[Dict]:
+    """The /stats of a fake_openai server, None if base_url is something else."""
+    try:
+        with urllib.request.urlopen(base_url.rsplit('/v1', 1)[0] + '/stats', timeout=5) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Load driver for OpenAIService against a local stand-in.')
+    parser.add_argument('--task', choices=['generate_post', 'choose_post', 'mixed'], default='generate_post')
+    parser.add_argument('--requests', type=int, default=100, help='Calls to make.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Calls in flight at once.')
+    parser.add_argument('--max-retries', type=int, default=2, help='OpenAI SDK retries (OPENAI_MAX_RETRIES).')
+    parser.add_argument('--timeout', type=float, default=30, help='Seconds per request (OPENAI_TIMEOUT_SECONDS).')
+    parser.add_argument('--candidates', type=int, default=1, help='Best-of-n candidates (OPENAI_POST_CANDIDATES).')
+    parser.add_argument('--stream', action='store_true', help='Stream generate_post (OPENAI_STREAM=1).')
+    parser.add_argument('--base-url', help='Use a running stand-in instead of starting one.')
+    parser.add_argument('--output', help='Write JSON results to this file.')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("AppLogger").setLevel(logging.CRITICAL)
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = FakeOpenAIServer(FaultProfile.from_args(args)).start()
+        base_url = server.base_url
+
+    config = OpenAIConfig(api_key='fake', base_url=base_url, max_retries=args.max_retries,
+                          request_timeout=args.timeout, candidates=args.candidates, stream=args.stream)
+    metrics.metrics.drain()
+    try:
+        results = run_load(OpenAIService(config), args.task, args.requests, args.concurrency)
+        stats = server_stats(base_url)
+    finally:
+        if server is not None:
+            server.stop()
+
+    params = {name: value for name, value in vars(args).items() if name != 'latency'}
+    results = {
+        'params': params,
+        **results,
+        'server': stats,
+        'http_requests_per_call': stats['requests'] / args.requests if stats else None,
+        'app_metrics': metrics.metrics.summary(),
+    }
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+Offline end-to-end benchmark of the aggregation and posting pipeline.
+
+Replays the recorded feeds and article fixtures in benchmarks/fixtures through
+the real services, with a local storage backend and a stubbed OpenAIService,
+and writes machine-readable results that can be compared across commits:
+
+    python -m benchmarks.pipeline --copies 50 --process-runs 20 --output bench.json
+    python -m benchmarks.pipeline --copies 50 --process-runs 20 --compare bench.json
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import main as app
+from benchmarks.replay import FixtureAdapter, StubOpenAIService
+from src.services.ArticleService import ArticleService
+from src.services.RSSService import RSSService
+from src.utils.http_client import get_session
+
+# Stages that are wrapped on service classes, as (class, attribute, stage name).
+_CLASS_STAGES = [
+    (RSSService, 'fetch_feed', 'feed_fetch_parse'),
+    (RSSService, '_parse_item', 'feed_parse_item'),
+    (ArticleService, '_fetch_and_parse_html', 'article_fetch_html2text'),
+    (ArticleService, 'extract_techcrunch_article', 'article_extract'),
+    (ArticleService, 'extract_arstechnica_article', 'article_extract'),
+]
+
+# Stages that are wrapped on service instances, as (attribute, stage name).
+_DB_STAGES = [
+    ('save_rss_items', 'db_save_rss_items'),
+    ('_item_exists', 'db_item_exists'),
+    ('get_latest_posts', 'db_get_latest_posts'),
+    ('get_last_unprocessed_rss_items', 'db_get_last_unprocessed'),
+    ('save_post', 'db_save_post'),
+    ('update_rss_item', 'db_update_rss_item'),
+    ('set_rss_item_article_key', 'db_set_article_key'),
+]
+_FEED_STORE_STAGES = [
+    ('get_object', 'feed_store_get'),
+    ('put_object', 'feed_store_put'),
+    ('update_rss_feed', 'feed_store_update'),
+]
+_OPENAI_STAGES = [
+    ('choose_post', 'openai_choose_post'),
+    ('generate_post', 'openai_generate_post'),
+]
+
+
+class StageRecorder:
+    """Collects per-stage wall-clock samples and allocation deltas."""
+
+    def __init__(self, trace_allocations: bool = False):
+        self.trace_allocations = trace_allocations
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.allocated: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one sample of stage name."""
+        before = tracemalloc.get_traced_memory()[0] if self.trace_allocations else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append(time.perf_counter() - start)
+            if self.trace_allocations:
+                self.allocated[name] += max(tracemalloc.get_traced_memory()[0] - before, 0)
+
+    def wrap(self, func: Callable, name: str) -> Callable:
+        """Return func timed as stage name."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency statistics in milliseconds."""
+    return {
+        'count': len(samples),
+        'mean_ms': sum(samples) / len(samples) * 1000,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p90_ms': percentile(samples, 90) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'max_ms': max(samples) * 1000,
+    }
+
+
+@contextmanager
+def instrument_classes(recorder: StageRecorder) -> Iterator[None]:
+    """Temporarily wrap the static/class methods listed in _CLASS_STAGES."""
+    originals: List[Tuple[type, str, object]] = []
+    try:
+        for cls, attribute, name in _CLASS_STAGES:
+            descriptor = cls.__dict__[attribute]
+            originals.append((cls, attribute, descriptor))
+            wrapped = recorder.wrap(descriptor.__func__, name)
+            setattr(cls, attribute, type(descriptor)(wrapped))
+        yield
+    finally:
+        for cls, attribute, descriptor in reversed(originals):
+            setattr(cls, attribute, descriptor)
+
+
+def instrument_instance(recorder: StageRecorder, obj: object, stages: List[Tuple[str, str]]) -> None:
+    """Wrap bound methods of obj, shadowing them with instance attributes."""
+    for attribute, name in stages:
+        setattr(obj, attribute, recorder.wrap(getattr(obj, attribute), name))
+
+
+def create_services(backend: str, work_dir: str, llm_latency: float):
+    """
+    Create the storage and OpenAI services for one run.
+
+    The aws backend uses DynamoDBService/S3Service, so point DYNAMODB_ENDPOINT_URL
+    and S3_ENDPOINT_URL at local stand-ins (DynamoDB Local, MinIO) before using it.
+    """
+    if backend == 'aws':
+        from src.services.DynamoDBService import DynamoDBService
+        from src.services.S3Service import S3Service
+        db_service, feed_store = DynamoDBService(), S3Service()
+    else:
+        from src.services.FileSystemService import FileSystemService
+        from src.services.SQLiteService import SQLiteService
+        db_service = SQLiteService(os.path.join(work_dir, 'bench.db'))
+        feed_store = FileSystemService(os.path.join(work_dir, 'blobs'))
+    return db_service, feed_store, StubOpenAIService(latency=llm_latency)
+
+
+def run_once(args: argparse.Namespace, recorder: StageRecorder) -> Dict[str, float]:
+    """Run aggregation once and process_items process_runs times. Returns throughput figures."""
+    with tempfile.TemporaryDirectory(prefix='linkedinfluencer-bench-') as work_dir:
+        db_service, feed_store, openai_service = create_services(args.backend, work_dir, args.llm_latency)
+        instrument_instance(recorder, db_service, _DB_STAGES)
+        instrument_instance(recorder, feed_store, _FEED_STORE_STAGES)
+        instrument_instance(recorder, openai_service, _OPENAI_STAGES)
+
+        with instrument_classes(recorder):
+            start = time.perf_counter()
+            with recorder.stage('aggregate_news'):
+                app.aggregate_news(RSSService(), db_service, feed_store)
+            aggregate_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(args.process_runs):
+                with recorder.stage('process_items'):
+                    app.process_rss_items(db_service, openai_service, feed_store)
+            process_seconds = time.perf_counter() - start
+
+    feed_items = len(recorder.samples['feed_parse_item'])
+    return {
+        'feed_items': feed_items,
+        'aggregate_items_per_sec': feed_items / aggregate_seconds if aggregate_seconds else 0.0,
+        'process_items_per_sec': args.process_runs / process_seconds if process_seconds else 0.0,
+    }
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def git_commit() -> str:
+    """The current commit, or 'unknown' outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return a description of every stage whose p50 regressed by more than threshold."""
+    regressions = []
+    for name, stats in current['stages'].items():
+        base = baseline.get('stages', {}).get(name)
+        if base and base['p50_ms'] > 0 and stats['p50_ms'] > base['p50_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p50 {base['p50_ms']:.3f}ms -> {stats['p50_ms']:.3f}ms")
+    for name, value in current['throughput'].items():
+        base = baseline.get('throughput', {}).get(name)
+        if name.endswith('_per_sec') and base and value < base * (1 - threshold):
+            regressions.append(f"{name}: {base:.1f} -> {value:.1f}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Offline benchmark of the aggregation and posting pipeline.')
+    parser.add_argument('--backend', choices=['local', 'aws'], default='local',
+                        help='Storage backend; aws expects local stand-ins configured via *_ENDPOINT_URL.')
+    parser.add_argument('--copies', type=int, default=20, help='Replicate every recorded feed item this often.')
+    parser.add_argument('--process-runs', type=int, default=10, help='Number of process_items invocations.')
+    parser.add_argument('--http-latency', type=float, default=0.0, help='Simulated seconds per HTTP request.')
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='Simulated seconds per OpenAI call.')
+    parser.add_argument('--no-allocations', action='store_true',
+                        help='Skip the separate allocation-tracing pass.')
+    parser.add_argument('--prefetch', action='store_true',
+                        help='Extract articles during aggregation (ARTICLE_PREFETCH=1).')
+    parser.add_argument('--output', help='Write JSON results to this file.')
+    parser.add_argument('--compare', help='Baseline JSON results; exit 1 on regressions.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative regression.')
+    args = parser.parse_args()
+
+    logging.getLogger("AppLogger").setLevel(logging.WARNING)
+    app.config.prefetch_articles = args.prefetch
+    get_session().mount('https://', FixtureAdapter(copies=args.copies, latency=args.http_latency))
+
+    # Timing pass, without tracemalloc's overhead.
+    recorder = StageRecorder()
+    throughput = run_once(args, recorder)
+
+    allocations = {}
+    if not args.no_allocations:
+        alloc_recorder = StageRecorder(trace_allocations=True)
+        tracemalloc.start()
+        run_once(args, alloc_recorder)
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocations = {
+            'traced_peak_bytes': traced_peak,
+            'stage_allocated_bytes': dict(alloc_recorder.allocated),
+        }
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'params': vars(args),
+        'stages': {name: summarize(samples) for name, samples in sorted(recorder.samples.items())},
+        'throughput': throughput,
+        'memory': {'peak_rss_bytes': peak_rss_bytes(), **allocations},
+    }
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(report)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
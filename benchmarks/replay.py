@@ -0,0 +1,142 @@
+import copy
+import hashlib
+import time
+import xml.etree.ElementTree as ET
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+
+from src.models.Post import Post
+from src.models.RSSItem import RSSItem
+from src.services.EmbeddingIndexService import IndexEntry
+from src.services.OpenAIService import OpenAIService
+from src.services.RSSService import RSSService
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Which recorded feed and article template replays each outlet.
+OUTLET_FIXTURES = {
+    'TechCrunch': ('techcrunch.xml', 'techcrunch.html'),
+    'Ars Technica': ('arstechnica.xml', 'arstechnica.html'),
+}
+
+
+def scale_feed(feed_xml: bytes, copies: int) -> bytes:
+    """
+    Replicates every <item> of a recorded feed.
+
+    Each copy gets a unique link, guid and title and an older pub_date, so the
+    copies survive link dedupe and sort like a real backlog.
+
+    Args:
+        feed_xml (bytes): The recorded feed.
+        copies (int): How many times each item appears in the result.
+
+    Returns:
+        bytes: The scaled feed.
+    """
+    root = ET.fromstring(feed_xml)
+    channel = root.find('channel')
+    originals = channel.findall('item')
+    for original in originals:
+        channel.remove(original)
+
+    for copy_no in range(copies):
+        for original in originals:
+            item = copy.deepcopy(original)
+            if copy_no:
+                item.find('link').text = f"{item.findtext('link')}?replay={copy_no}"
+                item.find('guid').text = f"{item.findtext('guid')}-replay-{copy_no}"
+                item.find('title').text = f"{item.findtext('title')} ({copy_no})"
+                pub_date = parsedate_to_datetime(item.findtext('pubDate')) - timedelta(minutes=copy_no)
+                item.find('pubDate').text = format_datetime(pub_date)
+            channel.append(item)
+
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+
+class FixtureAdapter(BaseAdapter):
+    """
+    requests transport adapter that serves recorded fixtures instead of the network.
+
+    Feed URLs from RSSService.FEEDS return the (scaled) recorded feed of their
+    outlet; any other URL on an outlet's host returns that outlet's article template.
+    """
+
+    def __init__(self, copies: int = 1, latency: float = 0.0):
+        """
+        Args:
+            copies (int): Scale factor passed to scale_feed.
+            latency (float): Seconds to sleep per request, simulating the network.
+        """
+        super().__init__()
+        self.latency = latency
+        self.feeds: Dict[str, bytes] = {}
+        self.articles: Dict[str, bytes] = {}
+        for outlet, (feed_file, article_file) in OUTLET_FIXTURES.items():
+            url = RSSService.FEEDS[outlet]
+            self.feeds[url] = scale_feed((FIXTURES_DIR / "feeds" / feed_file).read_bytes(), copies)
+            self.articles[urlparse(url).hostname] = (FIXTURES_DIR / "articles" / article_file).read_bytes()
+
+    def send(self, request, **kwargs) -> requests.Response:
+        """Serve request from the fixtures, 404 if none matches."""
+        if self.latency:
+            time.sleep(self.latency)
+
+        body = self.feeds.get(request.url)
+        content_type = 'application/rss+xml'
+        if body is None:
+            body = self.articles.get(urlparse(request.url).hostname)
+            content_type = 'text/html; charset=utf-8'
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.status_code = 200 if body is not None else 404
+        response._content = body if body is not None else b""
+        response.encoding = 'utf-8'
+        response.headers['Content-Type'] = content_type
+        return response
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class StubOpenAIService(OpenAIService):
+    """Deterministic OpenAIService that never calls the API."""
+
+    def __init__(self, latency: float = 0.0):  # pylint: disable=super-init-not-called
+        """
+        Args:
+            latency (float): Seconds each call sleeps, simulating the completion round trip.
+        """
+        self.latency = latency
+
+    def generate_post(self, article: str, item: RSSItem, recent_posts: Sequence[Post] = (),
+                      related_posts: Sequence[IndexEntry] = (), persona_prompt: Optional[str] = None) -> Post:
+        """Build a post from the first paragraph of the article."""
+        if self.latency:
+            time.sleep(self.latency)
+        first_paragraph = next((line for line in article.splitlines() if len(line) > 80), article[:500])
+        return Post(
+            title=item.title,
+            content=first_paragraph,
+            tags=[category.lower() for category in item.categories[:3]] or ["tech"],
+            source_link=item.link,
+        )
+
+    def choose_post(self, candidates: Sequence[RSSItem], already_posted: Sequence[Post],
+                    excerpts: Optional[Sequence[Optional[str]]] = None,
+                    persona_prompt: Optional[str] = None) -> Optional[RSSItem]:
+        """Pick a candidate by hashing the titles, so runs are reproducible."""
+        if self.latency:
+            time.sleep(self.latency)
+        if not candidates:
+            return None
+        digest = hashlib.sha1("".join(item.title for item in candidates).encode()).digest()
+        return candidates[digest[0] % len(candidates)]
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark of the post text checks: the compiled single-pass scanner vs. per-call compilation.
+
+    python -m benchmarks.text --posts 2000
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from src.utils.TextUtils import contains_markdown, extract_hashtags, find_markdown, strip_markdown
+
+# The previous contains_markdown: 14 patterns compiled on every call and searched one by one.
+_LEGACY_PATTERNS = [
+    r'^\s{0,3}(#{1,6})\s+', r'\*\*(.*?)\*\*', r'\*(.*?)\*', r'__(.*?)__', r'_(.*?)_', r'!\[.*?\]\(.*?\)',
+    r'\[.*?\]\(.*?\)', r'`{1,3}[^`]+`{1,3}', r'^\s{0,3}[-*+] ', r'^\s*\d+\.\s+', r'>\s+', r'^\s{0,3}#{3,}\s*$',
+    r'```[\s\S]*?```', r'~~(.*?)~~',
+]
+
+
+def legacy_contains_markdown(text: str) -> bool:
+    compiled_patterns = [re.compile(pattern, re.MULTILINE | re.DOTALL) for pattern in _LEGACY_PATTERNS]
+    return any(pattern.search(text) for pattern in compiled_patterns)
+
+
+def legacy_remove_last_line_if_hashtag(text: str) -> str:
+    lines = text.splitlines()
+    if lines and '#' in lines[-1]:
+        return '\n'.join(lines[:-1])
+    return text
+
+
+def make_posts(count: int):
+    """Post-sized texts, every fourth one with markdown, all ending in a hashtag line."""
+    paragraph = ("Startups are racing to ship agents that browse, click and fill in forms for you. "
+                 "The hard part is not the model but the long tail of websites it has to survive. ") * 3
+    posts = []
+    for i in range(count):
+        body = "\n\n".join([paragraph] * 4)
+        if i % 4 == 0:
+            body += "\n\n**What this means:** agents will need [better sites](https://example.com)."
+        posts.append(f"{body}\n\n#ai #startups #agents{i}")
+    return posts
+
+
+def make_fuzz(count: int, seed: int = 7):
+    """Short random strings of markdown characters and every kind of whitespace and line break."""
+    rng = random.Random(seed)
+    alphabet = list(" \t\r\v\f\n\x1c\x85\u2003\u2028#*-+1.>_`~[]()!ab")
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare the single-pass text checks with per-call compilation.')
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--fuzz', type=int, default=20000, help='Random strings checked against the old code.')
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts)
+    for text in make_fuzz(args.fuzz):
+        assert legacy_contains_markdown(text) == contains_markdown(text), repr(text)
+        assert legacy_remove_last_line_if_hashtag(text) == extract_hashtags(text)[0], repr(text)
+    assert [legacy_contains_markdown(post) for post in posts] == [contains_markdown(post) for post in posts]
+    assert [legacy_remove_last_line_if_hashtag(post) for post in posts] == [extract_hashtags(post)[0] for post in posts]
+    cases = {
+        'legacy contains_markdown': lambda: [legacy_contains_markdown(post) for post in posts],
+        'contains_markdown': lambda: [contains_markdown(post) for post in posts],
+        'find_markdown': lambda: [find_markdown(post) for post in posts],
+        'strip_markdown': lambda: [strip_markdown(post) for post in posts],
+        'legacy hashtag line removal': lambda: [legacy_remove_last_line_if_hashtag(post) for post in posts],
+        'extract_hashtags': lambda: [extract_hashtags(post) for post in posts],
+    }
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:<28} {best / args.posts * 1e6:8.2f} us/post")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,35 @@
 import argparse
 import logging
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Set, Tuple
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import os
 
+from src.models.FeedSource import FeedSource, FeedsConfig
+from src.models.Persona import Persona, PersonasConfig
 from src.models.RSSItem import RSSItem
+from src.models.Post import Post
+from src.services.ArchiveService import ArchiveService
+from src.services.ArticlePrefetchService import ArticlePrefetchService
 from src.services.ArticleService import ArticleService
-from src.services.DynamoDBService import DynamoDBService
+from src.services.DaemonService import DaemonService
+from src.services.EmbeddingIndexService import EmbeddingIndexService, IndexEntry
+from src.services.ExportService import ExportService
+from src.services.FeedSchedulerService import FeedSchedulerService
+from src.services.ImagePipelineService import ImagePipelineService
+from src.services.ItemJournalService import ItemJournalService
+from src.services.OnDemandPostService import OnDemandPostService
 from src.services.OpenAIService import OpenAIService
 from src.models.OpenAIConfig import OpenAIConfig
+from src.services.PostApiService import PostApiService
 from src.services.RSSService import RSSService
-from src.services.S3Service import S3Service
-from src.utils.logger import setup_logger
+from src.services.SeenLinkService import SeenLinkService
+from src.services.StorageBackend import FeedBlobStore, get_database_service, get_feed_store
+from src.utils import metrics
+from src.utils.deadline import Deadline, DeadlineExceeded, current_deadline
+from src.utils.lease import ItemLease, default_worker_id
+from src.utils.logger import flush_logs, setup_logger
 
 load_dotenv(".env")
 
@@ -22,86 +39,499 @@ class AppConfig(BaseModel):
     """Application configuration."""
     bucket_name: str = Field(..., description="S3 bucket name for RSS feed")
     rss_feed_key: str = Field(..., description="S3 object key for RSS feed")
+    prefetch_articles: bool = Field(False, description="Extract articles of new items during aggregation")
+    choose_with_excerpts: bool = Field(False, description="Show prefetched article excerpts to choose_post")
+    adaptive_polling: bool = Field(True, description="Only poll feeds the scheduler considers due")
+    rehost_images: bool = Field(False, description="Resize post images and serve them from our bucket")
+    seen_link_filter: bool = Field(True, description="Drop already saved feed items before they reach the repository")
+    embedding_index: bool = Field(False, description="Use the post embedding index for context and duplicate checks")
 
 config = AppConfig(
     bucket_name=os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed"),
-    rss_feed_key=os.getenv("RSS_FEED_KEY", "rss_feed.xml")
+    rss_feed_key=os.getenv("RSS_FEED_KEY", "rss_feed.xml"),
+    prefetch_articles=os.getenv("ARTICLE_PREFETCH", "0") == "1",
+    choose_with_excerpts=os.getenv("CHOOSE_WITH_EXCERPTS", "0") == "1",
+    adaptive_polling=os.getenv("FEED_SCHEDULING", "adaptive").lower() != "all",
+    rehost_images=os.getenv("IMAGE_REHOST", "0") == "1",
+    seen_link_filter=os.getenv("SEEN_LINK_FILTER", "1") == "1",
+    embedding_index=os.getenv("EMBEDDING_INDEX", "0") == "1",
 )
 
-def aggregate_news() -> None:
-    """Fetches RSS feeds and saves all items to DynamoDB."""
+# How many times process_items re-chooses after losing a claim race.
+CLAIM_ATTEMPTS = 3
+
+# Earlier posts less similar than this to an item are not worth showing as context.
+RELATED_POST_MIN_SCORE = 0.3
+
+def aggregate_news(rss_service: Optional[RSSService] = None, db_service=None,
+                   feed_store: Optional[FeedBlobStore] = None, scheduler: Optional[FeedSchedulerService] = None,
+                   seen_links: Optional[SeenLinkService] = None) -> None:
+    """
+    Fetches the configured RSS feeds that are due, saves their items to the item
+    repository and optionally prefetches new articles.
+
+    Items whose link is in the seen-link filter are dropped before they reach the
+    repository. A long-running caller can pass an already loaded scheduler and
+    seen-link filter, which skips reloading them.
+    """
     logger.info("Starting RSS feed aggregation")
-    rss_service = RSSService()
-    dynamodb_service = DynamoDBService()
+    rss_service = rss_service or RSSService()
+    db_service = db_service or get_database_service()
+    sources = FeedsConfig.load().enabled_feeds()
 
     try:
-        rss_items: List[RSSItem] = rss_service.fetch_tech_crunch() + rss_service.fetch_ars_technica()
-        logger.info(f"Found {len(rss_items)} items in RSS feeds")
-        dynamodb_service.save_rss_items(rss_items)
+        if scheduler is None and config.adaptive_polling:
+            feed_store = feed_store or get_feed_store()
+            scheduler = FeedSchedulerService(feed_store, config.bucket_name)
+            scheduler.load()
+        if scheduler:
+            sources = scheduler.due_feeds(sources)
+            if not sources:
+                return
+        if seen_links is None and config.seen_link_filter:
+            feed_store = feed_store or get_feed_store()
+            seen_links = SeenLinkService(feed_store, config.bucket_name)
+            seen_links.load()
+
+        rss_items = poll_feeds(rss_service, sources, scheduler)
+        logger.info("Found %s items in RSS feeds", len(rss_items))
+        if seen_links is not None:
+            rss_items = seen_links.filter_new(rss_items)
+        stored_items: List[RSSItem] = []
+        with metrics.timer("save_rss_items"):
+            new_items = db_service.save_rss_items(rss_items, stored_items)
+        metrics.record("feed_items", len(rss_items), unit="Count")
+        if seen_links is not None:
+            # Links now known to be stored, saved or found; failed saves are retried next run.
+            seen_links.add(new_items + stored_items)
+            seen_links.save()
+        if scheduler:
+            scheduler.save()
+        if config.prefetch_articles:
+            with metrics.timer("prefetch_articles"):
+                ArticlePrefetchService(feed_store or get_feed_store(), db_service).prefetch(new_items)
     except Exception as e:
-        logger.error(f"Error aggregating news: {e}")
+        logger.error("Error aggregating news: %s", e)
         raise
 
-def create_post_from_item(item: RSSItem) -> None:
-    """Processes a single RSSItem to create a post and updates the RSS feed."""
-    openai_service = OpenAIService(OpenAIConfig())
-    dynamodb_service = DynamoDBService()
-    s3_service = S3Service()
+def poll_feeds(rss_service: RSSService, sources: List[FeedSource],
+               scheduler: Optional[FeedSchedulerService] = None) -> List[RSSItem]:
+    """Fetches every source, reporting each outcome to the scheduler. A failing feed does not stop the others."""
+    rss_items: List[RSSItem] = []
+    for polled, source in enumerate(sources):
+        try:
+            items = rss_service.fetch_source(source)
+        except DeadlineExceeded:
+            # Not the feed's fault; it stays due and is polled next run.
+            logger.warning("Deadline reached after polling %s of %s feeds", polled, len(sources))
+            metrics.record("deadline_stops", 1, unit="Count", stage="poll_feeds")
+            break
+        except Exception as e:
+            logger.error("Error fetching feed %s: %s", source.name, e)
+            if scheduler:
+                scheduler.record_failure(source)
+            continue
+        if scheduler:
+            scheduler.record_success(source, items)
+        rss_items.extend(items)
+    metrics.record("feeds_polled", len(sources), unit="Count")
+    return rss_items
+
+def create_post_from_item(item: RSSItem, openai_service: Optional[OpenAIService] = None, db_service=None,
+                          feed_store: Optional[FeedBlobStore] = None, recent_posts: Sequence[Post] = (),
+                          embedding_index: Optional[EmbeddingIndexService] = None,
+                          persona: Optional[Persona] = None) -> bool:
+    """
+    Processes a single RSSItem to create a post and updates the RSS feed.
+
+    The post is written in the voice of persona, if given, and added to its feed.
+
+    With an embedding index, the earlier posts most related to the item are given
+    to generate_post as context, and the new post is added to the index.
+
+    Each stage is recorded in the item's journal, so a later run resumes after the
+    last stage that succeeded instead of fetching and generating again. Errors are
+    logged, except DeadlineExceeded: it is raised with the journal intact, so the
+    caller can leave the item unprocessed for the next run.
+
+    Returns:
+        bool: True if the item is finished with: posted, or failed JOURNAL_MAX_ATTEMPTS times.
+    """
+    openai_service = openai_service or OpenAIService(OpenAIConfig())
+    db_service = db_service or get_database_service()
+    feed_store = feed_store or get_feed_store()
+    persona = persona or Persona(rss_feed_key=config.rss_feed_key)
+    journal = ItemJournalService(feed_store, item, config.bucket_name, persona.name).load()
 
     try:
-        article_text, image_link = extract_article_content(str(item.link))
-        post = openai_service.generate_post(article_text, item)
+        article_text, image_link = load_article_content(item, db_service, feed_store, journal)
+        post = Post(**journal.run("generate_post", lambda: {
+            'post': openai_service.generate_post(article_text, item, recent_posts,
+                                                 find_related_posts(embedding_index, item),
+                                                 persona.prompt).model_dump()})['post'])
+        if config.rehost_images:
+            image_link = journal.run("rehost_image", lambda: {
+                'image_link': ImagePipelineService(feed_store).rehost(image_link)})['image_link']
         post.image_link = image_link
-        dynamodb_service.save_post(post)
-        s3_service.update_rss_feed(config.bucket_name, config.rss_feed_key, post)
+        post.persona = persona.name
+
+        def save_post() -> dict:
+            db_service.save_post(post)
+            return {'post_id': str(post.id)}
+
+        journal.run("save_post", save_post)
+        if embedding_index is not None:
+            try:
+                embedding_index.add_posts([post])
+            except Exception as e:
+                logger.warning("Could not add post %s to the embedding index: %s", post.id, e)
+        journal.run("update_rss_feed", lambda: {
+            'feed_etag': feed_store.update_rss_feed(config.bucket_name, persona.rss_feed_key, post,
+                                                    persona.feed, item.outlet)})
+        return True
+    except DeadlineExceeded:
+        raise
     except Exception as e:
-        logger.error(f"Error processing {item.link}: {e}")
+        gave_up = journal.fail(e)
+        logger.error("Error processing %s (attempt %s of %s): %s",
+                     item.link, journal.attempts, journal.max_attempts, e)
+        return gave_up
 
-def extract_article_content(link: str) -> Tuple[str, str]:
-    """Extracts article text and image link based on the source."""
-    if 'techcrunch' in link:
-        return ArticleService.extract_techcrunch_article(link)
-    return ArticleService.extract_arstechnica_article(link)
+def load_article_content(item: RSSItem, db_service, feed_store: FeedBlobStore,
+                         journal: ItemJournalService) -> Tuple[str, Optional[str]]:
+    """
+    Returns the article text and image link of item.
 
-def process_rss_items() -> None:
-    """Retrieves items from DynamoDB and processes each item."""
-    dynamodb_service = DynamoDBService()
-    openai_service = OpenAIService(OpenAIConfig())
+    The article is read from the blob the journal or the prefetch recorded; if there
+    is none it is extracted now and stored, so a retry of the item need not fetch it again.
+    """
+    prefetch = ArticlePrefetchService(feed_store, db_service)
+    extracted: List[Tuple[str, Optional[str]]] = []
 
-    already_posted = dynamodb_service.get_latest_posts(10)
-    choosable = dynamodb_service.get_last_unprocessed_rss_items(20)
-    chosen_item = openai_service.choose_post(choosable, already_posted)
+    def extract() -> dict:
+        article = prefetch.load(item)
+        metrics.record("article_prefetch_hit", int(article is not None), unit="Count")
+        if article is None:
+            key, text, image_link = prefetch.store_article(item)
+            db_service.set_rss_item_article_key(item, key)
+            item.article_key, article = key, (text, image_link)
+        extracted.append(article)
+        return {'article_key': item.article_key}
+
+    item.article_key = journal.run("extract_article", extract)['article_key']
+    if extracted:
+        return extracted[0]
+    article = prefetch.load(item)
+    if article is None:
+        # The journal points at an article blob that is gone; extract it again.
+        journal.forget("extract_article")
+        journal.run("extract_article", extract)
+        return extracted[0]
+    return article
+
+def find_related_posts(embedding_index: Optional[EmbeddingIndexService], item: RSSItem) -> List[IndexEntry]:
+    """Returns the earlier posts most similar to item (up to EMBEDDING_CONTEXT_POSTS, default 3), if indexed."""
+    if embedding_index is None:
+        return []
+    try:
+        embedding_index.add_items([item])
+        related = embedding_index.search(embedding_index.vector(item.id),
+                                         k=int(os.getenv("EMBEDDING_CONTEXT_POSTS", "3")), kind='post')
+    except Exception as e:
+        logger.warning("Could not search the embedding index for %s: %s", item.link, e)
+        return []
+    return [entry for entry in related if entry.score >= RELATED_POST_MIN_SCORE]
+
+def skip_duplicate_items(embedding_index: EmbeddingIndexService, db_service, feed_store: FeedBlobStore,
+                         items: List[RSSItem], excerpts: Optional[List[Optional[str]]]
+                         ) -> Tuple[List[RSSItem], Optional[List[Optional[str]]]]:
+    """
+    Marks the items that repeat an earlier post as processed, deleting their journals, and returns
+    the rest, with their excerpts.
+
+    An item repeats a post when their embeddings are at least EMBEDDING_DUPLICATE_THRESHOLD
+    (default 0.9) similar; the whole post history is compared, not only the recent posts.
+    A duplicate is claimed before it is marked, so one another worker leased since the
+    candidates were loaded is only left out, never marked processed under it.
+    """
+    threshold = float(os.getenv("EMBEDDING_DUPLICATE_THRESHOLD", "0.9"))
+    try:
+        embedding_index.add_items(items)
+    except Exception as e:
+        logger.warning("Could not embed the candidates; not checking them for duplicates: %s", e)
+        return items, excerpts
+
+    owner = default_worker_id()
+    lease_seconds = int(os.getenv("ITEM_LEASE_SECONDS", "120"))
+    kept = []
+    for position, item in enumerate(items):
+        match = embedding_index.search(embedding_index.vector(item.id), k=1, kind='post')
+        if not match or match[0].score < threshold:
+            kept.append(position)
+        elif db_service.claim_rss_item(item, owner, lease_seconds) and db_service.mark_rss_item_processed(item, owner):
+            logger.info("Skipping %s: %.2f similar to the earlier post '%s'.", item.link, match[0].score, match[0].title)
+            metrics.record("duplicate_items_skipped", 1, unit="Count")
+            ItemJournalService.delete_all(feed_store, item, config.bucket_name)
+        else:
+            logger.info("Leaving out %s: it repeats '%s' but another worker holds it.", item.link, match[0].title)
+    return [items[i] for i in kept], [excerpts[i] for i in kept] if excerpts else excerpts
+
+def process_rss_items(db_service=None, openai_service: Optional[OpenAIService] = None,
+                      feed_store: Optional[FeedBlobStore] = None,
+                      embedding_index: Optional[EmbeddingIndexService] = None,
+                      personas: Optional[List[Persona]] = None) -> None:
+    """
+    Retrieves items from the item repository, claims one per persona and processes it.
+
+    Several workers may run this concurrently: candidates leased by another worker
+    are skipped, and the chosen item is claimed before any post is generated. With
+    the embedding index (EMBEDDING_INDEX=1), candidates repeating any earlier post
+    are skipped before choosing.
+
+    The candidates are loaded once for all personas (PERSONAS_CONFIG); each persona
+    then chooses and posts concurrently, on up to PERSONA_WORKERS (default 4) threads.
+    The threads share the services: DynamoDBService gives each thread its own boto3
+    resource, SQLiteService and the embedding index lock, and the S3 and OpenAI
+    clients are thread-safe.
+    """
+    db_service = db_service or get_database_service()
+    openai_service = openai_service or OpenAIService(OpenAIConfig())
+    feed_store = feed_store or get_feed_store()
+    personas = personas or PersonasConfig.load().enabled_personas(config.rss_feed_key)
+    if not personas:
+        logger.warning("Every persona in %s is disabled; nothing to post.", os.getenv("PERSONAS_CONFIG", "personas.json"))
+        return
+    if embedding_index is None and config.embedding_index:
+        embedding_index = EmbeddingIndexService(openai_service.embed).load()
+
+    # Choosing, extracting and generating take a while; don't claim an item that can't be finished.
+    if not current_deadline().allows(float(os.getenv("DEADLINE_PROCESS_ITEM_SECONDS", "60"))):
+        logger.warning("Only %.0fs left; not starting a new item", current_deadline().remaining())
+        metrics.record("deadline_stops", 1, unit="Count", stage="process_items")
+        return
 
-    if chosen_item:
-        logger.info(f"Processing item: {chosen_item.link}")
-        create_post_from_item(chosen_item)
-        chosen_item.processed = True
-        dynamodb_service.update_rss_item(chosen_item)
+    with metrics.timer("load_candidates"):
+        choosable = db_service.get_last_unprocessed_rss_items(20, exclude_leased=True)
+        excerpts = None
+        if config.choose_with_excerpts:
+            excerpts = ArticlePrefetchService(feed_store, db_service).excerpts(choosable)
+    if embedding_index is not None:
+        with metrics.timer("skip_duplicate_items"):
+            choosable, excerpts = skip_duplicate_items(embedding_index, db_service, feed_store, choosable, excerpts)
+
+    if len(personas) == 1:
+        process_item_as_persona(personas[0], choosable, excerpts, db_service, openai_service, feed_store,
+                                embedding_index)
+        return
+    # Items claimed by any persona of this run, left out of the others' choices.
+    claimed: Set[str] = set()
+    workers = min(len(personas), int(os.getenv("PERSONA_WORKERS", "4")))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="persona") as pool:
+        futures = [pool.submit(process_item_as_persona, persona, list(choosable), list(excerpts) if excerpts else None,
+                               db_service, openai_service, feed_store, embedding_index, claimed,
+                               CLAIM_ATTEMPTS + len(personas) - 1)
+                   for persona in personas]
+        for future in futures:
+            future.result()
+
+
+def process_item_as_persona(persona: Persona, choosable: List[RSSItem], excerpts: Optional[List[Optional[str]]],
+                            db_service, openai_service: OpenAIService, feed_store: FeedBlobStore,
+                            embedding_index: Optional[EmbeddingIndexService] = None,
+                            claimed: Optional[Set[str]] = None, claim_attempts: int = CLAIM_ATTEMPTS) -> None:
+    """
+    Chooses an item from choosable for persona, claims it and posts it.
+
+    Personas run concurrently on the same candidates; each claims its item under its
+    own lease owner, so two personas never post the same item. Ids in the shared
+    claimed set are not chosen, and the claimed item's id is added to it; every
+    sibling persona may cost one more claim attempt. choosable and excerpts are modified.
+    """
+    owner = f"{default_worker_id()}/{persona.name}" if persona.name else default_worker_id()
+    lease_seconds = int(os.getenv("ITEM_LEASE_SECONDS", "120"))
+    with metrics.timer("load_posted"):
+        already_posted = db_service.get_latest_posts(10, persona.name if persona.name else None)
+
+    for _ in range(claim_attempts):
+        if claimed:
+            kept = [position for position, item in enumerate(choosable) if str(item.id) not in claimed]
+            choosable[:] = [choosable[position] for position in kept]
+            if excerpts:
+                excerpts[:] = [excerpts[position] for position in kept]
+        if not choosable:
+            logger.info("No unprocessed items left to choose from")
+            return
+        with metrics.timer("choose_post"):
+            chosen_item = openai_service.choose_post(choosable, already_posted, excerpts, persona.prompt)
+
+        lease = ItemLease(db_service, chosen_item, owner, lease_seconds)
+        if lease.acquire():
+            if claimed is not None:
+                claimed.add(str(chosen_item.id))
+            break
+        # Another worker or persona got there first; choose among the rest.
+        metrics.record("claim_conflicts", 1, unit="Count")
+        index = choosable.index(chosen_item)
+        del choosable[index]
+        if excerpts:
+            del excerpts[index]
     else:
-        logger.info("No unprocessed items found in DynamoDB")
-
-def main(action: str) -> None:
-    """Main function to run the appropriate action."""
-    actions = {
-        'aggregate_news': aggregate_news,
-        'process_items': process_rss_items
-    }
-    if action not in actions:
-        logger.error(f"Unknown action: {action}. Please use 'aggregate_news' or 'process_items'.")
+        logger.info("Every chosen item was claimed by another worker")
         return
-    actions[action]()
+
+    logger.info("Processing item%s: %s", f" as {persona.name}" if persona.name else "", chosen_item.link)
+    with lease:
+        try:
+            finished = create_post_from_item(chosen_item, openai_service, db_service, feed_store, already_posted,
+                                             embedding_index, persona)
+        except DeadlineExceeded:
+            logger.warning("Deadline reached processing %s; leaving it for the next run.", chosen_item.link)
+            metrics.record("deadline_stops", 1, unit="Count", stage="create_post")
+            return
+        if lease.lost:
+            logger.warning("Lease on %s expired during processing; not marking it processed.", chosen_item.link)
+        elif not finished:
+            logger.info("Leaving %s unprocessed; a later run resumes it from its journal.", chosen_item.link)
+        else:
+            if db_service.mark_rss_item_processed(chosen_item, owner):
+                ItemJournalService.delete_all(feed_store, chosen_item, config.bucket_name)
+
+def migrate_unprocessed_index() -> None:
+    """Converts stored items to the sparse unprocessed index layout."""
+    get_database_service().migrate_unprocessed_index()
+
+def index_posts(db_service=None, openai_service: Optional[OpenAIService] = None) -> None:
+    """Adds every stored post missing from the embedding index, e.g. after enabling it."""
+    db_service = db_service or get_database_service()
+    openai_service = openai_service or OpenAIService(OpenAIConfig())
+    embedding_index = EmbeddingIndexService(openai_service.embed).load()
+    added = embedding_index.add_posts(db_service.scan_posts())
+    logger.info("Indexed %s posts; the embedding index holds %s entries.", added, len(embedding_index))
+
+def archive_items(db_service=None, feed_store: Optional[FeedBlobStore] = None,
+                  max_age_days: Optional[int] = None) -> None:
+    """Moves items older than max_age_days (ARCHIVE_AFTER_DAYS) from the item repository to the archive."""
+    db_service = db_service or get_database_service()
+    feed_store = feed_store or get_feed_store()
+    ArchiveService(feed_store, db_service).archive(max_age_days)
+
+def export_data(db_service=None, feed_store: Optional[FeedBlobStore] = None) -> None:
+    """Writes the RSS items and posts added since the last export to columnar files for analytics."""
+    db_service = db_service or get_database_service()
+    feed_store = feed_store or get_feed_store()
+    ExportService(feed_store, db_service).export()
+
+def archive_stream(records: Optional[List[dict]] = None) -> None:
+    """Archives the items that DynamoDB TTL removed, from the records of a stream event."""
+    ArchiveService(get_feed_store()).archive_stream_records(records or [])
+
+def serve(aggregate_interval: Optional[float] = None, process_interval: Optional[float] = None) -> None:
+    """
+    Runs aggregation and processing on an internal schedule until SIGTERM/SIGINT.
+
+    The services, the feed schedule, the seen-link filter and the embedding index
+    are created once and stay warm across runs.
+    """
+    aggregate_interval = aggregate_interval or float(os.getenv("SERVE_AGGREGATE_INTERVAL", "900"))
+    process_interval = process_interval or float(os.getenv("SERVE_PROCESS_INTERVAL", "3600"))
+
+    rss_service = RSSService()
+    db_service = get_database_service()
+    feed_store = get_feed_store()
+    openai_service = OpenAIService(OpenAIConfig())
+    scheduler = None
+    if config.adaptive_polling:
+        scheduler = FeedSchedulerService(feed_store, config.bucket_name)
+        scheduler.load()
+    seen_links = None
+    if config.seen_link_filter:
+        seen_links = SeenLinkService(feed_store, config.bucket_name)
+        seen_links.load()
+    embedding_index = None
+    if config.embedding_index:
+        embedding_index = EmbeddingIndexService(openai_service.embed).load()
+
+    daemon = DaemonService()
+    daemon.add_job('aggregate_news', aggregate_interval,
+                   lambda: aggregate_news(rss_service, db_service, feed_store, scheduler, seen_links))
+    daemon.add_job('process_items', process_interval,
+                   lambda: process_rss_items(db_service, openai_service, feed_store, embedding_index))
+    daemon.add_job('archive_items', float(os.getenv("SERVE_ARCHIVE_INTERVAL", "86400")),
+                   lambda: archive_items(db_service, feed_store))
+    daemon.run_forever()
+    ImagePipelineService.shutdown()
+
+def serve_api(port: Optional[int] = None) -> None:
+    """
+    Serves on-demand post generation over HTTP (POST /posts) until SIGTERM/SIGINT.
+
+    Posts are returned as drafts, not saved or added to a feed. Concurrent requests for
+    the same article share one generation, and results are cached for GENERATE_CACHE_SECONDS.
+    """
+    personas = PersonasConfig.load().enabled_personas(config.rss_feed_key)
+    if not personas:
+        logger.error("Every persona in %s is disabled; not starting the API.", os.getenv("PERSONAS_CONFIG", "personas.json"))
+        return
+    db_service = get_database_service()
+    feed_store = get_feed_store()
+    openai_service = OpenAIService(OpenAIConfig())
+    embedding_index = None
+    if config.embedding_index:
+        embedding_index = EmbeddingIndexService(openai_service.embed).load()
+    posts = OnDemandPostService(openai_service, db_service, feed_store, personas,
+                                lambda item: find_related_posts(embedding_index, item))
+    server = PostApiService(posts, port=port).start()
+
+    # The daemon handles the signals; its job drops expired posts and flushes the metrics.
+    daemon = DaemonService()
+    daemon.add_job('sweep_post_cache', float(os.getenv("GENERATE_SWEEP_INTERVAL", "60")), posts.sweep)
+    try:
+        daemon.run_forever()
+    finally:
+        server.stop()
+        posts.close()
+
+ACTIONS = {
+    'aggregate_news': aggregate_news,
+    'process_items': process_rss_items,
+    'migrate_unprocessed_index': migrate_unprocessed_index,
+    'index_posts': index_posts,
+    'archive_items': archive_items,
+    'archive_stream': archive_stream,
+    'export': export_data,
+    'serve': serve,
+    'serve_api': serve_api,
+}
+
+def main(action: str, deadline: Optional[Deadline] = None, **kwargs) -> None:
+    """Main function to run the appropriate action, within deadline if given."""
+    if action not in ACTIONS:
+        logger.error("Unknown action: %s. Please use one of: %s.", action, ", ".join(ACTIONS))
+        return
+    try:
+        with (deadline or Deadline()).activate(), metrics.timer(action):
+            ACTIONS[action](**kwargs)
+    finally:
+        metrics.flush()
 
 def lambda_handler(event: dict, context: object) -> dict:
     """AWS Lambda handler that determines action based on environment variable."""
     logger.info("Lambda handler started")
     action = os.getenv('ACTION', 'aggregate_news')
-    logger.info(f"Action determined: {action}")
+    kwargs = {}
+    records = event.get('Records') or []
+    if records and records[0].get('eventSource') == 'aws:dynamodb':
+        # Invoked by the item table's stream: archive what TTL deleted.
+        action, kwargs = 'archive_stream', {'records': records}
+    logger.info("Action determined: %s", action)
 
     try:
-        main(action)
+        main(action, Deadline.from_lambda_context(context), **kwargs)
     except Exception as e:
-        logger.error(f"Exception in lambda_handler: {str(e)}")
+        logger.error("Exception in lambda_handler: %s", e)
         raise
+    finally:
+        flush_logs()
 
     return {"status": "success", "message": "Operation completed successfully"}
 
@@ -111,6 +541,24 @@ if __name__ == "__main__":
         lambda_handler({}, None)
     else:
         parser = argparse.ArgumentParser(description='Run RSS feed aggregator and processor.')
-        parser.add_argument('action', choices=['aggregate_news', 'process_items'], help='Action to perform.')
+        parser.add_argument('action', choices=list(ACTIONS), help='Action to perform.')
+        parser.add_argument('--aggregate-interval', type=float,
+                            help='serve: seconds between aggregations (SERVE_AGGREGATE_INTERVAL, default 900).')
+        parser.add_argument('--process-interval', type=float,
+                            help='serve: seconds between posts (SERVE_PROCESS_INTERVAL, default 3600).')
+        parser.add_argument('--max-age-days', type=int,
+                            help='archive_items: archive items older than this (ARCHIVE_AFTER_DAYS, default 30).')
+        parser.add_argument('--port', type=int,
+                            help='serve_api: port to listen on (GENERATE_PORT, default 8080).')
+        parser.add_argument('--deadline', type=float,
+                            help='Seconds the run may take; timeouts shrink and no new item is started near the end.')
         args = parser.parse_args()
-        main(args.action)
\ No newline at end of file
+        deadline = Deadline.from_seconds(args.deadline)
+        if args.action == 'serve':
+            main(args.action, aggregate_interval=args.aggregate_interval, process_interval=args.process_interval)
+        elif args.action == 'serve_api':
+            main(args.action, port=args.port)
+        elif args.action == 'archive_items':
+            main(args.action, deadline, max_age_days=args.max_age_days)
+        else:
+            main(args.action, deadline)
\ No newline at end of file
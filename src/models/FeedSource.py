@@ -0,0 +1,56 @@
+import json
+import os
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, HttpUrl
+
+#==============================================================
+# The feeds aggregate_news polls are listed in a JSON file
+# (FEEDS_CONFIG, default feeds.json):
+#
+# {"feeds": [{"name": "TechCrunch", "url": "https://techcrunch.com/feed/",
+#             "min_interval_minutes": 10, "max_interval_minutes": 240}]}
+#
+# Without the file the two built-in feeds are used. The name is stored
+# as the items' outlet: it picks the article extractor (TechCrunch and
+# Ars Technica have their own, any other outlet gets the generic one)
+# and is the "Source" of the posts in the feed.
+#==============================================================
+
+
+class FeedSource(BaseModel):
+    """An RSS feed to poll, with the bounds for its polling interval."""
+    name: str = Field(..., description="Outlet name stored on the items, shown as the posts' source")
+    url: HttpUrl = Field(..., description="URL of the RSS feed")
+    enabled: bool = Field(True, description="Whether the feed is polled at all")
+    min_interval_minutes: float = Field(10, gt=0, description="Never poll more often than this")
+    max_interval_minutes: float = Field(360, gt=0, description="Never poll less often than this")
+
+
+class FeedsConfig(BaseModel):
+    """The list of feeds to aggregate."""
+    feeds: List[FeedSource] = Field(default_factory=lambda: [
+        FeedSource(name='TechCrunch', url='https://techcrunch.com/feed/'),
+        FeedSource(name='Ars Technica', url='https://arstechnica.com/information-technology/feed/'),
+    ])
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'FeedsConfig':
+        """
+        Read the feeds config file.
+
+        Args:
+            path (Optional[str]): Path of the JSON config. Defaults to FEEDS_CONFIG or feeds.json.
+
+        Returns:
+            FeedsConfig: The configured feeds, or the built-in defaults if the file does not exist.
+        """
+        path = path or os.getenv("FEEDS_CONFIG", "feeds.json")
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as fh:
+            return cls.model_validate(json.load(fh))
+
+    def enabled_feeds(self) -> List[FeedSource]:
+        """Return the feeds that are enabled."""
+        return [feed for feed in self.feeds if feed.enabled]
@@ -1,9 +1,103 @@
 import os
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import Field, BaseModel
 
+#==============================================================
+# Model routing.
+#
+# Every OpenAI call belongs to a task (choose_post, generate_post)
+# with its own model, sampling settings and fallback models, which
+# are tried in order when the primary model is unavailable or rate
+# limited. Override per task in .env:
+#
+# OPENAI_CHOOSE_POST_MODEL=gpt-4.1-mini
+# OPENAI_CHOOSE_POST_FALLBACKS=gpt-4.1-nano,gpt-4.1
+#
+# Latency, tokens and estimated cost are recorded per task and
+# model, so the table can be tuned from the metrics.
+#==============================================================
+
+# USD per million tokens: (input, cached input, output). Prefix-matched, so snapshots are covered.
+MODEL_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "text-embedding-3-small": (0.02, 0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.13, 0.0),
+}
+
+
+class TaskModelConfig(BaseModel):
+    """Model and sampling settings for one kind of request."""
+    model: str = Field(..., description="Primary model")
+    temperature: float = Field(1.0, description="Sampling temperature")
+    max_tokens: int = Field(..., description="Completion token limit")
+    fallback_models: List[str] = Field(default_factory=list, description="Tried in order if the primary fails")
+
+    @property
+    def models(self) -> List[str]:
+        """The primary model followed by the fallbacks."""
+        return [self.model, *self.fallback_models]
+
+
+def _task_config(task: str, model: str, temperature: float, max_tokens: int) -> TaskModelConfig:
+    """Build a task's config, letting OPENAI_<TASK>_MODEL and OPENAI_<TASK>_FALLBACKS override the defaults."""
+    prefix = f"OPENAI_{task.upper()}"
+    fallbacks = os.getenv(f"{prefix}_FALLBACKS", "")
+    return TaskModelConfig(
+        model=os.getenv(f"{prefix}_MODEL") or model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        fallback_models=[name.strip() for name in fallbacks.split(",") if name.strip()],
+    )
+
 
 class OpenAIConfig(BaseModel):
     """Configuration for OpenAI client."""
     api_key: str = Field(os.getenv("OPENAI_API_KEY"), description="OpenAI API key")
-    model: str = Field("gpt-4.1", description="OpenAI model to use")
+    base_url: Optional[str] = Field(default_factory=lambda: os.getenv("OPENAI_BASE_URL") or None,
+                                    description="API base URL, e.g. of benchmarks.fake_openai; None for OpenAI")
+    max_retries: int = Field(default_factory=lambda: int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+                             description="SDK retries of rate-limited and failed requests, outside deadlines")
+    model: str = Field(default_factory=lambda: os.getenv("OPENAI_MODEL", "gpt-4.1"),
+                       description="Default OpenAI model, used by tasks without their own")
+    stream: bool = Field(default_factory=lambda: os.getenv("OPENAI_STREAM", "0") == "1",
+                         description="Stream generate_post and abort invalid output early")
+    max_post_chars: int = Field(default_factory=lambda: int(os.getenv("OPENAI_MAX_POST_CHARS", "6000")),
+                                description="Streamed responses longer than this are aborted as runaway")
+    request_timeout: float = Field(default_factory=lambda: float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120")),
+                                   description="Seconds per request, shortened near the deadline")
+    candidates: int = Field(default_factory=lambda: int(os.getenv("OPENAI_POST_CANDIDATES", "1")),
+                            description="Posts requested per generate_post call; >1 picks the best locally")
+    embedding_model: str = Field(default_factory=lambda: os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+                                 description="Model of the post embedding index")
+    embedding_dimensions: int = Field(default_factory=lambda: int(os.getenv("OPENAI_EMBEDDING_DIMENSIONS", "256")),
+                                      description="Embedding length; shorter is smaller and faster to search")
+    tasks: Dict[str, TaskModelConfig] = Field(default_factory=dict, description="Per-task model routing")
+
+    def model_post_init(self, __context) -> None:
+        """Fill in the routing of tasks that were not configured explicitly."""
+        defaults = {
+            # Picking an index is easy; a small model is faster and far cheaper.
+            "choose_post": _task_config("choose_post", "gpt-4.1-mini", 0.7, 50),
+            "generate_post": _task_config("generate_post", self.model, 1.0, 4096),
+        }
+        for task, task_config in defaults.items():
+            self.tasks.setdefault(task, task_config)
+
+    def for_task(self, task: str) -> TaskModelConfig:
+        """Return the routing of task, falling back to the default model."""
+        return self.tasks.get(task) or TaskModelConfig(model=self.model, max_tokens=4096)
+
+
+def estimate_cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Estimated USD cost of a request, or None for models without a known price."""
+    prefix = max((name for name in MODEL_PRICES if model.startswith(name)), key=len, default=None)
+    if prefix is None:
+        return None
+    input_price, cached_price, output_price = MODEL_PRICES[prefix]
+    return ((prompt_tokens - cached_tokens) * input_price + cached_tokens * cached_price
+            + completion_tokens * output_price) / 1_000_000
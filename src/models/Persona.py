@@ -0,0 +1,69 @@
+import json
+import os
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.models.RSSFeed import RSSFeed
+
+#==============================================================
+# One deployment can post as several personas, listed in a JSON
+# file (PERSONAS_CONFIG, default personas.json):
+#
+# {"personas": [{"name": "cto", "rss_feed_key": "feeds/cto.xml",
+#                "prompt": "You write for engineering leaders ...",
+#                "feed": {"title": "CTO Notes", "link": "...", "description": "..."}}]}
+#
+# Feeds, items and articles are shared; every persona chooses and
+# posts its own item, with its own prompt, posted history and RSS
+# feed. Without the file there is one unnamed persona posting to
+# RSS_FEED_KEY with the built-in prompts.
+#==============================================================
+
+
+class Persona(BaseModel):
+    """A LinkedIn voice: its prompt, its feed and, by name, its posted history."""
+    name: str = Field("", description="Stored on the persona's posts; empty only for the default persona")
+    rss_feed_key: str = Field(..., description="Object key of the persona's RSS feed")
+    prompt: Optional[str] = Field(None, description="Voice, audience and interests, added to both prompts")
+    feed: RSSFeed = Field(default_factory=RSSFeed, description="Channel details of a new RSS feed")
+    enabled: bool = Field(True, description="Whether the persona posts at all")
+
+
+class PersonasConfig(BaseModel):
+    """The list of personas to post as."""
+    personas: List[Persona] = Field(default_factory=list)
+
+    @field_validator('personas')
+    @classmethod
+    def check_names(cls, personas: List[Persona]) -> List[Persona]:
+        """Configured personas need distinct, non-empty names: their posts and journals are kept apart by name."""
+        names = [persona.name for persona in personas]
+        if any(not name for name in names):
+            raise ValueError("every configured persona needs a name")
+        if len(set(names)) != len(names):
+            raise ValueError(f"persona names must be unique: {', '.join(names)}")
+        return personas
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'PersonasConfig':
+        """
+        Read the personas config file.
+
+        Args:
+            path (Optional[str]): Path of the JSON config. Defaults to PERSONAS_CONFIG or personas.json.
+
+        Returns:
+            PersonasConfig: The configured personas, or none if the file does not exist.
+        """
+        path = path or os.getenv("PERSONAS_CONFIG", "personas.json")
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as fh:
+            return cls.model_validate(json.load(fh))
+
+    def enabled_personas(self, default_feed_key: str) -> List[Persona]:
+        """Return the enabled personas, or the default persona posting to default_feed_key if none are configured."""
+        if not self.personas:
+            return [Persona(rss_feed_key=default_feed_key)]
+        return [persona for persona in self.personas if persona.enabled]
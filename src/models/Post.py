@@ -22,12 +22,19 @@ class Post(BaseModel):
         default="",
         description="The link to the image associated with the post."
     )
+    persona: str = Field(
+        default="",
+        description="Name of the persona that posted it; empty for the default persona."
+    )
 
     @classmethod
     def from_dynamodb_item(cls, item: dict) -> 'Post':
         """
         Create a Post instance from a DynamoDB item.
 
+        The item was written by model_dump, so post_time is in the ISO 8601 form
+        parse_post_time reads directly.
+
         Args:
             item (dict): The DynamoDB item representing a post.
 
@@ -36,12 +43,13 @@ class Post(BaseModel):
         """
         return cls(
             id=item['id'],
-            post_time=item['post_time'],
             title=item['title'],
             content=item['content'],
-            tags=item['tags'],
+            tags=list(item.get('tags') or []),
             source_link=item['source_link'],
-            image_link=item.get('image_link', "")
+            post_time=item['post_time'],
+            image_link=item.get('image_link', ""),
+            persona=item.get('persona') or "",
         )
 
     @field_validator("id", mode="before")
@@ -0,0 +1,163 @@
+import gzip
+import json
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from src.models.RSSItem import RSSItem
+from src.services.StorageBackend import FeedBlobStore, RSSItemRepository
+from src.utils import metrics
+
+# ==============================================================
+# Archival of old RSS items.
+#
+# Items published more than ARCHIVE_AFTER_DAYS ago are moved out of
+# the item repository into gzip-compressed JSON Lines files in the
+# blob store, partitioned by publication day:
+#
+#   archive/rss_items/dt=2024-09-16/part-1726500000-1a2b3c4d.jsonl.gz
+#
+# Every run writes new part files and only then deletes the items,
+# so a crash in between leaves duplicates, never losses; the reader
+# drops duplicate ids. Instead of the scheduled job, DynamoDB TTL
+# can expire the items (DYNAMODB_ITEM_TTL_DAYS) with the table's
+# stream feeding archive_stream_records.
+# ==============================================================
+
+ARCHIVE_PREFIX = "archive/rss_items/"
+
+# Items per repository delete; a failed run loses at most one batch of progress.
+BATCH_SIZE = 500
+
+
+class ArchiveService:
+    """Moves old RSS items to compressed, date-partitioned files and reads them back."""
+
+    def __init__(self, feed_store: FeedBlobStore, db_service: Optional[RSSItemRepository] = None,
+                 bucket_name: Optional[str] = None):
+        """
+        Initialize the ArchiveService.
+
+        Args:
+            feed_store (FeedBlobStore): Where the archive files are written.
+            db_service (Optional[RSSItemRepository]): Repository the items are moved out of. Only needed by archive.
+            bucket_name (Optional[str]): Bucket of the archive. Defaults to ARCHIVE_BUCKET_NAME, then the feed bucket.
+        """
+        self.logger = logging.getLogger("AppLogger")
+        self.feed_store = feed_store
+        self.db_service = db_service
+        self.bucket_name = (bucket_name or os.getenv("ARCHIVE_BUCKET_NAME")
+                            or os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed"))
+        self.max_age_days = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+
+    def archive(self, max_age_days: Optional[int] = None, now: Optional[datetime] = None) -> int:
+        """
+        Move the items published more than max_age_days ago to the archive.
+
+        Args:
+            max_age_days (Optional[int]): Age in days. Defaults to ARCHIVE_AFTER_DAYS (30).
+            now (Optional[datetime]): Current time.
+
+        Returns:
+            int: The number of items archived and deleted.
+        """
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=max_age_days)
+        items = self.db_service.get_rss_items_published_before(cutoff)
+        self.logger.info("Archiving %s RSS items published before %s.", len(items), cutoff.isoformat())
+
+        archived = 0
+        for start in range(0, len(items), BATCH_SIZE):
+            batch = items[start:start + BATCH_SIZE]
+            self.write(batch)
+            archived += self.db_service.delete_rss_items(batch)
+        metrics.record("archived_items", archived, unit="Count")
+        return archived
+
+    def archive_stream_records(self, records: Iterable[dict]) -> int:
+        """
+        Archive the items of DynamoDB stream REMOVE records (the stream needs old images).
+
+        Args:
+            records (Iterable[dict]): The Records of a DynamoDB stream event.
+
+        Returns:
+            int: The number of items archived.
+        """
+        deserializer = TypeDeserializer()
+        items = []
+        for record in records:
+            old_image = record.get('dynamodb', {}).get('OldImage')
+            if record.get('eventName') != 'REMOVE' or not old_image:
+                continue
+            row = {name: deserializer.deserialize(value) for name, value in old_image.items()}
+            items.append(RSSItem.from_dynamodb_item(row))
+        self.write(items)
+        metrics.record("archived_items", len(items), unit="Count")
+        return len(items)
+
+    def write(self, items: List[RSSItem]) -> List[str]:
+        """
+        Write items to new part files, one per publication day.
+
+        Args:
+            items (List[RSSItem]): The items to archive.
+
+        Returns:
+            List[str]: The keys written.
+        """
+        partitions: Dict[date, List[RSSItem]] = defaultdict(list)
+        for item in items:
+            partitions[item.pub_date.astimezone(timezone.utc).date()].append(item)
+
+        keys = []
+        for day, day_items in sorted(partitions.items()):
+            lines = ''.join(json.dumps(item.model_dump(), ensure_ascii=False) + '\n' for item in day_items)
+            body = gzip.compress(lines.encode('utf-8'), mtime=0)
+            key = f"{ARCHIVE_PREFIX}dt={day.isoformat()}/part-{int(time.time())}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+            with metrics.timer("archive_write"):
+                self.feed_store.put_object(self.bucket_name, key, body, content_type='application/gzip')
+            metrics.record("archive_bytes", len(body), unit="Bytes")
+            keys.append(key)
+        return keys
+
+    def read(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[RSSItem]:
+        """
+        Read archived items published between start and end (inclusive), day by day.
+
+        Args:
+            start (Optional[date]): First publication day; unbounded if None.
+            end (Optional[date]): Last publication day; unbounded if None.
+
+        Yields:
+            RSSItem: The archived items, each id once.
+        """
+        seen_ids = set()
+        for key in sorted(self.partition_keys(start, end)):
+            with metrics.timer("archive_read"):
+                body = gzip.decompress(self.feed_store.get_object(self.bucket_name, key))
+            for line in body.decode('utf-8').splitlines():
+                if not line:
+                    continue
+                row = json.loads(line)
+                if row['id'] not in seen_ids:
+                    seen_ids.add(row['id'])
+                    yield RSSItem.from_dynamodb_item(row)
+
+    def partition_keys(self, start: Optional[date] = None, end: Optional[date] = None) -> List[str]:
+        """The part files of the days between start and end (inclusive)."""
+        keys = []
+        for key in self.feed_store.list_objects(self.bucket_name, ARCHIVE_PREFIX):
+            partition = key[len(ARCHIVE_PREFIX):].split('/', 1)[0]
+            if not partition.startswith('dt='):
+                continue
+            day = date.fromisoformat(partition[3:])
+            if (start is None or day >= start) and (end is None or day <= end):
+                keys.append(key)
+        return keys
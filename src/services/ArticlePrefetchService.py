@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Sequence, Tuple
+
+from src.models.RSSItem import RSSItem
+from src.services.ArticleService import ArticleService
+from src.services.StorageBackend import BlobNotFoundError, FeedBlobStore
+from src.utils import metrics
+
+# ==============================================================
+# Article prefetch.
+#
+# aggregate_news hands newly inserted items to prefetch(), which
+# downloads and extracts their articles on a small thread pool and
+# stores {"text", "image_link"} as JSON under articles/<id>.json.
+# The key is saved on the item (article_key), so process_items can
+# load the text instead of fetching the page on the posting path.
+#
+# Only the blob uploads run on the pool; repository writes stay on
+# the calling thread because boto3 resources are not thread-safe.
+# ==============================================================
+
+ARTICLE_PREFIX = "articles/"
+
+
+class ArticlePrefetchService:
+    """Extracts articles at ingestion time and serves the stored results."""
+
+    def __init__(self, feed_store: FeedBlobStore, db_service, bucket_name: Optional[str] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the ArticlePrefetchService.
+
+        Args:
+            feed_store (FeedBlobStore): Where extracted articles are stored.
+            db_service: The RSSItemRepository the article keys are written to.
+            bucket_name (Optional[str]): Bucket for the article blobs. Defaults to ARTICLE_BUCKET_NAME,
+                then the feed bucket.
+            max_workers (Optional[int]): Number of articles fetched concurrently. Defaults to
+                ARTICLE_PREFETCH_WORKERS or 4.
+        """
+        self.logger = logging.getLogger("AppLogger")
+        self.feed_store = feed_store
+        self.db_service = db_service
+        self.bucket_name = (bucket_name or os.getenv("ARTICLE_BUCKET_NAME")
+                            or os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed"))
+        self.max_workers = max(1, max_workers or int(os.getenv("ARTICLE_PREFETCH_WORKERS", "4")))
+
+    def prefetch(self, items: Sequence[RSSItem]) -> int:
+        """
+        Extract and store the articles of items, then record their keys.
+
+        Failures are logged per item; such items are extracted on demand later.
+
+        Args:
+            items (Sequence[RSSItem]): Newly saved items.
+
+        Returns:
+            int: The number of articles stored.
+        """
+        if not items:
+            return 0
+        self.logger.info("Prefetching %s articles with %s workers.", len(items), self.max_workers)
+        stored = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch") as pool:
+            futures = {pool.submit(self.store_article, item): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    key, _, _ = future.result()
+                except Exception as e:
+                    self.logger.warning("Could not prefetch article %s: %s", item.link, e)
+                    continue
+                if self.db_service.set_rss_item_article_key(item, key):
+                    stored += 1
+        metrics.record("articles_prefetched", stored, unit="Count")
+        self.logger.info("Prefetched %s of %s articles.", stored, len(items))
+        return stored
+
+    def load(self, item: RSSItem) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Return the stored (text, image_link) of item, or None if it was not prefetched.
+
+        Args:
+            item (RSSItem): The item whose article to load.
+        """
+        if not item.article_key:
+            return None
+        try:
+            data = json.loads(self.feed_store.get_object(self.bucket_name, item.article_key))
+        except (BlobNotFoundError, ValueError) as e:
+            self.logger.warning("Prefetched article %s unavailable: %s", item.article_key, e)
+            return None
+        return data['text'], data.get('image_link')
+
+    def excerpts(self, items: Sequence[RSSItem], length: int = 400) -> List[Optional[str]]:
+        """
+        Return the first length characters of each prefetched article, None where missing.
+
+        Args:
+            items (Sequence[RSSItem]): The items, e.g. the choose_post candidates.
+            length (int): Maximum excerpt length.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch") as pool:
+            articles = list(pool.map(self.load, items))
+        return [' '.join(article[0][:length].split()) if article else None for article in articles]
+
+    def store_article(self, item: RSSItem) -> Tuple[str, str, Optional[str]]:
+        """Extract the article of item and upload it. Returns its key, text and image link."""
+        text, image_link = ArticleService.extract_article(str(item.link), item.outlet)
+        key = f"{ARTICLE_PREFIX}{item.id}.json"
+        body = json.dumps({'text': text, 'image_link': image_link}, ensure_ascii=False).encode('utf-8')
+        self.feed_store.put_object(self.bucket_name, key, body, content_type='application/json')
+        return key, text, image_link
@@ -1,11 +1,14 @@
 import logging
 from typing import Optional, Tuple
+from urllib.parse import urlparse
 
 import html2text
 import requests
 from pydantic import HttpUrl
 
 from src.services.ArticleImageExtractionService import ArticleImageExtractionService
+from src.utils import metrics
+from src.utils.http_client import get_session
 
 # Initialize logger
 logger = logging.getLogger("AppLogger")
@@ -21,16 +24,47 @@ logger = logging.getLogger("AppLogger")
 
 
 class ArticleService:
+    # Outlets (FeedSource.name, stored as RSSItem.outlet) with a dedicated extractor, and their hosts.
+    # Articles of any other configured outlet go through extract_generic_article.
+    EXTRACTORS = {
+        'TechCrunch': ('extract_techcrunch_article', 'techcrunch.com'),
+        'Ars Technica': ('extract_arstechnica_article', 'arstechnica.com'),
+    }
+
+    @classmethod
+    def extract_article(cls, url: HttpUrl, outlet: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        """
+        Extract article text and image link, picking the extractor by outlet.
+
+        Args:
+            url (HttpUrl): The article URL.
+            outlet (Optional[str]): The item's outlet. Defaults to the outlet_of the URL.
+        """
+        extractor = cls.EXTRACTORS.get(outlet or cls.outlet_of(url))
+        if extractor is None:
+            return cls.extract_generic_article(url)
+        return getattr(cls, extractor[0])(url)
+
+    @classmethod
+    def outlet_of(cls, url: HttpUrl) -> str:
+        """The outlet with a dedicated extractor serving url, else the URL's host name."""
+        host = (urlparse(str(url)).hostname or '').lower()
+        for outlet, (_, outlet_host) in cls.EXTRACTORS.items():
+            if host == outlet_host or host.endswith('.' + outlet_host):
+                return outlet
+        return host.removeprefix('www.')
+
     @staticmethod
     def _fetch_and_parse_html(url: HttpUrl) -> Tuple[str, str]:
         """Fetch HTML content and parse it to plain text and links."""
-        logger.info(f"Fetching HTML content from URL: {url}")
+        logger.info("Fetching HTML content from URL: %s", url)
         try:
-            response = requests.get(url)
+            with metrics.timer("article_fetch"):
+                response = get_session().get(url)
             response.raise_for_status()
-            logger.debug(f"Successfully fetched content from {url}")
+            logger.debug("Successfully fetched content from %s", url)
         except requests.RequestException as e:
-            logger.error(f"Failed to fetch content from {url}: {e}")
+            logger.error("Failed to fetch content from %s: %s", url, e)
             raise
 
         html_content = response.text
@@ -38,27 +72,29 @@ class ArticleService:
         text_maker = html2text.HTML2Text()
         text_maker.ignore_links = True
         logger.debug("Parsing HTML content to extract article text.")
-        article_text = text_maker.handle(html_content)
+        with metrics.timer("html2text", output="text"):
+            article_text = text_maker.handle(html_content)
 
         text_maker.ignore_links = False
         logger.debug("Parsing HTML content to extract links.")
-        links = text_maker.handle(html_content)
+        with metrics.timer("html2text", output="links"):
+            links = text_maker.handle(html_content)
 
         return article_text, links
 
     @staticmethod
     def _extract_text_between_markers(text: str, start_marker: str, end_marker: str) -> str:
         """Extract text between given start and end markers."""
-        logger.debug(f"Extracting text between markers: '{start_marker}' and '{end_marker}'")
+        logger.debug("Extracting text between markers: '%s' and '%s'", start_marker, end_marker)
         start_pos = text.find(start_marker)
         if start_pos == -1:
-            logger.error(f"Start marker '{start_marker}' not found.")
+            logger.error("Start marker '%s' not found.", start_marker)
             raise ValueError(f"Start marker '{start_marker}' not found.")
         start_pos += len(start_marker)
 
         end_pos = text.find(end_marker, start_pos)
         if end_pos == -1:
-            logger.error(f"End marker '{end_marker}' not found.")
+            logger.error("End marker '%s' not found.", end_marker)
             raise ValueError(f"End marker '{end_marker}' not found.")
 
         extracted = text[start_pos:end_pos].strip()
@@ -68,12 +104,12 @@ class ArticleService:
     @classmethod
     def extract_techcrunch_article(cls, url: HttpUrl) -> Tuple[str, Optional[str]]:
         """Extract article text and image link from TechCrunch URL."""
-        logger.info(f"Extracting TechCrunch article from URL: {url}")
+        logger.info("Extracting TechCrunch article from URL: %s", url)
         try:
             article_text, links = cls._fetch_and_parse_html(url)
             logger.debug("Fetched and parsed HTML content successfully.")
         except Exception as e:
-            logger.error(f"Error fetching and parsing HTML for TechCrunch article: {e}")
+            logger.error("Error fetching and parsing HTML for TechCrunch article: %s", e)
             raise
 
         try:
@@ -95,7 +131,7 @@ class ArticleService:
 
         image_link = ArticleImageExtractionService.extract_techcrunch_image(links)
         if image_link:
-            logger.info(f"Extracted image link: {image_link}")
+            logger.info("Extracted image link: %s", image_link)
         else:
             logger.warning("No image link found for TechCrunch article.")
 
@@ -104,25 +140,36 @@ class ArticleService:
     @classmethod
     def extract_arstechnica_article(cls, url: HttpUrl) -> Tuple[str, Optional[str]]:
         """Extract article text and image link from Ars Technica URL."""
-        logger.info(f"Extracting Ars Technica article from URL: {url}")
+        logger.info("Extracting Ars Technica article from URL: %s", url)
         try:
             article_text, links = cls._fetch_and_parse_html(url)
             logger.debug("Fetched and parsed HTML content successfully.")
         except Exception as e:
-            logger.error(f"Error fetching and parsing HTML for Ars Technica article: {e}")
+            logger.error("Error fetching and parsing HTML for Ars Technica article: %s", e)
             raise
 
         try:
             extracted_text = cls._extract_text_between_markers(article_text, "####", "### Channel Ars Technica")
             logger.debug("Extracted text using markers '####', '### Channel Ars Technica'.")
         except ValueError as ve:
-            logger.error(f"Failed to extract Ars Technica article text: {ve}")
+            logger.error("Failed to extract Ars Technica article text: %s", ve)
             raise
 
         image_link = ArticleImageExtractionService.extract_arstechnica_image(links)
         if image_link:
-            logger.info(f"Extracted image link: {image_link}")
+            logger.info("Extracted image link: %s", image_link)
         else:
             logger.warning("No image link found for Ars Technica article.")
 
         return extracted_text, image_link
+
+    @classmethod
+    def extract_generic_article(cls, url: HttpUrl) -> Tuple[str, Optional[str]]:
+        """Extract article text of an outlet without a dedicated extractor: the page from its first heading on, without image."""
+        logger.info("Extracting article without an outlet-specific extractor from URL: %s", url)
+        article_text, _ = cls._fetch_and_parse_html(url)
+        heading = article_text.find("# ")
+        extracted_text = (article_text[heading:] if heading != -1 else article_text).strip()
+        if not extracted_text:
+            raise ValueError(f"No article text found at {url}")
+        return extracted_text, None
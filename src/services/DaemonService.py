@@ -0,0 +1,82 @@
+import logging
+import signal
+import threading
+import time
+from typing import Callable, List, Optional
+
+from src.utils import metrics
+
+# ==============================================================
+# Long-running mode (python main.py serve).
+#
+# Runs registered jobs at fixed intervals on the main thread, so the
+# services they close over (HTTP session, AWS/OpenAI clients, feed
+# schedule, seen links) stay warm between runs. SIGTERM/SIGINT let
+# the running job finish, then stop the loop.
+# ==============================================================
+
+
+class _Job:
+    """A callable run every interval seconds."""
+
+    def __init__(self, name: str, interval: float, run: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self.run = run
+        self.next_run = 0.0
+
+
+class DaemonService:
+    """Minimal in-process interval scheduler with graceful shutdown."""
+
+    def __init__(self):
+        self.logger = logging.getLogger("AppLogger")
+        self._jobs: List[_Job] = []
+        self._stop = threading.Event()
+
+    def add_job(self, name: str, interval: float, run: Callable[[], None]) -> None:
+        """
+        Register a job. Every job runs once at startup, then every interval seconds.
+
+        Args:
+            name (str): Name used in logs and metrics.
+            interval (float): Seconds between the starts of two runs.
+            run (Callable[[], None]): The job.
+        """
+        self._jobs.append(_Job(name, interval, run))
+
+    def stop(self, signum: Optional[int] = None, frame=None) -> None:
+        """Ask the loop to exit after the current job. Usable as a signal handler."""
+        if signum is not None:
+            self.logger.info("Received %s, shutting down after the current job.", signal.Signals(signum).name)
+        self._stop.set()
+
+    def run_forever(self) -> None:
+        """Run the jobs until stop() is called or SIGTERM/SIGINT arrives."""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.stop)
+        self.logger.info("Daemon started with jobs: %s",
+                         ", ".join(f"{job.name} every {job.interval:.0f}s" for job in self._jobs))
+
+        while not self._stop.is_set():
+            job = min(self._jobs, key=lambda j: j.next_run)
+            wait = job.next_run - time.monotonic()
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+            self._run_job(job)
+
+        self.logger.info("Daemon stopped.")
+
+    def _run_job(self, job: _Job) -> None:
+        """Run job once, logging failures, flushing its metrics and scheduling its next run."""
+        started = time.monotonic()
+        try:
+            with metrics.timer(job.name):
+                job.run()
+        except Exception as e:
+            self.logger.error("Job %s failed: %s", job.name, e)
+        finally:
+            metrics.flush()
+        # Intervals are measured between starts; a slow run is followed immediately by the next.
+        job.next_run = started + job.interval
@@ -1,19 +1,48 @@
 import logging
 import os
 import random
-from datetime import datetime
-from typing import List, Optional
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional
 
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
-from pydantic import ValidationError
 
 from src.models.Post import Post
 from src.models.RSSItem import RSSItem
-
-
-class DynamoDBService:
+from src.services.StorageBackend import PostRepository, RSSItemRepository
+from src.utils import metrics
+
+# ==============================================================
+# Sparse unprocessed index.
+#
+# Unprocessed items carry an extra `unprocessed` attribute (always 1)
+# that is removed once they are processed. A GSI keyed on
+# unprocessed/pub_date therefore only ever contains unprocessed items,
+# so reading the newest ones stays cheap however large the table gets.
+#
+# To switch over: create the GSI (partition key `unprocessed` N,
+# sort key `pub_date` S), run `python main.py migrate_unprocessed_index`,
+# then set DYNAMODB_UNPROCESSED_INDEX to the GSI name. The old
+# processed-pub_date-index can be dropped afterwards.
+# ==============================================================
+UNPROCESSED_ATTRIBUTE = 'unprocessed'
+
+# Work claiming: a worker owns an item while lease_expires_at (epoch
+# seconds) lies in the future. Expired leases can be claimed by anyone.
+LEASE_OWNER_ATTRIBUTE = 'lease_owner'
+LEASE_EXPIRES_ATTRIBUTE = 'lease_expires_at'
+
+# Archival: with DYNAMODB_ITEM_TTL_DAYS set, items carry expires_at
+# (epoch seconds, pub_date plus the TTL). Enable TTL on that attribute
+# and a stream on the table, and DynamoDB deletes expired items itself;
+# the stream's REMOVE records are archived, see ArchiveService.
+EXPIRES_ATTRIBUTE = 'expires_at'
+
+
+class DynamoDBService(RSSItemRepository, PostRepository):
     """Service class for interacting with DynamoDB tables."""
 
     # Default is what you set in .env. If your db isn't found you're probably not passing the correct region
@@ -25,43 +54,88 @@ class DynamoDBService:
             region_name (str): AWS region name. Defaults to what you specified in .env.
         """
         self.logger = logging.getLogger("AppLogger")
-        self.logger.debug(f"Initializing DynamoDBService with region: {region_name}")
-        self.dynamodb = boto3.resource('dynamodb', region_name=region_name)
+        self.logger.debug("Initializing DynamoDBService with region: %s", region_name)
+        self.region_name = region_name
+        self.rss_table_name = os.getenv("DYNAMODB_SCRAPED_TABLE_NAME")
+        self.posts_table_name = os.getenv("DYNAMODB_POSTS_TABLE_NAME")
+        self._local = threading.local()
         try:
-            self.rss_table = self.dynamodb.Table(os.getenv("DYNAMODB_SCRAPED_TABLE_NAME"))
-            self.logger.info(f"Initialized RSS table: {os.getenv('DYNAMODB_SCRAPED_TABLE_NAME')}")
+            self.logger.info("Initialized RSS table: %s", self.rss_table.name)
         except ClientError as e:
-            self.logger.error(f"Error initializing RSS table: {e.response['Error']['Message']}")
+            self.logger.error("Error initializing RSS table: %s", e.response['Error']['Message'])
         except Exception as e:
-            self.logger.error(f"Unexpected error initializing RSS table: {str(e)}")
+            self.logger.error("Unexpected error initializing RSS table: %s", e)
         try:
-            self.posts_table = self.dynamodb.Table(os.getenv("DYNAMODB_POSTS_TABLE_NAME"))
-            self.logger.info(f"Initialized Posts table: {os.getenv('DYNAMODB_POSTS_TABLE_NAME')}")
+            self.logger.info("Initialized Posts table: %s", self.posts_table.name)
         except ClientError as e:
-            self.logger.error(f"Error initializing posts table: {e.response['Error']['Message']}")
+            self.logger.error("Error initializing posts table: %s", e.response['Error']['Message'])
         except Exception as e:
-            self.logger.error(f"Unexpected error initializing posts table: {str(e)}")
+            self.logger.error("Unexpected error initializing posts table: %s", e)
+
+    @property
+    def dynamodb(self):
+        """
+        The calling thread's DynamoDB resource.
 
-    def save_rss_items(self, items: List[RSSItem]) -> None:
+        boto3 resources are not thread-safe, and lease heartbeats, persona workers and
+        export segments use the service from several threads; each gets its own session.
+        """
+        resource = getattr(self._local, 'dynamodb', None)
+        if resource is None:
+            # DYNAMODB_ENDPOINT_URL points the service at DynamoDB Local for offline runs.
+            resource = boto3.session.Session().resource('dynamodb', region_name=self.region_name,
+                                                        endpoint_url=os.getenv("DYNAMODB_ENDPOINT_URL") or None)
+            self._local.dynamodb = resource
+            self._local.tables = {}
+        return resource
+
+    @property
+    def rss_table(self):
+        """The RSS items table, on the calling thread's resource."""
+        return self._table(self.rss_table_name)
+
+    @property
+    def posts_table(self):
+        """The posts table, on the calling thread's resource."""
+        return self._table(self.posts_table_name)
+
+    def _table(self, name: str):
+        resource = self.dynamodb
+        table = self._local.tables.get(name)
+        if table is None:
+            table = self._local.tables[name] = resource.Table(name)
+        return table
+
+    def save_rss_items(self, items: List[RSSItem], stored: Optional[List[RSSItem]] = None) -> List[RSSItem]:
         """
         Save unique RSSItem objects to DynamoDB.
 
         Args:
             items (List[RSSItem]): List of RSSItem objects to save.
+            stored (Optional[List[RSSItem]]): Receives the items whose link is already stored.
+
+        Returns:
+            List[RSSItem]: The items that were not stored yet and have been saved.
         """
-        self.logger.info(f"Saving {len(items)} RSS items.")
+        self.logger.info("Saving %s RSS items.", len(items))
+        saved = []
         for item in items:
             try:
                 if not self._item_exists(item.link):
-                    self.rss_table.put_item(Item=item.model_dump())
-                    self.logger.debug(f"Saved RSS item with link: {item.link}")
+                    with metrics.timer("dynamodb_put", table="rss"):
+                        self.rss_table.put_item(Item=self._to_dynamodb_item(item))
+                    saved.append(item)
+                    self.logger.debug("Saved RSS item with link: %s", item.link)
                 else:
-                    self.logger.info(f"Item with link {item.link} already exists. Skipping.")
+                    self.logger.info("Item with link %s already exists. Skipping.", item.link)
+                    if stored is not None:
+                        stored.append(item)
             except ClientError as e:
-                self.logger.error(f"Error processing item with link {item.link}: {e.response['Error']['Message']}")
+                self.logger.error("Error processing item with link %s: %s", item.link, e.response['Error']['Message'])
             except Exception as e:
-                self.logger.error(f"Unexpected error processing item with link {item.link}: {str(e)}")
-        self.logger.info("Completed saving RSS items.")
+                self.logger.error("Unexpected error processing item with link %s: %s", item.link, e)
+        self.logger.info("Completed saving RSS items: %s new.", len(saved))
+        return saved
 
     def update_rss_item(self, item: RSSItem) -> None:
         """
@@ -70,14 +144,224 @@ class DynamoDBService:
         Args:
             item (RSSItem): RSSItem object to update.
         """
-        self.logger.info(f"Updating RSS item with link: {item.link}")
+        self.logger.info("Updating RSS item with link: %s", item.link)
         try:
-            self.rss_table.put_item(Item=item.model_dump())
-            self.logger.debug(f"Updated RSS item with link: {item.link}")
+            with metrics.timer("dynamodb_put", table="rss"):
+                self.rss_table.put_item(Item=self._to_dynamodb_item(item))
+            self.logger.debug("Updated RSS item with link: %s", item.link)
         except ClientError as e:
-            self.logger.error(f"Error updating item with link {item.link}: {e.response['Error']['Message']}")
+            self.logger.error("Error updating item with link %s: %s", item.link, e.response['Error']['Message'])
         except Exception as e:
-            self.logger.error(f"Unexpected error updating item with link {item.link}: {str(e)}")
+            self.logger.error("Unexpected error updating item with link %s: %s", item.link, e)
+
+    def set_rss_item_article_key(self, item: RSSItem, article_key: str) -> bool:
+        """
+        Store the key of the prefetched article on an existing RSSItem.
+
+        Args:
+            item (RSSItem): The item the article belongs to.
+            article_key (str): Blob store key of the article.
+
+        Returns:
+            bool: True if the item was updated, False if it is missing.
+        """
+        updated = self._conditional_update(
+            item,
+            update='SET article_key = :key',
+            condition='attribute_exists(id)',
+            values={':key': article_key},
+        )
+        if updated:
+            item.article_key = article_key
+        return updated
+
+    def mark_rss_item_processed(self, item: RSSItem, owner: Optional[str] = None) -> bool:
+        """
+        Mark an RSSItem as processed with a targeted UpdateItem.
+
+        Only the processed flag, the sparse index key and the lease are touched, and
+        the condition makes the write fail instead of resurrecting a deleted item or
+        processing an item twice.
+
+        Args:
+            item (RSSItem): The item to mark.
+            owner (Optional[str]): If given, only succeed while this worker holds the lease.
+
+        Returns:
+            bool: True if the item was marked, False if it was missing, already processed
+            or leased by someone else.
+        """
+        self.logger.info("Marking RSS item as processed: %s", item.link)
+        condition = 'attribute_exists(id) AND processed = :zero'
+        values = {':one': 1, ':zero': 0}
+        if owner is not None:
+            condition += ' AND #owner = :owner'
+            values[':owner'] = owner
+        marked = self._conditional_update(
+            item,
+            update='SET processed = :one REMOVE #unprocessed, #owner, #expires',
+            condition=condition,
+            values=values,
+        )
+        if marked:
+            item.processed = True
+        return marked
+
+    def claim_rss_item(self, item: RSSItem, owner: str, lease_seconds: int) -> bool:
+        """
+        Claim an unprocessed RSSItem for owner.
+
+        The conditional write succeeds if the item has no lease, if its lease expired
+        (which reclaims items of crashed workers), or if owner already holds it.
+
+        Args:
+            item (RSSItem): The item to claim.
+            owner (str): Unique id of the claiming worker.
+            lease_seconds (int): How long the claim lasts unless renewed.
+
+        Returns:
+            bool: True if owner now holds the lease.
+        """
+        now = int(time.time())
+        claimed = self._conditional_update(
+            item,
+            update='SET #owner = :owner, #expires = :expires',
+            condition=('attribute_exists(id) AND processed = :zero AND '
+                       '(attribute_not_exists(#expires) OR #expires < :now OR #owner = :owner)'),
+            values={':owner': owner, ':expires': now + lease_seconds, ':now': now, ':zero': 0},
+        )
+        self.logger.info("Claim of %s by %s: %s", item.link, owner, "granted" if claimed else "refused")
+        return claimed
+
+    def renew_rss_item_lease(self, item: RSSItem, owner: str, lease_seconds: int) -> bool:
+        """
+        Extend owner's lease on an RSSItem (heartbeat).
+
+        Returns:
+            bool: False if owner no longer holds the lease.
+        """
+        return self._conditional_update(
+            item,
+            update='SET #expires = :expires',
+            condition='#owner = :owner AND processed = :zero',
+            values={':owner': owner, ':expires': int(time.time()) + lease_seconds, ':zero': 0},
+        )
+
+    def release_rss_item_lease(self, item: RSSItem, owner: str) -> bool:
+        """
+        Give up owner's lease so another worker can pick the item right away.
+
+        Returns:
+            bool: False if owner did not hold the lease.
+        """
+        return self._conditional_update(
+            item,
+            update='REMOVE #owner, #expires',
+            condition='#owner = :owner',
+            values={':owner': owner},
+        )
+
+    def _conditional_update(self, item: RSSItem, update: str, condition: str, values: dict) -> bool:
+        """
+        Run an UpdateItem on an RSS item with the lease/index attribute names bound.
+
+        Returns:
+            bool: True if the update was applied, False if the condition failed or DynamoDB errored.
+        """
+        try:
+            with metrics.timer("dynamodb_update", table="rss"):
+                self.rss_table.update_item(
+                    Key={'id': str(item.id)},
+                    UpdateExpression=update,
+                    ConditionExpression=condition,
+                    ExpressionAttributeNames={
+                        name: attribute for name, attribute in (
+                            ('#unprocessed', UNPROCESSED_ATTRIBUTE),
+                            ('#owner', LEASE_OWNER_ATTRIBUTE),
+                            ('#expires', LEASE_EXPIRES_ATTRIBUTE),
+                        ) if name in update or name in condition
+                    },
+                    ExpressionAttributeValues=values,
+                )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                self.logger.debug("Condition failed updating RSS item %s: %s", item.link, condition)
+            else:
+                self.logger.error("Error updating item with link %s: %s", item.link, e.response['Error']['Message'])
+        return False
+
+    def migrate_unprocessed_index(self) -> int:
+        """
+        Add or remove the sparse index attribute on every existing item.
+
+        Scans the table page by page, projecting only the needed attributes, and
+        updates items whose `unprocessed` attribute disagrees with `processed`.
+
+        Returns:
+            int: The number of items changed.
+        """
+        self.logger.info("Migrating RSS items to the sparse unprocessed index layout.")
+        changed = 0
+        scan_kwargs = {
+            'ProjectionExpression': 'id, processed, #unprocessed',
+            'ExpressionAttributeNames': {'#unprocessed': UNPROCESSED_ATTRIBUTE},
+        }
+        while True:
+            with metrics.timer("dynamodb_scan", table="rss"):
+                response = self.rss_table.scan(**scan_kwargs)
+            for row in response.get('Items', []):
+                processed = bool(row.get('processed', 0))
+                if processed == (UNPROCESSED_ATTRIBUTE in row):
+                    changed += self._migrate_row(row['id'], processed)
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        self.logger.info("Sparse index migration finished, %s items changed.", changed)
+        return changed
+
+    def _migrate_row(self, item_id: str, processed: bool) -> int:
+        """Fix the sparse index attribute of one row. Returns 1 if it changed."""
+        if processed:
+            update = 'REMOVE #unprocessed'
+            values = {':processed': 1}
+        else:
+            update = 'SET #unprocessed = :one'
+            values = {':processed': 0, ':one': 1}
+        try:
+            self.rss_table.update_item(
+                Key={'id': item_id},
+                UpdateExpression=update,
+                # Skip rows whose state changed since they were scanned.
+                ConditionExpression='processed = :processed',
+                ExpressionAttributeNames={'#unprocessed': UNPROCESSED_ATTRIBUTE},
+                ExpressionAttributeValues=values,
+            )
+            return 1
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                self.logger.error("Error migrating item %s: %s", item_id, e.response['Error']['Message'])
+            return 0
+
+    def get_rss_item(self, item_id: str) -> Optional[RSSItem]:
+        """
+        Retrieve a stored item by id with GetItem.
+
+        Args:
+            item_id (str): The id of the item.
+
+        Returns:
+            Optional[RSSItem]: The RSSItem, or None if there is no such item or DynamoDB errored.
+        """
+        try:
+            with metrics.timer("dynamodb_get", table="rss"):
+                row = self.rss_table.get_item(Key={'id': str(item_id)}).get('Item')
+            return RSSItem.from_dynamodb_item(row) if row else None
+        except ClientError as e:
+            self.logger.error("Error reading RSS item %s: %s", item_id, e.response['Error']['Message'])
+        except (KeyError, ValueError) as e:
+            self.logger.error("Error converting DynamoDB item to RSSItem: %s", e)
+        return None
 
     def get_random_unprocessed_item(self) -> Optional[RSSItem]:
         """
@@ -88,11 +372,13 @@ class DynamoDBService:
         """
         self.logger.debug("Fetching a random unprocessed RSS item.")
         try:
-            response = self.rss_table.query(
-                IndexName='processed-id-index',
-                KeyConditionExpression=Key('processed').eq(0),
-                Limit=20
-            )
+            index_name, key_condition = self._unprocessed_index('processed-id-index')
+            with metrics.timer("dynamodb_query", index=index_name):
+                response = self.rss_table.query(
+                    IndexName=index_name,
+                    KeyConditionExpression=key_condition,
+                    Limit=20
+                )
             items = response.get('Items', [])
 
             if not items:
@@ -100,87 +386,107 @@ class DynamoDBService:
                 return None
 
             random_item = random.choice(items)
-            self.logger.debug(f"Selected random item with link: {random_item.get('link')}")
-            if 'pub_date' in random_item:
-                random_item['pub_date'] = datetime.fromisoformat(random_item['pub_date'])
-
-            return RSSItem(**random_item)
+            self.logger.debug("Selected random item with link: %s", random_item.get('link'))
+            return RSSItem.from_dynamodb_item(random_item)
         except ClientError as e:
             self.logger.error(
-                f"ClientError querying DynamoDB: {e.response['Error']['Code']} - {e.response['Error']['Message']}")
-        except ValidationError as e:
-            self.logger.error(f"Error converting DynamoDB item to RSSItem: {str(e)}")
+                "ClientError querying DynamoDB: %s - %s", e.response['Error']['Code'], e.response['Error']['Message'])
+        except (KeyError, ValueError) as e:
+            self.logger.error("Error converting DynamoDB item to RSSItem: %s", e)
         except Exception as e:
-            self.logger.error(f"Unexpected error: {str(e)}")
+            self.logger.error("Unexpected error: %s", e)
 
         return None
 
-    def get_last_unprocessed_rss_items(self, amount: int) -> List[RSSItem]:
+    def get_last_unprocessed_rss_items(self, amount: int, exclude_leased: bool = False) -> List[RSSItem]:
         """
         Retrieve the last unprocessed RSSItems from the DynamoDB table.
 
         Args:
             amount (int): Number of items to retrieve.
+            exclude_leased (bool): Skip items currently claimed by a worker. The filter runs
+                after Limit, so fewer than amount items may be returned.
 
         Returns:
             List[RSSItem]: List of unprocessed RSSItems.
         """
-        self.logger.info(f"Retrieving the last {amount} unprocessed RSS items.")
+        self.logger.info("Retrieving the last %s unprocessed RSS items.", amount)
         try:
-            response = self.rss_table.query(
-                IndexName='processed-pub_date-index',
-                KeyConditionExpression=Key('processed').eq(0),
-                ScanIndexForward=False,
-                Limit=amount
-            )
+            index_name, key_condition = self._unprocessed_index('processed-pub_date-index')
+            query_kwargs = {}
+            if exclude_leased:
+                query_kwargs['FilterExpression'] = (Attr(LEASE_EXPIRES_ATTRIBUTE).not_exists()
+                                                    | Attr(LEASE_EXPIRES_ATTRIBUTE).lt(int(time.time())))
+            with metrics.timer("dynamodb_query", index=index_name):
+                response = self.rss_table.query(
+                    IndexName=index_name,
+                    KeyConditionExpression=key_condition,
+                    ScanIndexForward=False,
+                    Limit=amount,
+                    **query_kwargs
+                )
             items = response.get('Items', [])
 
             if not items:
                 self.logger.info("No unprocessed items found.")
                 return []
 
-            self.logger.debug(f"Retrieved {len(items)} unprocessed RSS items.")
-            return [RSSItem(**item) for item in items]
+            self.logger.debug("Retrieved %s unprocessed RSS items.", len(items))
+            return [RSSItem.from_dynamodb_item(item) for item in items]
         except ClientError as e:
             self.logger.error(
-                f"ClientError querying DynamoDB: {e.response['Error']['Code']} - {e.response['Error']['Message']}")
-        except ValidationError as e:
-            self.logger.error(f"Error converting DynamoDB items to RSSItems: {str(e)}")
+                "ClientError querying DynamoDB: %s - %s", e.response['Error']['Code'], e.response['Error']['Message'])
+        except (KeyError, ValueError) as e:
+            self.logger.error("Error converting DynamoDB items to RSSItems: %s", e)
         except Exception as e:
-            self.logger.error(f"Unexpected error: {str(e)}")
+            self.logger.error("Unexpected error: %s", e)
 
         return []
 
-    def get_latest_posts(self, amount: int) -> List[Post]:
+    def get_latest_posts(self, amount: int, persona: Optional[str] = None) -> List[Post]:
         """
         Retrieve the latest posts from the LinkedIn automation posts table.
 
         Args:
             amount (int): Number of posts to retrieve.
+            persona (Optional[str]): Only retrieve the posts of this persona ('' is the default persona,
+                including posts from before personas).
 
         Returns:
             List[Post]: List of the latest Post objects.
         """
-        self.logger.info(f"Retrieving the latest {amount} posts.")
+        self.logger.info("Retrieving the latest %s posts.", amount)
+        kwargs = {'Limit': amount}
+        if persona is not None:
+            # Limit caps the items read before the filter applies, so a filtered scan
+            # reads whole pages and follows them until amount matches are collected.
+            kwargs = {'FilterExpression': (Attr('persona').eq(persona) if persona
+                                           else Attr('persona').not_exists() | Attr('persona').eq(''))}
         try:
-            response = self.posts_table.scan(
-                Limit=amount,
-                ProjectionExpression='id, post_time, title, content, tags, source_link'
-            )
-            items = response.get('Items', [])
+            items = []
+            with metrics.timer("dynamodb_scan", table="posts"):
+                while True:
+                    response = self.posts_table.scan(
+                        ProjectionExpression='id, post_time, title, content, tags, source_link, persona',
+                        **kwargs
+                    )
+                    items.extend(response.get('Items', []))
+                    if persona is None or len(items) >= amount or 'LastEvaluatedKey' not in response:
+                        break
+                    kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
             if not items:
                 self.logger.info("No posts found.")
                 return []
 
             sorted_items = sorted(items, key=lambda x: x['post_time'], reverse=True)[:amount]
-            self.logger.debug(f"Retrieved and sorted {len(sorted_items)} posts.")
+            self.logger.debug("Retrieved and sorted %s posts.", len(sorted_items))
             return [Post.from_dynamodb_item(item) for item in sorted_items]
         except ClientError as e:
             self.logger.error(
-                f"ClientError querying DynamoDB: {e.response['Error']['Code']} - {e.response['Error']['Message']}")
+                "ClientError querying DynamoDB: %s - %s", e.response['Error']['Code'], e.response['Error']['Message'])
         except Exception as e:
-            self.logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+            self.logger.error("Unexpected error: %s", e, exc_info=True)
 
         return []
 
@@ -193,35 +499,188 @@ class DynamoDBService:
         """
         self.logger.info("Retrieving all RSS items from the table.")
         try:
-            response = self.rss_table.scan()
+            with metrics.timer("dynamodb_scan", table="rss"):
+                response = self.rss_table.scan()
             items = response.get('Items', [])
-            self.logger.debug(f"Retrieved {len(items)} RSS items.")
-            return [RSSItem(**item) for item in items]
+            self.logger.debug("Retrieved %s RSS items.", len(items))
+            return [RSSItem.from_dynamodb_item(item) for item in items]
         except ClientError as e:
             self.logger.error(
-                f"ClientError scanning DynamoDB: {e.response['Error']['Code']} - {e.response['Error']['Message']}")
-        except ValidationError as e:
-            self.logger.error(f"Error converting DynamoDB items to RSSItems: {str(e)}")
+                "ClientError scanning DynamoDB: %s - %s", e.response['Error']['Code'], e.response['Error']['Message'])
+        except (KeyError, ValueError) as e:
+            self.logger.error("Error converting DynamoDB items to RSSItems: %s", e)
         except Exception as e:
-            self.logger.error(f"Unexpected error: {str(e)}")
+            self.logger.error("Unexpected error: %s", e)
 
         return []
 
+    def get_rss_items_published_before(self, cutoff: datetime) -> List[RSSItem]:
+        """
+        Retrieve the RSSItems published before cutoff, oldest first.
+
+        Scans the whole table page by page; meant for the archival job, not the hot path.
+
+        Args:
+            cutoff (datetime): Timezone-aware upper bound of pub_date.
+
+        Returns:
+            List[RSSItem]: The older RSSItems.
+        """
+        self.logger.info("Retrieving RSS items published before %s.", cutoff.isoformat())
+        items = []
+        # pub_date is stored as ISO 8601 in UTC, so string comparison orders by time.
+        scan_kwargs = {'FilterExpression': Attr('pub_date').lt(cutoff.astimezone(timezone.utc).isoformat())}
+        try:
+            while True:
+                with metrics.timer("dynamodb_scan", table="rss"):
+                    response = self.rss_table.scan(**scan_kwargs)
+                items.extend(RSSItem.from_dynamodb_item(row) for row in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            self.logger.error(
+                "ClientError scanning DynamoDB: %s - %s", e.response['Error']['Code'], e.response['Error']['Message'])
+            return []
+        except (KeyError, ValueError) as e:
+            self.logger.error("Error converting DynamoDB items to RSSItems: %s", e)
+            return []
+        self.logger.debug("Retrieved %s RSS items.", len(items))
+        return sorted(items, key=lambda item: item.pub_date)
+
+    def scan_rss_items(self, since: Optional[datetime] = None, segment: int = 0,
+                       total_segments: int = 1) -> List[RSSItem]:
+        """
+        Retrieve one segment of a parallel scan of the RSS table, page by page.
+
+        Args:
+            since (Optional[datetime]): Timezone-aware lower bound (exclusive) of pub_date.
+            segment (int): Segment to read, from 0 to total_segments - 1.
+            total_segments (int): Number of segments the scan is split into.
+
+        Returns:
+            List[RSSItem]: The RSSItems of the segment.
+
+        Raises:
+            ClientError: If the scan fails.
+        """
+        condition = Attr('pub_date').gt(since.astimezone(timezone.utc).isoformat()) if since is not None else None
+        rows = self._scan_segment(self.rss_table, "rss", condition, segment, total_segments)
+        return self._convert_scanned(rows, RSSItem.from_dynamodb_item, "rss")
+
+    def scan_posts(self, since: Optional[datetime] = None, segment: int = 0, total_segments: int = 1) -> List[Post]:
+        """
+        Retrieve one segment of a parallel scan of the posts table, page by page.
+
+        Args:
+            since (Optional[datetime]): Lower bound (exclusive) of post_time, in its stored form.
+            segment (int): Segment to read, from 0 to total_segments - 1.
+            total_segments (int): Number of segments the scan is split into.
+
+        Returns:
+            List[Post]: The posts of the segment.
+
+        Raises:
+            ClientError: If the scan fails.
+        """
+        condition = Attr('post_time').gt(since.isoformat()) if since is not None else None
+        rows = self._scan_segment(self.posts_table, "posts", condition, segment, total_segments)
+        return self._convert_scanned(rows, Post.from_dynamodb_item, "posts")
+
+    def _scan_segment(self, table, table_name: str, condition, segment: int, total_segments: int) -> List[dict]:
+        """
+        Every row of one scan segment matching condition (None for all).
+
+        Errors are raised rather than logged, as by migrate_unprocessed_index: a partial
+        result would look like a complete one to the export.
+        """
+        scan_kwargs = {'Segment': segment, 'TotalSegments': total_segments}
+        if condition is not None:
+            scan_kwargs['FilterExpression'] = condition
+        rows = []
+        while True:
+            with metrics.timer("dynamodb_scan", table=table_name):
+                response = table.scan(**scan_kwargs)
+            rows.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return rows
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _convert_scanned(self, rows: List[dict], convert: Callable[[dict], Any], table_name: str) -> list:
+        """
+        Convert scanned rows, skipping and logging the ones that are not valid models.
+
+        One malformed row must not empty its whole segment: the export would advance
+        its watermark past every row of it.
+        """
+        models = []
+        for row in rows:
+            try:
+                models.append(convert(row))
+            except (KeyError, ValueError) as e:
+                self.logger.error("Skipping unreadable %s row %s: %s", table_name, row.get('id'), e)
+                metrics.record("unreadable_rows", 1, unit="Count", table=table_name)
+        return models
+
+    def delete_rss_items(self, items: List[RSSItem]) -> int:
+        """
+        Delete RSSItems by id, in batches.
+
+        Args:
+            items (List[RSSItem]): The items to delete.
+
+        Returns:
+            int: The number of items deleted.
+        """
+        try:
+            with metrics.timer("dynamodb_batch_delete", table="rss"), self.rss_table.batch_writer() as batch:
+                for item in items:
+                    batch.delete_item(Key={'id': str(item.id)})
+        except ClientError as e:
+            self.logger.error("Error deleting RSS items: %s", e.response['Error']['Message'])
+            return 0
+        self.logger.info("Deleted %s RSS items.", len(items))
+        return len(items)
+
     def save_post(self, post: Post) -> None:
         """
         Save a Post object to DynamoDB.
 
         Args:
             post (Post): Post object to save.
+
+        Raises:
+            ClientError: If the write failed; the posting journal records the stage as failed.
         """
-        self.logger.info(f"Saving post with ID: {post.id}")
+        self.logger.info("Saving post with ID: %s", post.id)
         try:
-            self.posts_table.put_item(Item=post.model_dump())
-            self.logger.debug(f"Post saved successfully with ID: {post.id}")
+            with metrics.timer("dynamodb_put", table="posts"):
+                self.posts_table.put_item(Item=post.model_dump())
+            self.logger.debug("Post saved successfully with ID: %s", post.id)
         except ClientError as e:
-            self.logger.error(f"Error saving post with ID {post.id}: {e.response['Error']['Message']}")
-        except Exception as e:
-            self.logger.error(f"Unexpected error saving post with ID {post.id}: {str(e)}")
+            self.logger.error("Error saving post with ID %s: %s", post.id, e.response['Error']['Message'])
+            raise
+
+    @staticmethod
+    def _to_dynamodb_item(item: RSSItem) -> dict:
+        """Serialise an RSSItem, adding the sparse index key while it is unprocessed."""
+        data = item.model_dump()
+        if data['article_key'] is None:
+            del data['article_key']
+        if not item.processed:
+            data[UNPROCESSED_ATTRIBUTE] = 1
+        ttl_days = os.getenv("DYNAMODB_ITEM_TTL_DAYS")
+        if ttl_days:
+            data[EXPIRES_ATTRIBUTE] = int(item.pub_date.timestamp()) + int(ttl_days) * 86400
+        return data
+
+    @staticmethod
+    def _unprocessed_index(legacy_index: str):
+        """The index and key condition selecting unprocessed items: the sparse GSI if configured."""
+        sparse_index = os.getenv("DYNAMODB_UNPROCESSED_INDEX")
+        if sparse_index:
+            return sparse_index, Key(UNPROCESSED_ATTRIBUTE).eq(1)
+        return legacy_index, Key('processed').eq(0)
 
     def _item_exists(self, link: str) -> bool:
         """
@@ -233,23 +692,24 @@ class DynamoDBService:
         Returns:
             bool: True if the item exists, False otherwise.
         """
-        self.logger.debug(f"Checking existence of item with link: {link}")
+        self.logger.debug("Checking existence of item with link: %s", link)
         try:
             # Cast link to str to ensure compatibility with DynamoDB
             link_str = str(link)
 
-            response = self.rss_table.query(
-                IndexName='link-index',
-                KeyConditionExpression=Key('link').eq(link_str)
-                # Removed ExpressionAttributeValues
-            )
+            with metrics.timer("dynamodb_query", index="link-index"):
+                response = self.rss_table.query(
+                    IndexName='link-index',
+                    KeyConditionExpression=Key('link').eq(link_str)
+                    # Removed ExpressionAttributeValues
+                )
             exists = response['Count'] > 0
-            self.logger.debug(f"Item with link {link} exists: {exists}")
+            self.logger.debug("Item with link %s exists: %s", link, exists)
             return exists
         except ClientError as e:
             self.logger.error(
-                f"ClientError checking item existence for link {link}: {e.response['Error']['Code']} - {e.response['Error']['Message']}")
+                "ClientError checking item existence for link %s: %s - %s", link, e.response['Error']['Code'], e.response['Error']['Message'])
         except Exception as e:
-            self.logger.error(f"Unexpected error checking item existence for link {link}: {str(e)}")
+            self.logger.error("Unexpected error checking item existence for link %s: %s", link, e)
 
         return False
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.models.Post import Post
+from src.models.RSSItem import RSSItem
+from src.utils import metrics
+
+# Optional: NumPy holds and searches the vectors; without it the index is disabled
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ==============================================================
+# Embedding index of posts and candidate items.
+#
+# Every post (and every item shown to choose_post) is embedded once
+# and kept on local disk in EMBEDDING_INDEX_DIR:
+#
+#   vectors.npy    float32 matrix, one unit-length row per entry,
+#                  memory-mapped and grown by doubling
+#   entries.jsonl  one {"id", "kind", "title", "text"} line per row
+#
+# A row counts only once its entry line is written, so a crash
+# while adding leaves unused rows, never a row without an entry.
+# Search is one matrix-vector product over the mapped rows plus a
+# partial sort: a few milliseconds for tens of thousands of posts.
+#
+# Threads of one process may share an instance; the files are not
+# locked, so run one writing process per directory. On
+# Lambda, point EMBEDDING_INDEX_DIR at an EFS mount to keep them.
+# ==============================================================
+
+KINDS = ('post', 'item')
+
+# Characters embedded per entry, well below the embedding models' 8191-token input limit.
+MAX_EMBEDDED_CHARS = 8000
+
+# Characters of each entry kept for prompts.
+MAX_STORED_CHARS = 500
+
+# Texts per embedding request.
+EMBED_BATCH_SIZE = 256
+
+_MIN_CAPACITY = 1024
+
+
+class IndexEntry(NamedTuple):
+    """A search result."""
+    id: str
+    kind: str
+    title: str
+    text: str
+    score: float
+
+
+class EmbeddingIndexService:
+    """Memory-mapped vector index of past posts and candidate items, searched by cosine similarity."""
+
+    def __init__(self, embed: Callable[[Sequence[str]], List[List[float]]], directory: Optional[str] = None):
+        """
+        Initialize the EmbeddingIndexService.
+
+        Args:
+            embed (Callable[[Sequence[str]], List[List[float]]]): Returns one embedding per text,
+                e.g. OpenAIService.embed.
+            directory (Optional[str]): Where the index files are kept. Defaults to EMBEDDING_INDEX_DIR,
+                then .local_storage/embeddings.
+
+        Raises:
+            RuntimeError: If NumPy is not installed.
+        """
+        if np is None:
+            raise RuntimeError("The embedding index needs NumPy; install numpy or unset EMBEDDING_INDEX.")
+        self.logger = logging.getLogger("AppLogger")
+        self.embed = embed
+        self.directory = Path(directory or os.getenv("EMBEDDING_INDEX_DIR", ".local_storage/embeddings"))
+        self._vectors_path = self.directory / "vectors.npy"
+        self._entries_path = self.directory / "entries.jsonl"
+        self._matrix = None
+        self._entries: List[dict] = []
+        self._positions: Dict[str, int] = {}
+        self._kinds = np.zeros(0, dtype=np.uint8)
+        self._lock = threading.Lock()
+
+    def load(self) -> "EmbeddingIndexService":
+        """Map the stored index, if any. Returns self."""
+        entries = []
+        if self._entries_path.exists():
+            with self._entries_path.open('rb+') as file:
+                valid = 0
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break
+                    valid += len(line)
+                # Cut off a line a crash left unfinished; its row is overwritten by the next add.
+                file.truncate(valid)
+        if self._vectors_path.exists():
+            self._matrix = np.load(self._vectors_path, mmap_mode='r+')
+        entries = entries[:0 if self._matrix is None else len(self._matrix)]
+        self._entries = entries
+        self._positions = {entry['id']: position for position, entry in enumerate(entries)}
+        self._kinds = np.array([KINDS.index(entry['kind']) for entry in entries], dtype=np.uint8)
+        self.logger.info("Loaded %s embeddings from %s.", len(entries), self.directory)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entry_id: str) -> bool:
+        return str(entry_id) in self._positions
+
+    def add_posts(self, posts: Iterable[Post]) -> int:
+        """Embed and add the posts not in the index yet. Returns how many were added."""
+        return self._add([('post', str(post.id), post.title, post.content) for post in posts])
+
+    def add_items(self, items: Iterable[RSSItem]) -> int:
+        """Embed and add the RSS items not in the index yet. Returns how many were added."""
+        return self._add([('item', str(item.id), item.title, item.description or '') for item in items])
+
+    def vector(self, entry_id: str):
+        """The unit-length embedding of an entry, or None if it is not in the index."""
+        with self._lock:
+            position = self._positions.get(str(entry_id))
+            return None if position is None else np.array(self._matrix[position])
+
+    def search(self, query, k: int = 5, kind: Optional[str] = None, exclude: Iterable[str] = ()) -> List[IndexEntry]:
+        """
+        Return the k entries most similar to query, best first.
+
+        Args:
+            query: Embedding to compare with, e.g. from vector(); normalised here.
+            k (int): Number of results.
+            kind (Optional[str]): Only return entries of this kind ('post' or 'item').
+            exclude (Iterable[str]): Entry ids to leave out, e.g. the query's own.
+
+        Returns:
+            List[IndexEntry]: The results with their cosine similarity.
+        """
+        with self._lock, metrics.timer("embedding_search"):
+            count = len(self._entries)
+            if not count or k <= 0:
+                return []
+            query = np.asarray(query, dtype=np.float32)
+            scores = self._matrix[:count] @ (query / (np.linalg.norm(query) or 1.0))
+            if kind is not None:
+                scores = np.where(self._kinds[:count] == KINDS.index(kind), scores, -np.inf)
+            for entry_id in exclude:
+                position = self._positions.get(str(entry_id))
+                if position is not None:
+                    scores[position] = -np.inf
+            k = min(k, count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        return [IndexEntry(self._entries[i]['id'], self._entries[i]['kind'], self._entries[i]['title'],
+                           self._entries[i]['text'], float(scores[i]))
+                for i in top if scores[i] > -np.inf]
+
+    def _add(self, rows: List[Tuple[str, str, str, str]]) -> int:
+        """
+        Embed rows of (kind, id, title, text) whose id is new, write their vectors, then their entries.
+
+        The embedding request runs outside the lock, so searches from other threads do not wait
+        for it; rows another thread added meanwhile are dropped when appending.
+        """
+        with self._lock:
+            new_ids = set()
+            new_rows = []
+            for row in rows:
+                if row[1] not in self._positions and row[1] not in new_ids:
+                    new_ids.add(row[1])
+                    new_rows.append(row)
+        added = 0
+        for start in range(0, len(new_rows), EMBED_BATCH_SIZE):
+            batch = new_rows[start:start + EMBED_BATCH_SIZE]
+            with metrics.timer("embedding_embed"):
+                vectors = np.asarray(self.embed([f"{title}\n{text}"[:MAX_EMBEDDED_CHARS]
+                                                 for _, _, title, text in batch]), dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            with self._lock:
+                keep = [i for i, row in enumerate(batch) if row[1] not in self._positions]
+                if keep:
+                    self._append([batch[i] for i in keep], vectors[keep])
+            added += len(keep)
+        if added:
+            metrics.record("embeddings_added", added, unit="Count")
+        return added
+
+    def _append(self, rows: List[Tuple[str, str, str, str]], vectors) -> None:
+        count = len(self._entries)
+        self._reserve(count + len(rows), vectors.shape[1])
+        self._matrix[count:count + len(rows)] = vectors
+        self._matrix.flush()
+
+        entries = [{'id': entry_id, 'kind': kind, 'title': title, 'text': text[:MAX_STORED_CHARS]}
+                   for kind, entry_id, title, text in rows]
+        with self._entries_path.open('a', encoding='utf-8') as file:
+            file.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+        for entry in entries:
+            self._positions[entry['id']] = len(self._entries)
+            self._entries.append(entry)
+        self._kinds = np.concatenate([self._kinds, [KINDS.index(entry['kind']) for entry in entries]]).astype(np.uint8)
+
+    def _reserve(self, rows: int, dimensions: int) -> None:
+        """Make the mapped matrix hold at least rows rows, doubling it into a new file when full."""
+        if self._matrix is not None:
+            if self._matrix.shape[1] != dimensions:
+                raise ValueError(f"Index at {self.directory} holds {self._matrix.shape[1]}-dimensional embeddings, "
+                                 f"got {dimensions}; rebuild it after changing the embedding model.")
+            if rows <= len(self._matrix):
+                return
+        capacity = max(_MIN_CAPACITY, rows, 2 * (0 if self._matrix is None else len(self._matrix)))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        grown_path = self._vectors_path.with_suffix('.tmp.npy')
+        grown = np.lib.format.open_memmap(grown_path, mode='w+', dtype=np.float32, shape=(capacity, dimensions))
+        if self._matrix is not None:
+            grown[:len(self._entries)] = self._matrix[:len(self._entries)]
+        grown.flush()
+        del grown
+        os.replace(grown_path, self._vectors_path)
+        self._matrix = np.load(self._vectors_path, mmap_mode='r+')
+        self.logger.info("Grew embedding index to %s rows.", capacity)
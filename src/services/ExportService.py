@@ -0,0 +1,161 @@
+import gzip
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from src.services.StorageBackend import BlobNotFoundError, FeedBlobStore
+from src.utils import metrics
+
+# Optional: pyarrow writes Parquet; without it the export falls back to gzip JSON Lines
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# ==============================================================
+# Incremental analytics export.
+#
+# Each run writes the RSS items and posts added since the previous
+# run to new Parquet files in the blob store, e.g.
+#
+#   export/rss_items/part-20240916T120000-1a2b3c4d.parquet
+#
+# read with parallel segmented scans, so the live tables are read
+# once in total rather than once per question. The checkpoint keeps
+# the newest pub_date/post_time exported per table. Rows can arrive
+# with an older timestamp than the checkpoint (feeds list items
+# after publishing them), so each run re-reads EXPORT_LOOKBACK_HOURS
+# before it and skips the ids the checkpoint remembers from then.
+# ==============================================================
+
+EXPORT_PREFIX = "export/"
+
+if pa is not None:
+    _SCHEMAS = {
+        'rss_items': pa.schema([
+            ('id', pa.string()), ('title', pa.string()), ('link', pa.string()), ('creator', pa.string()),
+            ('pub_date', pa.timestamp('us', tz='UTC')), ('categories', pa.list_(pa.string())),
+            ('guid', pa.string()), ('description', pa.string()), ('outlet', pa.string()),
+            ('processed', pa.bool_()), ('article_key', pa.string()),
+        ]),
+        'posts': pa.schema([
+            ('id', pa.string()), ('title', pa.string()), ('content', pa.string()),
+            ('tags', pa.list_(pa.string())), ('source_link', pa.string()),
+            ('post_time', pa.timestamp('us')), ('image_link', pa.string()), ('persona', pa.string()),
+        ]),
+    }
+
+
+class ExportService:
+    """Exports new RSS items and posts to columnar files for offline analytics."""
+
+    def __init__(self, feed_store: FeedBlobStore, db_service, bucket_name: Optional[str] = None):
+        """
+        Initialize the ExportService.
+
+        Args:
+            feed_store (FeedBlobStore): Where the export files and the checkpoint are written.
+            db_service: Repository of RSS items and posts to export.
+            bucket_name (Optional[str]): Bucket of the export. Defaults to EXPORT_BUCKET_NAME, then the feed bucket.
+        """
+        self.logger = logging.getLogger("AppLogger")
+        self.feed_store = feed_store
+        self.db_service = db_service
+        self.bucket_name = (bucket_name or os.getenv("EXPORT_BUCKET_NAME")
+                            or os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed"))
+        self.segments = int(os.getenv("EXPORT_SEGMENTS", "4"))
+        self.lookback = timedelta(hours=float(os.getenv("EXPORT_LOOKBACK_HOURS", "24")))
+        self.checkpoint_key = f"{EXPORT_PREFIX}checkpoint.json"
+
+    def export(self) -> Dict[str, int]:
+        """
+        Export the rows added since the last run and advance the checkpoint.
+
+        Returns:
+            Dict[str, int]: The number of rows exported per table.
+        """
+        checkpoint = self._load_checkpoint()
+        tables = {
+            'rss_items': (self.db_service.scan_rss_items, 'pub_date'),
+            'posts': (self.db_service.scan_posts, 'post_time'),
+        }
+        exported = {}
+        for table, (scan, time_field) in tables.items():
+            state = checkpoint.get(table, {})
+            exported[table] = self._export_table(table, scan, time_field, state)
+            checkpoint[table] = state
+            # Saved per table, so a failure in the next one does not re-export this one.
+            self._save_checkpoint(checkpoint)
+            metrics.record("exported_rows", exported[table], unit="Count", table=table)
+        self.logger.info("Export finished: %s", exported)
+        return exported
+
+    def _export_table(self, table: str, scan: Callable, time_field: str, state: dict) -> int:
+        """Export the new rows of one table, updating its checkpoint state in place."""
+        watermark = datetime.fromisoformat(state['watermark']) if state.get('watermark') else None
+        since = watermark - self.lookback if watermark else None
+        with metrics.timer("export_scan", table=table):
+            # Each segment runs on its own thread; DynamoDBService gives every thread its own boto3 resource.
+            with ThreadPoolExecutor(max_workers=self.segments) as pool:
+                segments = pool.map(lambda segment: scan(since, segment, self.segments), range(self.segments))
+                models = [model for segment_models in segments for model in segment_models]
+
+        known_ids = set(state.get('recent_ids', []))
+        rows = [self._row(model, time_field) for model in models if str(model.id) not in known_ids]
+        if rows:
+            self._write(table, rows)
+            newest = max(row[time_field] for row in rows)
+            watermark = newest if watermark is None else max(watermark, newest)
+
+        if watermark is not None:
+            # Remember the ids the next run's lookback window will see again.
+            horizon = watermark - self.lookback
+            state['watermark'] = watermark.isoformat()
+            state['recent_ids'] = sorted(str(model.id) for model in models
+                                         if getattr(model, time_field) > horizon)
+        return len(rows)
+
+    @staticmethod
+    def _row(model, time_field: str) -> dict:
+        """A row of the export: the stored form, with the timestamp as a datetime."""
+        row = model.model_dump()
+        row[time_field] = getattr(model, time_field)
+        if 'processed' in row:
+            row['processed'] = bool(row['processed'])
+        return row
+
+    def _write(self, table: str, rows: List[dict]) -> str:
+        """Write rows to a new part file of table: Parquet with pyarrow, gzip JSON Lines without."""
+        name = f"part-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        if pa is not None:
+            sink = pa.BufferOutputStream()
+            pq.write_table(pa.Table.from_pylist(rows, schema=_SCHEMAS[table]), sink, compression='zstd')
+            key = f"{EXPORT_PREFIX}{table}/{name}.parquet"
+            body, content_type = sink.getvalue().to_pybytes(), 'application/vnd.apache.parquet'
+        else:
+            lines = ''.join(json.dumps(row, default=str, ensure_ascii=False) + '\n' for row in rows)
+            key = f"{EXPORT_PREFIX}{table}/{name}.jsonl.gz"
+            body, content_type = gzip.compress(lines.encode('utf-8'), mtime=0), 'application/gzip'
+        with metrics.timer("export_write", table=table):
+            self.feed_store.put_object(self.bucket_name, key, body, content_type=content_type)
+        metrics.record("export_bytes", len(body), unit="Bytes", table=table)
+        self.logger.info("Exported %s %s rows to %s (%s bytes).", len(rows), table, key, len(body))
+        return key
+
+    def _load_checkpoint(self) -> dict:
+        """The checkpoint of every table; empty (export everything) if there is none."""
+        try:
+            return json.loads(self.feed_store.get_object(self.bucket_name, self.checkpoint_key))
+        except BlobNotFoundError:
+            self.logger.info("No export checkpoint at %s; exporting everything.", self.checkpoint_key)
+            return {}
+
+    def _save_checkpoint(self, checkpoint: dict) -> None:
+        body = json.dumps(checkpoint, sort_keys=True).encode('utf-8')
+        self.feed_store.put_object(self.bucket_name, self.checkpoint_key, body, content_type='application/json')
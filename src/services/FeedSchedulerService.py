@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+from src.models.FeedSource import FeedSource
+from src.models.RSSItem import RSSItem
+from src.services.StorageBackend import BlobNotFoundError, FeedBlobStore
+
+# ==============================================================
+# Adaptive feed polling.
+#
+# For every feed the scheduler keeps an exponentially weighted
+# average of the gap between consecutive pub_dates and polls the
+# feed again roughly one gap later. Polls that find nothing new
+# stretch the interval (BACKOFF per quiet poll), failing feeds back
+# off exponentially from their minimum interval, and every interval
+# is clamped to the feed's bounds and jittered so feeds drift apart.
+#
+# The state is a small JSON document in the blob store, so it
+# survives between Lambda invocations:
+#
+# {"TechCrunch": {"interval": 1800.0, "next_poll": 1726500000.0,
+#                 "newest_pub": 1726498000.0, "quiet_polls": 0, "failures": 0}}
+# ==============================================================
+
+ALPHA = 0.3        # Weight of the newest publish gap in the average
+BACKOFF = 1.5      # Interval factor per poll without new items
+JITTER = 0.1       # +/- fraction applied to every interval
+
+
+class FeedSchedulerService:
+    """Decides which feeds are due and learns their publish rate."""
+
+    def __init__(self, feed_store: FeedBlobStore, bucket_name: Optional[str] = None, key: Optional[str] = None):
+        """
+        Initialize the FeedSchedulerService.
+
+        Args:
+            feed_store (FeedBlobStore): Where the schedule state is kept.
+            bucket_name (Optional[str]): Bucket of the state. Defaults to S3_BUCKET_NAME.
+            key (Optional[str]): Key of the state. Defaults to FEED_SCHEDULE_KEY or state/feed_schedule.json.
+        """
+        self.logger = logging.getLogger("AppLogger")
+        self.feed_store = feed_store
+        self.bucket_name = bucket_name or os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed")
+        self.key = key or os.getenv("FEED_SCHEDULE_KEY", "state/feed_schedule.json")
+        self.state: Dict[str, dict] = {}
+
+    def load(self) -> None:
+        """Read the schedule state; a missing or corrupt state starts from scratch."""
+        try:
+            self.state = json.loads(self.feed_store.get_object(self.bucket_name, self.key))
+        except BlobNotFoundError:
+            self.logger.info("No feed schedule at %s; every feed is due.", self.key)
+            self.state = {}
+        except ValueError as e:
+            self.logger.warning("Discarding unreadable feed schedule %s: %s", self.key, e)
+            self.state = {}
+
+    def save(self) -> None:
+        """Write the schedule state."""
+        body = json.dumps(self.state, sort_keys=True).encode('utf-8')
+        self.feed_store.put_object(self.bucket_name, self.key, body, content_type='application/json')
+
+    def due_feeds(self, sources: Sequence[FeedSource], now: Optional[float] = None) -> List[FeedSource]:
+        """
+        Return the sources whose next poll time has passed.
+
+        Args:
+            sources (Sequence[FeedSource]): The configured feeds.
+            now (Optional[float]): Current epoch seconds.
+
+        Returns:
+            List[FeedSource]: The feeds to poll now. Feeds without state are always due.
+        """
+        now = time.time() if now is None else now
+        due = [source for source in sources if self.state.get(source.name, {}).get('next_poll', 0) <= now]
+        self.logger.info("%s of %s feeds are due.", len(due), len(sources))
+        return due
+
+    def record_success(self, source: FeedSource, items: Sequence[RSSItem], now: Optional[float] = None) -> None:
+        """
+        Update the publish-rate estimate of source from a successful poll and schedule the next one.
+
+        Args:
+            source (FeedSource): The polled feed.
+            items (Sequence[RSSItem]): The items the poll returned.
+            now (Optional[float]): Current epoch seconds.
+        """
+        now = time.time() if now is None else now
+        entry = self.state.setdefault(source.name, {})
+        newest_pub = entry.get('newest_pub')
+        interval = entry.get('interval')
+
+        pub_times = sorted(ts for ts in (item.pub_date.timestamp() for item in items)
+                           if newest_pub is None or ts > newest_pub)
+        if pub_times:
+            previous = newest_pub
+            for pub_time in pub_times:
+                if previous is not None:
+                    gap = pub_time - previous
+                    interval = gap if interval is None else ALPHA * gap + (1 - ALPHA) * interval
+                previous = pub_time
+            entry.update(interval=interval, newest_pub=pub_times[-1], quiet_polls=0)
+        else:
+            entry['quiet_polls'] = entry.get('quiet_polls', 0) + 1
+
+        base = interval if interval is not None else source.min_interval_minutes * 60
+        delay = self._schedule(source, base * BACKOFF ** entry['quiet_polls'], now)
+        entry['failures'] = 0
+        self.logger.info("Feed %s: %s new items, next poll in %.0f min.", source.name, len(pub_times), delay / 60)
+
+    def record_failure(self, source: FeedSource, now: Optional[float] = None) -> None:
+        """
+        Back off a feed that could not be fetched or parsed.
+
+        Args:
+            source (FeedSource): The failed feed.
+            now (Optional[float]): Current epoch seconds.
+        """
+        now = time.time() if now is None else now
+        entry = self.state.setdefault(source.name, {})
+        entry['failures'] = entry.get('failures', 0) + 1
+        delay = self._schedule(source, source.min_interval_minutes * 60 * 2 ** entry['failures'], now)
+        self.logger.warning("Feed %s failed %s times in a row, next poll in %.0f min.",
+                            source.name, entry['failures'], delay / 60)
+
+    def _schedule(self, source: FeedSource, delay: float, now: float) -> float:
+        """Clamp delay to the bounds of source, jitter it and store the next poll time. Returns the delay."""
+        delay = min(max(delay, source.min_interval_minutes * 60), source.max_interval_minutes * 60)
+        delay *= random.uniform(1 - JITTER, 1 + JITTER)
+        self.state[source.name].update(last_poll=now, next_poll=now + delay)
+        return delay
@@ -0,0 +1,72 @@
+import logging
+import os
+from pathlib import Path
+from typing import List
+
+from src.services.StorageBackend import BlobNotFoundError, FeedBlobStore
+from src.utils import metrics
+
+
+class FileSystemService(FeedBlobStore):
+    """Local stand-in for S3Service. Buckets are directories below a root directory."""
+
+    def __init__(self, root_dir: str = os.getenv("LOCAL_STORAGE_DIR", ".local_storage")):
+        """
+        Initialize the FileSystemService.
+
+        Args:
+            root_dir (str): Directory holding one sub-directory per bucket.
+        """
+        self.root_dir = Path(root_dir)
+        self.logger = logging.getLogger("AppLogger")
+        self.logger.debug("FileSystemService initialized with root directory '%s'.", self.root_dir)
+
+    def _path(self, bucket_name: str, key: str) -> Path:
+        """Resolves bucket/key to a path, refusing keys that escape the bucket."""
+        bucket_dir = (self.root_dir / bucket_name).resolve()
+        path = (bucket_dir / key).resolve()
+        if bucket_dir not in path.parents:
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def get_object(self, bucket_name: str, key: str) -> bytes:
+        """Reads an object from disk."""
+        try:
+            with metrics.timer("fs_get"):
+                return self._path(bucket_name, key).read_bytes()
+        except FileNotFoundError as e:
+            raise BlobNotFoundError(f"{bucket_name}/{key}") from e
+
+    def put_object(self, bucket_name: str, key: str, body: bytes, content_type: str = "application/octet-stream") -> None:
+        """Writes an object atomically, so readers never see a partial file."""
+        path = self._path(bucket_name, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with metrics.timer("fs_put"):
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+        self.logger.debug("Wrote object to '%s'.", path)
+
+    def list_objects(self, bucket_name: str, prefix: str = "") -> List[str]:
+        """Lists all keys under prefix."""
+        bucket_dir = (self.root_dir / bucket_name).resolve()
+        if not bucket_dir.is_dir():
+            return []
+        keys = []
+        for path in bucket_dir.rglob('*'):
+            if path.is_file() and not path.name.endswith('.tmp'):
+                key = path.relative_to(bucket_dir).as_posix()
+                if key.startswith(prefix):
+                    keys.append(key)
+        return sorted(keys)
+
+    def delete_object(self, bucket_name: str, key: str) -> None:
+        """Deletes an object from disk."""
+        try:
+            self._path(bucket_name, key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def public_url(self, bucket_name: str, key: str) -> str:
+        """Returns a file:// URL of the object."""
+        return self._path(bucket_name, key).as_uri()
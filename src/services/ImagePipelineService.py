@@ -0,0 +1,177 @@
+import hashlib
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from src.services.StorageBackend import FeedBlobStore
+from src.utils import metrics
+from src.utils.deadline import DeadlineExceeded
+from src.utils.http_client import get_session
+
+# Optional: Pillow resizes and transcodes images; without it they are re-hosted as-is
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# ==============================================================
+# Post image pipeline.
+#
+# Downloads the publisher image of a post, names it by the SHA-256
+# of its bytes, shrinks it to at most IMAGE_MAX_WIDTH pixels wide
+# as JPEG (on a process pool, Pillow is CPU bound), and uploads it
+# once to images/<sha256>.jpg. Post.image_link is rewritten to our
+# copy. An image that is already uploaded is not processed again,
+# and source URLs seen by this process skip even the download.
+# ==============================================================
+
+IMAGE_PREFIX = "images/"
+
+_EXTENSIONS = {'image/jpeg': 'jpg', 'image/png': 'png', 'image/webp': 'webp', 'image/gif': 'gif'}
+
+
+def _transcode(data: bytes, max_width: int, quality: int) -> bytes:
+    """Resize data to at most max_width pixels wide and encode it as progressive JPEG. Runs in a worker process."""
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert('RGB')
+        if image.width > max_width:
+            image = image.resize((max_width, round(image.height * max_width / image.width)), Image.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format='JPEG', quality=quality, optimize=True, progressive=True)
+        return output.getvalue()
+
+
+class ImagePipelineService:
+    """Re-hosts post images in our bucket, resized and deduplicated."""
+
+    # Source URL -> re-hosted URL, shared by every instance in the process.
+    _rehosted: Dict[str, str] = {}
+    _pool: Optional[ProcessPoolExecutor] = None
+
+    def __init__(self, feed_store: FeedBlobStore, bucket_name: Optional[str] = None):
+        """
+        Initialize the ImagePipelineService.
+
+        Args:
+            feed_store (FeedBlobStore): Where the images are uploaded.
+            bucket_name (Optional[str]): Bucket of the images. Defaults to IMAGE_BUCKET_NAME, then the feed bucket.
+        """
+        self.logger = logging.getLogger("AppLogger")
+        self.feed_store = feed_store
+        self.bucket_name = (bucket_name or os.getenv("IMAGE_BUCKET_NAME")
+                            or os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed"))
+        self.public_base_url = os.getenv("IMAGE_PUBLIC_BASE_URL", "").rstrip('/')
+        self.max_width = int(os.getenv("IMAGE_MAX_WIDTH", "1200"))
+        self.quality = int(os.getenv("IMAGE_JPEG_QUALITY", "85"))
+        self.max_bytes = int(os.getenv("IMAGE_MAX_BYTES", str(20 * 1024 * 1024)))
+
+    def rehost(self, image_link: Optional[str]) -> str:
+        """
+        Return the URL of our copy of image_link.
+
+        Args:
+            image_link (Optional[str]): The publisher's image URL.
+
+        Returns:
+            str: The re-hosted URL; the original link if it could not be processed;
+            an empty string if there is no usable link.
+        """
+        if not image_link or not image_link.startswith(('http://', 'https://')):
+            return ""
+        if image_link in self._rehosted:
+            metrics.record("image_cache_hit", 1, unit="Count")
+            return self._rehosted[image_link]
+
+        try:
+            data, content_type = self._download(image_link)
+        except (requests.RequestException, ValueError, DeadlineExceeded) as e:
+            self.logger.warning("Keeping original image link %s: %s", image_link, e)
+            return image_link
+
+        digest = hashlib.sha256(data).hexdigest()
+        extension = 'jpg' if Image is not None else _EXTENSIONS.get(content_type, 'bin')
+        key = f"{IMAGE_PREFIX}{digest}.{extension}"
+
+        if key in self.feed_store.list_objects(self.bucket_name, key):
+            self.logger.info("Image %s already stored as %s.", image_link, key)
+            metrics.record("image_cache_hit", 1, unit="Count")
+        else:
+            try:
+                body, content_type = self._transcode(data, content_type)
+            except Exception as e:
+                self.logger.warning("Keeping original image link %s, transcoding failed: %s", image_link, e)
+                return image_link
+            with metrics.timer("image_upload"):
+                self.feed_store.put_object(self.bucket_name, key, body, content_type=content_type)
+            metrics.record("image_bytes_saved", len(data) - len(body), unit="Bytes")
+            self.logger.info("Re-hosted image %s as %s (%s -> %s bytes).", image_link, key, len(data), len(body))
+
+        url = self._url(key)
+        self._rehosted[image_link] = url
+        return url
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the worker processes, if any were started."""
+        if cls._pool is not None:
+            cls._pool.shutdown()
+            cls._pool = None
+
+    def _download(self, image_link: str) -> Tuple[bytes, str]:
+        """
+        Fetch an image. Raises ValueError if the response is not a reasonably sized image.
+
+        The body is streamed and abandoned as soon as it passes max_bytes, whether or
+        not the server announced its Content-Length.
+        """
+        with metrics.timer("image_fetch"):
+            with get_session().get(image_link, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if not content_type.startswith('image/'):
+                    raise ValueError(f"not an image ({content_type or 'no content type'})")
+                length = response.headers.get('Content-Length', '')
+                if length.isdigit() and int(length) > self.max_bytes:
+                    raise ValueError(f"image too large ({length} bytes)")
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    body += chunk
+                    if len(body) > self.max_bytes:
+                        raise ValueError(f"image too large (over {self.max_bytes} bytes)")
+        return bytes(body), content_type
+
+    def _transcode(self, data: bytes, content_type: str) -> Tuple[bytes, str]:
+        """Resize and re-encode on the process pool; pass data through if Pillow is missing."""
+        if Image is None:
+            return data, content_type
+        with metrics.timer("image_transcode"):
+            pool = self._get_pool()
+            if pool is not None:
+                body = pool.submit(_transcode, data, self.max_width, self.quality).result()
+            else:
+                body = _transcode(data, self.max_width, self.quality)
+        if content_type == 'image/jpeg' and len(data) <= len(body):
+            # Already a small JPEG; re-encoding only made it bigger.
+            return data, content_type
+        return body, 'image/jpeg'
+
+    @classmethod
+    def _get_pool(cls) -> Optional[ProcessPoolExecutor]:
+        """The shared worker pool, or None where processes cannot be started (e.g. Lambda lacks /dev/shm)."""
+        if cls._pool is None:
+            try:
+                cls._pool = ProcessPoolExecutor(max_workers=int(os.getenv("IMAGE_WORKERS", "2")))
+            except OSError as e:
+                logging.getLogger("AppLogger").info("No process pool for images, transcoding inline: %s", e)
+                return None
+        return cls._pool
+
+    def _url(self, key: str) -> str:
+        """Public URL of key, under IMAGE_PUBLIC_BASE_URL (e.g. a CDN) when set."""
+        if self.public_base_url:
+            return f"{self.public_base_url}/{key}"
+        return self.feed_store.public_url(self.bucket_name, key)
@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from src.models.RSSItem import RSSItem
+from src.services.StorageBackend import BlobNotFoundError, FeedBlobStore
+from src.utils import metrics
+
+# ==============================================================
+# Per-item stage journal.
+#
+# Posting an item runs extract_article -> generate_post ->
+# rehost_image -> save_post -> update_rss_feed. After each stage its output is written to
+# journal/<item id>.json, so a run that failed or ran out of time
+# is resumed from the first missing stage by whichever worker picks
+# the item next; an article fetch or OpenAI call that succeeded is
+# never repeated. Stage outputs are small references:
+#
+# {"stages": {"extract_article": {"article_key": "articles/<id>.json"},
+#             "generate_post": {"post": {...}}, "rehost_image": {"image_link": "..."},
+#             "save_post": {"post_id": "..."}, "update_rss_feed": {"feed_etag": "..."}},
+#  "attempts": 1, "last_error": "..."}
+#
+# Personas keep separate journals, journal/<persona>/<item id>.json.
+#
+# Once the item is marked processed, its journals of every persona are
+# deleted: a persona may have failed an item another one finished.
+# ==============================================================
+
+JOURNAL_PREFIX = "journal/"
+
+
+class ItemJournalService:
+    """Records which posting stages of one item are done, and their outputs."""
+
+    def __init__(self, feed_store: FeedBlobStore, item: RSSItem, bucket_name: Optional[str] = None,
+                 persona: str = ""):
+        """
+        Initialize the ItemJournalService.
+
+        Args:
+            feed_store (FeedBlobStore): Where the journal is kept.
+            item (RSSItem): The item being posted.
+            bucket_name (Optional[str]): Bucket of the journal. Defaults to S3_BUCKET_NAME.
+            persona (str): Name of the persona posting the item; empty for the default persona.
+        """
+        self.logger = logging.getLogger("AppLogger")
+        self.feed_store = feed_store
+        self.bucket_name = bucket_name or os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed")
+        self.key = f"{JOURNAL_PREFIX}{persona}/{item.id}.json" if persona else f"{JOURNAL_PREFIX}{item.id}.json"
+        self.max_attempts = int(os.getenv("JOURNAL_MAX_ATTEMPTS", "3"))
+        self.stages: Dict[str, dict] = {}
+        self.attempts = 0
+
+    def load(self) -> "ItemJournalService":
+        """Read the journal of a previous run, if any. Returns self."""
+        try:
+            data = json.loads(self.feed_store.get_object(self.bucket_name, self.key))
+        except BlobNotFoundError:
+            return self
+        except ValueError as e:
+            self.logger.warning("Discarding unreadable journal %s: %s", self.key, e)
+            return self
+        self.stages = data.get('stages', {})
+        self.attempts = data.get('attempts', 0)
+        if self.stages:
+            self.logger.info("Resuming after stages %s (attempt %s).", ", ".join(self.stages), self.attempts + 1)
+        return self
+
+    def run(self, stage: str, action: Callable[[], dict]) -> dict:
+        """
+        Return the recorded output of stage, or run action and record what it returns.
+
+        Args:
+            stage (str): Stage name, also the name of its timer metric.
+            action (Callable[[], dict]): Performs the stage; returns its JSON-serialisable output.
+
+        Returns:
+            dict: The stage output.
+        """
+        if stage in self.stages:
+            metrics.record("journal_stage_skipped", 1, unit="Count", stage=stage)
+            return self.stages[stage]
+        with metrics.timer(stage):
+            output = action()
+        self.stages[stage] = output
+        self._save()
+        return output
+
+    def forget(self, stage: str) -> None:
+        """Drop a stage whose recorded output turned out to be unusable, so it runs again."""
+        self.stages.pop(stage, None)
+
+    def fail(self, error: Exception) -> bool:
+        """
+        Record a failed attempt.
+
+        Returns:
+            bool: True if the item has now failed max_attempts (JOURNAL_MAX_ATTEMPTS) times and should be given up.
+        """
+        self.attempts += 1
+        self._save(last_error=f"{type(error).__name__}: {error}")
+        metrics.record("journal_failed_attempts", 1, unit="Count")
+        return self.attempts >= self.max_attempts
+
+    @staticmethod
+    def delete_all(feed_store: FeedBlobStore, item: RSSItem, bucket_name: Optional[str] = None) -> int:
+        """
+        Remove the journals of every persona for item, once it is processed.
+
+        Returns:
+            int: The number of journals deleted.
+        """
+        bucket_name = bucket_name or os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed")
+        name = f"{item.id}.json"
+        keys = [key for key in feed_store.list_objects(bucket_name, JOURNAL_PREFIX) if key.rsplit('/', 1)[-1] == name]
+        for key in keys:
+            feed_store.delete_object(bucket_name, key)
+        return len(keys)
+
+    def _save(self, last_error: Optional[str] = None) -> None:
+        data = {'stages': self.stages, 'attempts': self.attempts, 'updated_at': int(time.time())}
+        if last_error:
+            data['last_error'] = last_error
+        body = json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        self.feed_store.put_object(self.bucket_name, self.key, body, content_type='application/json')
@@ -0,0 +1,242 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.models.Persona import Persona
+from src.models.Post import Post
+from src.models.RSSItem import RSSItem
+from src.services.ArticlePrefetchService import ArticlePrefetchService
+from src.services.ArticleService import ArticleService
+from src.services.EmbeddingIndexService import IndexEntry
+from src.services.OpenAIService import OpenAIService
+from src.services.SeenLinkService import canonical_link
+from src.services.StorageBackend import FeedBlobStore
+from src.utils import metrics
+
+# ==============================================================
+# On-demand post generation (python main.py serve_api).
+#
+# Editors ask for a post about a URL or a stored item instead of
+# waiting for process_items. Nothing is saved or published; the
+# draft is returned.
+#
+# Requests for the same article (by canonical link) and persona
+# share one flight: the first submits the fetch and completion to a
+# pool of GENERATE_WORKERS threads, later ones wait on its future.
+# A finished post is kept for GENERATE_CACHE_SECONDS, so a
+# double-click or a refreshed page costs nothing. Flights beyond
+# GENERATE_MAX_PENDING are refused instead of queued without bound.
+#
+# Repository calls are serialised: boto3 resources are not
+# thread-safe.
+# ==============================================================
+
+
+class ItemNotFoundError(LookupError):
+    """Raised when a requested item or persona does not exist."""
+
+
+class GenerationBusyError(RuntimeError):
+    """Raised when GENERATE_MAX_PENDING generations are already pending."""
+
+
+class GenerationFailedError(RuntimeError):
+    """Raised when extracting the article or generating the post failed; the cause is chained."""
+
+
+class GeneratedPost(NamedTuple):
+    """A generated post and how the request got it: 'generated', 'shared' or 'cache'."""
+    post: Post
+    source: str
+
+
+class OnDemandPostService:
+    """Generates draft posts on request, coalescing concurrent requests and caching results briefly."""
+
+    def __init__(self, openai_service: OpenAIService, db_service, feed_store: FeedBlobStore,
+                 personas: Sequence[Persona],
+                 find_related: Optional[Callable[[RSSItem], List[IndexEntry]]] = None,
+                 workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 cache_seconds: Optional[float] = None):
+        """
+        Initialize the OnDemandPostService.
+
+        Args:
+            openai_service (OpenAIService): Writes the posts.
+            db_service: The item and post repository.
+            feed_store (FeedBlobStore): Where prefetched articles are kept.
+            personas (Sequence[Persona]): The personas a request may name; the first is the default.
+            find_related (Optional[Callable[[RSSItem], List[IndexEntry]]]): Returns earlier posts related
+                to a stored item, given to generate_post as context.
+            workers (Optional[int]): Generations run at once. Defaults to GENERATE_WORKERS or 4.
+            max_pending (Optional[int]): Generations running or queued before requests are refused.
+                Defaults to GENERATE_MAX_PENDING or 16.
+            cache_seconds (Optional[float]): How long a post is served again. Defaults to
+                GENERATE_CACHE_SECONDS or 300; 0 disables the cache.
+
+        Raises:
+            ValueError: If personas is empty.
+        """
+        if not personas:
+            raise ValueError("On-demand generation needs at least one enabled persona")
+        self.logger = logging.getLogger("AppLogger")
+        self.openai_service = openai_service
+        self.db_service = db_service
+        self.prefetch = ArticlePrefetchService(feed_store, db_service)
+        self.personas = {persona.name: persona for persona in personas}
+        self.default_persona = personas[0]
+        self.find_related = find_related
+        self.workers = max(1, workers or int(os.getenv("GENERATE_WORKERS", "4")))
+        self.max_pending = max(1, max_pending or int(os.getenv("GENERATE_MAX_PENDING", "16")))
+        self.cache_seconds = (cache_seconds if cache_seconds is not None
+                              else float(os.getenv("GENERATE_CACHE_SECONDS", "300")))
+        self.cache_size = int(os.getenv("GENERATE_CACHE_SIZE", "256"))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="generate")
+        self._lock = threading.Lock()
+        self._repository_lock = threading.Lock()
+        self._flights: Dict[Tuple[str, str], Future] = {}
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, Post]]" = OrderedDict()
+
+    def generate(self, url: Optional[str] = None, item_id: Optional[str] = None,
+                 persona: Optional[str] = None, timeout: Optional[float] = None) -> GeneratedPost:
+        """
+        Return a post about the article at url or of the stored item item_id.
+
+        Args:
+            url (Optional[str]): Link of any article the extractors handle.
+            item_id (Optional[str]): Id of a stored RSS item; exactly one of url and item_id is given.
+            persona (Optional[str]): Name of the persona to write as. Defaults to the first one.
+            timeout (Optional[float]): Seconds to wait for the post. Defaults to GENERATE_TIMEOUT_SECONDS
+                or 120; the generation goes on and is cached when it finishes.
+
+        Returns:
+            GeneratedPost: The post and where it came from.
+
+        Raises:
+            ValueError: If the request is malformed.
+            ItemNotFoundError: If the item or persona does not exist.
+            GenerationBusyError: If too many generations are pending.
+            TimeoutError: If the post is not ready in time.
+            GenerationFailedError: If the extraction or generation failed.
+        """
+        chosen_persona = self._persona(persona)
+        item = self._resolve(url, item_id)
+        key = (canonical_link(str(item.link)), chosen_persona.name)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                metrics.record("on_demand_requests", 1, unit="Count", source="cache")
+                return GeneratedPost(cached[1], "cache")
+            flight = self._flights.get(key)
+            source = "shared"
+            if flight is None:
+                if len(self._flights) >= self.max_pending:
+                    metrics.record("on_demand_rejected", 1, unit="Count")
+                    raise GenerationBusyError(f"{len(self._flights)} posts are being generated; try again later")
+                flight = self._pool.submit(self._fly, key, item, chosen_persona, item_id is not None)
+                self._flights[key] = flight
+                source = "generated"
+        metrics.record("on_demand_requests", 1, unit="Count", source=source)
+        timeout = timeout if timeout is not None else float(os.getenv("GENERATE_TIMEOUT_SECONDS", "120"))
+        try:
+            return GeneratedPost(flight.result(timeout), source)
+        except TimeoutError:
+            if not flight.done():
+                raise
+            raise GenerationFailedError(f"Timed out: {flight.exception()}") from flight.exception()
+        except Exception as e:
+            raise GenerationFailedError(str(e)) from e
+
+    def sweep(self) -> int:
+        """Drop expired posts from the cache. Returns how many were dropped."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires, _) in self._cache.items() if expires <= now]
+            for key in expired:
+                del self._cache[key]
+        return len(expired)
+
+    def stats(self) -> dict:
+        """Pending generations and cached posts, for the health endpoint."""
+        with self._lock:
+            return {'pending': len(self._flights), 'cached': len(self._cache)}
+
+    def close(self) -> None:
+        """Wait for the pending generations and stop the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def _persona(self, name: Optional[str]) -> Persona:
+        if not name:
+            return self.default_persona
+        if name not in self.personas:
+            raise ItemNotFoundError(f"Unknown persona: {name}")
+        return self.personas[name]
+
+    def _resolve(self, url: Optional[str], item_id: Optional[str]) -> RSSItem:
+        """The stored item item_id, or an unsaved item pointing at url."""
+        if (url is None) == (item_id is None):
+            raise ValueError("Give either url or item_id")
+        if item_id is not None:
+            with self._repository_lock:
+                item = self.db_service.get_rss_item(str(item_id))
+            if item is None:
+                raise ItemNotFoundError(f"Unknown item: {item_id}")
+            return item
+        if not str(url).startswith(('http://', 'https://')):
+            raise ValueError(f"Not an http(s) URL: {url}")
+        # RSSItem validates the link; pydantic's ValidationError is a ValueError.
+        return RSSItem(title='', link=url, pub_date=datetime.now(timezone.utc), guid=str(url),
+                       description='', outlet=ArticleService.outlet_of(url))
+
+    def _fly(self, key: Tuple[str, str], item: RSSItem, persona: Persona, stored: bool) -> Post:
+        """Generate the post of one flight, then move it from the flights to the cache."""
+        try:
+            post = self._generate(item, persona, stored)
+        except BaseException:
+            with self._lock:
+                self._flights.pop(key, None)
+            raise
+        with self._lock:
+            self._flights.pop(key, None)
+            if self.cache_seconds > 0:
+                self._cache[key] = (time.monotonic() + self.cache_seconds, post)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return post
+
+    def _generate(self, item: RSSItem, persona: Persona, stored: bool) -> Post:
+        with metrics.timer("on_demand_generate"):
+            article_text, image_link = self._article(item, stored)
+            with self._repository_lock:
+                recent_posts = self.db_service.get_latest_posts(10, persona.name if persona.name else None)
+            related = self.find_related(item) if stored and self.find_related else []
+            post = self.openai_service.generate_post(article_text, item, recent_posts, related, persona.prompt)
+        post.image_link = image_link
+        post.persona = persona.name
+        self.logger.info("Generated on-demand post '%s' for %s.", post.title, item.link)
+        return post
+
+    def _article(self, item: RSSItem, stored: bool) -> Tuple[str, Optional[str]]:
+        """
+        Return the article text and image link of item.
+
+        A stored item's article is read from its prefetched blob, or extracted and stored
+        like process_items would, so posting the item later need not fetch it again.
+        """
+        if not stored:
+            return ArticleService.extract_article(str(item.link), item.outlet)
+        article = self.prefetch.load(item)
+        metrics.record("article_prefetch_hit", int(article is not None), unit="Count")
+        if article is not None:
+            return article
+        key, text, image_link = self.prefetch.store_article(item)
+        with self._repository_lock:
+            self.db_service.set_rss_item_article_key(item, key)
+        return text, image_link
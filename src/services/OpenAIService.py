@@ -5,16 +5,23 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Iterable, List, Sequence, cast
+import re
+import time
+from typing import Iterable, List, NamedTuple, Sequence, Set, cast
 
-from openai import OpenAI
+from openai import (APIConnectionError, APITimeoutError, InternalServerError, NotFoundError, OpenAI,
+                    RateLimitError)
 from openai._exceptions import OpenAIError
 from openai.types.chat import ChatCompletionMessageParam
 from openai.types.chat.completion_create_params import ResponseFormat
 
-from src.models.OpenAIConfig import OpenAIConfig
+from src.models.OpenAIConfig import OpenAIConfig, estimate_cost
 from src.models.Post import Post
 from src.models.RSSItem import RSSItem
+from src.services.EmbeddingIndexService import IndexEntry
+from src.utils import metrics
+from src.utils.deadline import current_deadline
+from src.utils.JsonStreamUtils import IncrementalObjectScanner, InvalidStreamError
 from src.utils.TextUtils import contains_markdown
 
 logger = logging.getLogger("AppLogger")
@@ -23,23 +30,44 @@ logger = logging.getLogger("AppLogger")
 class OpenAIService:  # pylint: disable=too-few-public-methods
     """High‑level wrapper around *chat.completions* for LinkedIn automation."""
 
-    _MAX_TOKENS = 4096  # per‑request hard‑limit (model‑specific)
-
     def __init__(self, config: OpenAIConfig) -> None:  # noqa: D401
         """Create a dedicated :class:`OpenAI` client scoped to *config*."""
-        logger.info("Initialising OpenAIService with model: %s", config.model)
-        self._client: OpenAI = OpenAI(api_key=config.api_key)
-        self._model: str = config.model
+        logger.info("Initialising OpenAIService with models: %s",
+                    ", ".join(f"{task}={cfg.model}" for task, cfg in config.tasks.items()))
+        self._client: OpenAI = OpenAI(api_key=config.api_key, base_url=config.base_url,
+                                      max_retries=config.max_retries)
+        self._config: OpenAIConfig = config
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     JSON_MODE: ResponseFormat = cast(ResponseFormat, {"type": "json_object"})
-    def generate_post(self, article: str, item: RSSItem) -> Post:
-        """Generate a LinkedIn post that *must* be valid JSON (JSON mode)."""
-
-        system_msg = _SYSTEM_PROMPT
+    def generate_post(
+            self,
+            article: str,
+            item: RSSItem,
+            recent_posts: Sequence[Post] = (),
+            related_posts: Sequence[IndexEntry] = (),
+            persona_prompt: str | None = None,
+    ) -> Post:
+        """
+        Generate a LinkedIn post that *must* be valid JSON (JSON mode).
+
+        With ``candidates`` > 1 in the config, one request returns several
+        candidates and the best is picked locally (see :meth:`_best_of_n`);
+        *recent_posts* are used there to reject near-duplicates.
+
+        *related_posts*, our earlier posts closest to the article in the
+        embedding index, are shown before the article so the new post can build
+        on them instead of repeating them. *persona_prompt* describes the voice
+        to write in; it is appended to the system prompt.
+        """
+
+        system_msg = _with_persona(_SYSTEM_PROMPT, persona_prompt)
         user_msg = f"<article>\n{article}\n</article>"
+        if related_posts:
+            related = "\n".join(f"<post>\n<title>{post.title}</title>\n{post.text}\n</post>" for post in related_posts)
+            user_msg = f"<related_posts>\n{related}\n</related_posts>\n{user_msg}"
 
         # Build a statically‑typed *messages* list; cast is safe because the
         # dict literals satisfy the TypedDict contract.
@@ -51,18 +79,33 @@ class OpenAIService:  # pylint: disable=too-few-public-methods
             ],
         )
 
+        if self._config.candidates > 1:
+            json_obj = self._best_of_n(messages, recent_posts)
+        else:
+            json_obj = self._generate_with_retries(messages)
+
+        post = Post(
+            title=json_obj["title"],
+            content=json_obj["content"],
+            tags=json_obj["tags"],
+            source_link=item.link,
+            image_link="",
+        )
+        logger.info("Post generated ✓: %s", post.title)
+        return post
+
+    def _generate_with_retries(self, messages: List[ChatCompletionMessageParam]) -> dict:
+        """Request one post at a time, retrying on errors and markdown, up to 5 attempts."""
         attempt = 0
         json_obj: dict | None = None
         while attempt < 5:
             attempt += 1
             try:
-                completion = self._client.chat.completions.create(
-                    model=self._model,
-                    messages=messages,
-                    temperature=1.0,
-                    max_tokens=self._MAX_TOKENS,
-                    response_format=self.JSON_MODE,
-                )
+                if self._config.stream:
+                    # Markdown and schema problems abort the stream; retry from the article.
+                    json_obj = self._stream_post(messages)
+                    break
+                completion = self._create("generate_post", messages)
                 json_obj = json.loads(completion.choices[0].message.content)
 
                 # If the model smuggled markdown, strip and retry once.
@@ -74,6 +117,12 @@ class OpenAIService:  # pylint: disable=too-few-public-methods
                     logger.debug("Markdown spotted – retrying (attempt %d)…", attempt + 1)
                     continue
                 break  # success
+            except InvalidStreamError as exc:
+                # A deliberate abort of unusable output, already logged as a warning by
+                # _stream_post; not a failure worth a traceback.
+                logger.debug("Retrying after aborted stream (%s) – attempt %d/5", exc.reason, attempt)
+                if attempt == 5:
+                    raise
             except (OpenAIError, json.JSONDecodeError) as exc:
                 logger.exception("OpenAI call failed (%s) – attempt %d/5", exc, attempt)
                 if attempt == 5:
@@ -81,16 +130,117 @@ class OpenAIService:  # pylint: disable=too-few-public-methods
 
         if json_obj is None:
             raise RuntimeError("Unable to obtain valid JSON from OpenAI after 5 attempts.")
-
-        post = Post(
-            title=json_obj["title"],
-            content=json_obj["content"],
-            tags=json_obj["tags"],
-            source_link=item.link,
-            image_link="",
-        )
-        logger.info("Post generated ✓: %s", post.title)
-        return post
+        return json_obj
+
+    def _best_of_n(self, messages: List[ChatCompletionMessageParam], recent_posts: Sequence[Post]) -> dict:
+        """
+        Ask for ``candidates`` posts in one request and return the best acceptable one.
+
+        A second request is only sent if no candidate of the first passes every
+        check; if none of the second does either, the best well-formed candidate
+        is used, as the sequential path accepts its last attempt.
+
+        Raises:
+            RuntimeError: If no candidate was even well-formed.
+        """
+        recent_words = [_word_set(post.content) for post in recent_posts]
+        well_formed: List[_Candidate] = []
+        for request in (1, 2):
+            try:
+                completion = self._create("generate_post", messages, n=self._config.candidates)
+            except OpenAIError as exc:
+                logger.exception("OpenAI call failed (%s) – request %d/2", exc, request)
+                if request == 2 and not well_formed:
+                    raise
+                continue
+            candidates = [_score_candidate(choice.message.content, recent_words) for choice in completion.choices]
+            well_formed = [candidate for candidate in candidates if candidate.post is not None] or well_formed
+            passing = [candidate for candidate in candidates if candidate.post is not None and not candidate.problems]
+            metrics.record("post_candidates_passing", len(passing), unit="Count")
+            if passing:
+                return max(passing, key=lambda candidate: candidate.score).post
+            logger.info("No candidate passed (request %d/2): %s", request,
+                        "; ".join(", ".join(candidate.problems) for candidate in candidates))
+
+        if not well_formed:
+            raise RuntimeError("Unable to obtain a well-formed post from OpenAI in 2 requests.")
+        best = max(well_formed, key=lambda candidate: candidate.score)
+        logger.warning("Using best failing candidate (%s)", ", ".join(best.problems))
+        return best.post
+
+    def _stream_post(self, messages: List[ChatCompletionMessageParam]) -> dict:
+        """
+        Stream one post completion, validating it as it arrives.
+
+        The stream is closed as soon as the output starts with something other
+        than an object, has an unexpected key or value type, shows markdown in
+        ``content`` or exceeds ``max_post_chars``, so a bad attempt only costs
+        the tokens received until then.
+
+        Raises:
+            InvalidStreamError: If the output was rejected (aborted or incomplete).
+            OpenAIError: If the request failed.
+        """
+        scanner = IncrementalObjectScanner()
+        parts: List[str] = []
+        checked_content = 0
+        start = time.perf_counter()
+        first_token = None
+        with metrics.timer("openai_stream_total", task="generate_post"):
+            stream = self._create("generate_post", messages, stream=True, stream_options={"include_usage": True})
+            try:
+                for chunk in stream:
+                    if chunk.usage is not None:
+                        self._record_usage("generate_post", chunk, chunk.model)
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                        metrics.record("openai_ttft", (first_token - start) * 1000, task="generate_post")
+                    parts.append(delta)
+                    scanner.feed(delta)
+                    checked_content = self._check_post_stream(scanner, checked_content)
+            except InvalidStreamError as exc:
+                metrics.record("openai_stream_aborted", 1, unit="Count", task="generate_post", reason=exc.reason)
+                metrics.record("openai_stream_wasted", (time.perf_counter() - start) * 1000, task="generate_post")
+                logger.warning("Aborted streamed post after %d chars: %s", scanner.length, exc)
+                raise
+            finally:
+                stream.close()
+
+        if not scanner.complete:
+            raise InvalidStreamError("incomplete", f"stream ended after {scanner.length} chars")
+        self._check_post_stream(scanner, checked_content, final=True)
+        return json.loads("".join(parts))
+
+    def _check_post_stream(self, scanner: IncrementalObjectScanner, checked_content: int, final: bool = False) -> int:
+        """
+        Reject the streamed post if it can no longer be valid.
+
+        Returns:
+            int: Length of ``content`` that has been checked for markdown.
+        """
+        for key in scanner.keys:
+            if key not in _POST_FIELDS:
+                raise InvalidStreamError("schema", f"unexpected key {key!r}")
+        for key, value_type in scanner.value_types.items():
+            if value_type != _POST_FIELDS[key]:
+                raise InvalidStreamError("schema", f"{key} is {value_type}, expected {_POST_FIELDS[key]}")
+        if scanner.length > self._config.max_post_chars:
+            raise InvalidStreamError("length", f"over {self._config.max_post_chars} chars")
+        if final:
+            missing = [key for key in _POST_FIELDS if key not in scanner.value_types]
+            if missing:
+                raise InvalidStreamError("schema", f"missing {', '.join(missing)}")
+
+        # Markdown patterns are re-run over the whole content, so only every so often.
+        content = scanner.string_value("content")
+        if final or len(content) - checked_content >= _MARKDOWN_CHECK_EVERY:
+            if contains_markdown(content):
+                raise InvalidStreamError("markdown", "markdown in content")
+            checked_content = len(content)
+        return checked_content
 
     # ------------------------------------------------------------------
     # Headline picker
@@ -100,13 +250,35 @@ class OpenAIService:  # pylint: disable=too-few-public-methods
             self,
             candidates: Sequence[RSSItem],
             already_posted: Sequence[Post],
+            excerpts: Sequence[str | None] | None = None,
+            persona_prompt: str | None = None,
     ) -> RSSItem:
-        """Pick the most viral‑worthy headline that hasn't been posted yet."""
-
-        system_msg = _HEADLINE_PICKER_PROMPT
-        new_list = "\n".join(f"{i}. {it.title}" for i, it in enumerate(candidates))
-        posted_list = "\n".join(f"{i}. {p.title}" for i, p in enumerate(already_posted))
-        user_msg = f"<new_list>\n{new_list}\n</new_list>\n<posted_list>\n{posted_list}\n</posted_list>"
+        """
+        Pick the most viral‑worthy headline that hasn't been posted yet.
+
+        *excerpts*, parallel to *candidates*, adds the opening of each prefetched
+        article below its headline so the pick is not made on titles alone.
+
+        The static system prompt comes first and the lists last. Both lists are
+        sliding windows (the last 10 posts, the newest 20 items), so any new post
+        or item changes the request near its start; only a prefix of at least
+        1024 identical tokens is cached, which the picker prompt alone is not.
+        Expect openai_cached_prompt_tokens near zero here. Candidates keep stable
+        ids so a pick can be matched back whatever the order.
+
+        *persona_prompt* tells the picker whose audience it picks for.
+        """
+
+        system_msg = _with_persona(_HEADLINE_PICKER_PROMPT, persona_prompt)
+        excerpt_by_id = {id(it): excerpts[i] for i, it in enumerate(candidates)} if excerpts else {}
+        by_key = {str(it.id)[:8]: it for it in sorted(candidates, key=lambda it: it.pub_date)}
+        new_list = "\n".join(
+            f"[{key}] {it.title}"
+            + (f"\n   <excerpt>{excerpt_by_id[id(it)]}</excerpt>" if excerpt_by_id.get(id(it)) else "")
+            for key, it in by_key.items()
+        )
+        posted_list = "\n".join(f"- {p.title}" for p in sorted(already_posted, key=lambda p: p.post_time))
+        user_msg = f"<posted_list>\n{posted_list}\n</posted_list>\n<new_list>\n{new_list}\n</new_list>"
 
         messages: Iterable[ChatCompletionMessageParam] = cast(
             List[ChatCompletionMessageParam],
@@ -116,30 +288,192 @@ class OpenAIService:  # pylint: disable=too-few-public-methods
             ],
         )
 
-        completion = self._client.chat.completions.create(
-            model=self._model,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=50,
-            response_format=self.JSON_MODE,
-        )
+        completion = self._create("choose_post", messages)
 
         try:
             data = json.loads(completion.choices[0].message.content)
-            chosen_idx = int(data["chosen_headline_index"])
+            chosen_key = str(data["chosen_headline_id"]).strip("[] ")
         except (KeyError, ValueError, json.JSONDecodeError) as exc:
             logger.exception("Malformed assistant response: %s", exc)
             raise
 
-        if not 0 <= chosen_idx < len(candidates):
-            raise IndexError(
-                f"Assistant chose invalid index {chosen_idx}; must be within 0‑{len(candidates)-1}."
-            )
+        if chosen_key not in by_key:
+            raise IndexError(f"Assistant chose unknown id {chosen_key!r}; must be one of {', '.join(by_key)}.")
 
-        chosen_item = candidates[chosen_idx]
+        chosen_item = by_key[chosen_key]
         logger.info("Chosen headline ✓: %s", chosen_item.title)
         return chosen_item
 
+    # ------------------------------------------------------------------
+    # Embeddings
+    # ------------------------------------------------------------------
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Return one embedding per text, in order, from the configured embedding model.
+
+        Raises:
+            OpenAIError: If the request failed.
+            DeadlineExceeded: If the deadline is spent before the request could be sent.
+        """
+        model = self._config.embedding_model
+        deadline = current_deadline()
+        client = self._client.with_options(max_retries=0) if deadline.bounded else self._client
+        with metrics.timer("openai_request", task="embed", model=model):
+            response = client.embeddings.create(
+                model=model,
+                input=list(texts),
+                dimensions=self._config.embedding_dimensions,
+                timeout=deadline.timeout(self._config.request_timeout),
+            )
+        metrics.record("openai_prompt_tokens", response.usage.prompt_tokens, unit="Count", task="embed", model=model)
+        cost = estimate_cost(model, response.usage.prompt_tokens, 0, 0)
+        if cost is not None:
+            metrics.record("openai_cost_usd", cost, unit="None", task="embed", model=model)
+        return [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _create(self, task: str, messages: Iterable[ChatCompletionMessageParam], **kwargs):
+        """
+        Send a JSON-mode completion request for *task* using its routed model.
+
+        Falls back to the task's next model when a model is unknown, rate limited,
+        overloaded or unreachable. Non-streamed usage is recorded here; streams
+        report theirs in the final chunk.
+
+        Each request's timeout is capped by the active deadline.
+
+        Raises:
+            OpenAIError: If every model failed, or on errors a fallback cannot fix.
+            DeadlineExceeded: If the deadline is spent before a request could be sent.
+        """
+        task_config = self._config.for_task(task)
+        models = task_config.models
+        deadline = current_deadline()
+        # Within a deadline the SDK's own retries could overrun it; the callers retry instead.
+        client = self._client.with_options(max_retries=0) if deadline.bounded else self._client
+        for position, model in enumerate(models):
+            try:
+                with metrics.timer("openai_request", task=task, model=model):
+                    response = client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=task_config.temperature,
+                        max_tokens=task_config.max_tokens,
+                        response_format=self.JSON_MODE,
+                        timeout=deadline.timeout(self._config.request_timeout),
+                        **kwargs,
+                    )
+            except _FALLBACK_ERRORS as exc:
+                if position == len(models) - 1:
+                    raise
+                logger.warning("%s failed on %s (%s); falling back to %s", task, model, exc, models[position + 1])
+                metrics.record("openai_fallbacks", 1, unit="Count", task=task, model=model)
+                continue
+            if not kwargs.get("stream"):
+                self._record_usage(task, response, model)
+            return response
+        raise RuntimeError(f"No model configured for {task}.")
+
+    def _record_usage(self, task: str, completion, model: str) -> None:
+        """Record the token usage and estimated cost of *completion*, split into cached and uncached prompt tokens."""
+        usage = getattr(completion, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+        dimensions = {"task": task, "model": model, "prompt_version": PROMPT_VERSIONS[task]}
+        metrics.record("openai_prompt_tokens", usage.prompt_tokens, unit="Count", **dimensions)
+        metrics.record("openai_cached_prompt_tokens", cached, unit="Count", **dimensions)
+        metrics.record("openai_uncached_prompt_tokens", usage.prompt_tokens - cached, unit="Count", **dimensions)
+        metrics.record("openai_completion_tokens", usage.completion_tokens, unit="Count", **dimensions)
+        cost = estimate_cost(model, usage.prompt_tokens, cached, usage.completion_tokens)
+        if cost is not None:
+            metrics.record("openai_cost_usd", cost, unit="None", **dimensions)
+        logger.debug("%s usage: %d prompt tokens (%d cached), %d completion tokens",
+                     task, usage.prompt_tokens, cached, usage.completion_tokens)
+
+
+def _with_persona(system_prompt: str, persona_prompt: str | None) -> str:
+    """*system_prompt* followed by the persona, which stays part of the cacheable prefix."""
+    if not persona_prompt:
+        return system_prompt
+    return f"{system_prompt}\n<persona>\n{persona_prompt.strip()}\n</persona>"
+
+
+# ------------------------------------------------------------------
+# Local candidate scoring (best-of-n)
+# ------------------------------------------------------------------
+
+_CONTENT_CHARS = (400, 3000)   # LinkedIn cuts posts at 3000 characters
+_TARGET_CONTENT_CHARS = 1300
+_TAG_COUNT = (3, 5)
+_MAX_SIMILARITY = 0.5          # Word-set Jaccard similarity to a recent post
+
+
+class _Candidate(NamedTuple):
+    post: dict | None
+    score: float
+    problems: List[str]
+
+
+def _word_set(text: str) -> Set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def _score_candidate(raw: str | None, recent_words: Sequence[Set[str]]) -> _Candidate:
+    """Check one candidate and score it; higher is better. Malformed candidates get post=None."""
+    try:
+        post = json.loads(raw or "")
+    except json.JSONDecodeError:
+        return _Candidate(None, float("-inf"), ["invalid JSON"])
+    if not (isinstance(post, dict) and isinstance(post.get("title"), str) and isinstance(post.get("content"), str)
+            and isinstance(post.get("tags"), list) and all(isinstance(tag, str) for tag in post["tags"])):
+        return _Candidate(None, float("-inf"), ["schema"])
+
+    problems = []
+    content = post["content"]
+    if contains_markdown(content):
+        problems.append("markdown")
+    if not _CONTENT_CHARS[0] <= len(content) <= _CONTENT_CHARS[1]:
+        problems.append(f"length {len(content)}")
+    if not _TAG_COUNT[0] <= len(post["tags"]) <= _TAG_COUNT[1]:
+        problems.append(f"{len(post['tags'])} tags")
+    words = _word_set(content)
+    similarity = max((len(words & other) / len(words | other) for other in recent_words if words | other),
+                     default=0.0)
+    if similarity > _MAX_SIMILARITY:
+        problems.append(f"similarity {similarity:.2f}")
+
+    score = 1.0 - abs(len(content) - _TARGET_CONTENT_CHARS) / _TARGET_CONTENT_CHARS - similarity - len(problems)
+    return _Candidate(post, score, problems)
+
+
+# ------------------------------------------------------------------
+# Prompts
+#
+# The system prompts are the static, cacheable prefix of every request;
+# everything that varies goes into the user message after them. Bump
+# the version whenever a prompt changes: it is recorded with the token
+# metrics, so cache hit rates and costs can be compared per version.
+# ------------------------------------------------------------------
+
+# Errors after which the next model of a task is tried.
+_FALLBACK_ERRORS = (NotFoundError, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+# Top-level fields of a generated post and the JSON type of their values.
+_POST_FIELDS = {"title": "string", "content": "string", "tags": "array"}
+
+# Characters of streamed content between two markdown checks.
+_MARKDOWN_CHECK_EVERY = 80
+
+PROMPT_VERSIONS = {
+    "generate_post": "post-v2",
+    "choose_post": "picker-v2",
+}
 
 _SYSTEM_PROMPT = """
 <system>
@@ -202,17 +536,18 @@ _HEADLINE_PICKER_PROMPT = """
 
   <input_format>
     The user will supply:
-    <new_list>Numbered headlines, one per line.</new_list>
-    <posted_list>Headlines already used.</posted_list>
+    <posted_list>Headlines already used, one per line.</posted_list>
+    <new_list>Candidate headlines, one per line, each prefixed with its id in square
+      brackets. A headline may be followed by an <excerpt> with the opening of its article.</new_list>
   </input_format>
 
   <output_format>
     <assistant_response_format>{"type":"json_object"}</assistant_response_format>
     <schema>
-      <field name="chosen_headline_index" type="string"
-             desc="0-based index of the headline you picked from <new_list>."/>
+      <field name="chosen_headline_id" type="string"
+             desc="The id (without brackets) of the headline you picked from <new_list>."/>
     </schema>
-    <example>{"chosen_headline_index":"2"}</example>
+    <example>{"chosen_headline_id":"3f2a9c1e"}</example>
   </output_format>
 
   <rules>
@@ -0,0 +1,149 @@
+import hmac
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from src.services.OnDemandPostService import (GenerationBusyError, GenerationFailedError, ItemNotFoundError,
+                                              OnDemandPostService)
+
+# ==============================================================
+# HTTP front of OnDemandPostService:
+#
+#   POST /posts   {"url": "https://..."} or {"item_id": "..."},
+#                 optionally "persona": "<name>"
+#                 -> 200 {"post": {...}, "source": "generated|shared|cache"}
+#   GET  /health  -> 200 {"status": "ok", "pending": n, "cached": n}
+#
+# Errors are JSON {"error": "..."}: 400 bad request, 401 without the
+# GENERATE_API_TOKEN bearer token (if set), 404 unknown item or
+# persona, 502 extraction/generation failed, 503 (with Retry-After)
+# when too many generations are pending, 504 when the post took
+# longer than GENERATE_TIMEOUT_SECONDS.
+#
+# Handler threads only wait; the work runs on the service's pool.
+# ==============================================================
+
+# Largest accepted request body; a request is a URL or an id.
+MAX_BODY_BYTES = 64 * 1024
+
+
+class PostApiService(ThreadingHTTPServer):
+    """Threaded HTTP server generating draft posts on request."""
+
+    daemon_threads = True
+
+    def __init__(self, posts: OnDemandPostService, host: Optional[str] = None, port: Optional[int] = None,
+                 token: Optional[str] = None):
+        """
+        Initialize the PostApiService.
+
+        Args:
+            posts (OnDemandPostService): Generates the posts.
+            host (Optional[str]): Address to listen on. Defaults to GENERATE_HOST or 127.0.0.1.
+            port (Optional[int]): Port to listen on, 0 for any free one. Defaults to GENERATE_PORT or 8080.
+            token (Optional[str]): Bearer token requests must carry. Defaults to GENERATE_API_TOKEN;
+                empty accepts every request.
+        """
+        host = host or os.getenv("GENERATE_HOST", "127.0.0.1")
+        port = port if port is not None else int(os.getenv("GENERATE_PORT", "8080"))
+        super().__init__((host, port), _Handler)
+        self.logger = logging.getLogger("AppLogger")
+        self.posts = posts
+        self.token = token if token is not None else os.getenv("GENERATE_API_TOKEN", "")
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'PostApiService':
+        """Serve on a background thread. Returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, name='post-api', daemon=True)
+        self._thread.start()
+        self.logger.info("Serving on-demand posts at %s/posts", self.url)
+        return self
+
+    def stop(self) -> None:
+        """Stop accepting requests and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PostApiService
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        self.server.logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, {'status': 'ok', **self.server.posts.stats()})
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self) -> None:  # noqa: N802
+        # Responses sent before the body is read close the connection; the unread body
+        # would otherwise be parsed as the next request.
+        if self.path.rstrip('/') != '/posts':
+            self.close_connection = True
+            self._send_json(404, {'error': 'Not found'})
+            return
+        if self.server.token and not hmac.compare_digest(self.headers.get('Authorization', ''),
+                                                         f"Bearer {self.server.token}"):
+            self.close_connection = True
+            self._send_json(401, {'error': 'Missing or wrong bearer token'})
+            return
+        length = self._content_length()
+        if length is None:
+            self.close_connection = True
+            self._send_json(400, {'error': 'Invalid Content-Length'})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {'error': f'Request body over {MAX_BODY_BYTES} bytes'})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("Expected a JSON object")
+            result = self.server.posts.generate(url=body.get('url'), item_id=body.get('item_id'),
+                                                persona=body.get('persona'))
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+        except ItemNotFoundError as e:
+            self._send_json(404, {'error': str(e)})
+        except GenerationBusyError as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': '5'})
+        except TimeoutError:
+            self._send_json(504, {'error': 'The post is still being generated; ask again shortly'})
+        except GenerationFailedError as e:
+            self.server.logger.error("On-demand generation failed: %s", e)
+            self._send_json(502, {'error': f'Generation failed: {e}'})
+        else:
+            self._send_json(200, {'post': result.post.model_dump(mode='json'), 'source': result.source},
+                            {'X-Cache': 'HIT' if result.source == 'cache' else 'MISS'})
+
+    def _content_length(self) -> Optional[int]:
+        """The declared body length, 0 if absent, or None if it is not a non-negative integer."""
+        value = self.headers.get('Content-Length')
+        if value is None:
+            return 0
+        value = value.strip()
+        return int(value) if value.isdecimal() else None
+
+    def _send_json(self, status: int, data: dict, headers: Optional[dict] = None) -> None:
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
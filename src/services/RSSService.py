@@ -1,11 +1,14 @@
 import logging
 import xml.etree.ElementTree as ET
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import requests
 from pydantic import ValidationError
 
+from src.models.FeedSource import FeedSource
 from src.models.RSSItem import RSSItem
+from src.utils import metrics
+from src.utils.http_client import get_session
 
 
 class RSSService:
@@ -14,18 +17,29 @@ class RSSService:
     # Initialize a class-level logger
     logger = logging.getLogger("AppLogger")
 
+    # Built-in feeds; aggregate_news polls the feeds listed in FEEDS_CONFIG (see FeedSource).
     FEEDS = {
         'TechCrunch': 'https://techcrunch.com/feed/',
         'Ars Technica': 'https://arstechnica.com/information-technology/feed/'
     }
 
+    # ETag/Last-Modified of the last response per feed URL, for conditional GETs.
+    # Lives as long as the process, i.e. across runs of a warm Lambda or the daemon.
+    _validators: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def fetch_source(cls, source: FeedSource) -> List[RSSItem]:
+        """Fetches and parses a configured feed."""
+        return cls.fetch_feed(source.name, str(source.url))
+
     @classmethod
-    def fetch_feed(cls, outlet: str) -> List[RSSItem]:
+    def fetch_feed(cls, outlet: str, url: Optional[str] = None) -> List[RSSItem]:
         """
         Fetches and parses an RSS feed.
 
         Args:
             outlet (str): The name of the outlet to fetch the feed from.
+            url (Optional[str]): The feed URL. Defaults to the built-in feed of outlet.
 
         Returns:
             List[RSSItem]: A list of parsed RSS items.
@@ -34,42 +48,60 @@ class RSSService:
             ValueError: If the outlet is not supported.
             requests.HTTPError: If the request to fetch the feed fails.
         """
-        cls.logger.info(f"Starting fetch for outlet: {outlet}")
+        cls.logger.info("Starting fetch for outlet: %s", outlet)
 
-        if outlet not in cls.FEEDS:
-            cls.logger.error(f"Unsupported outlet: {outlet}")
-            raise ValueError(f"Unsupported outlet: {outlet}")
-
-        url = cls.FEEDS[outlet]
-        cls.logger.debug(f"Fetching URL: {url}")
+        if url is None:
+            if outlet not in cls.FEEDS:
+                cls.logger.error("Unsupported outlet: %s", outlet)
+                raise ValueError(f"Unsupported outlet: {outlet}")
+            url = cls.FEEDS[outlet]
+        cls.logger.debug("Fetching URL: %s", url)
 
         try:
-            response = requests.get(url)
+            with metrics.timer("feed_fetch", outlet=outlet):
+                response = get_session().get(url, headers=cls._validators.get(url, {}))
             response.raise_for_status()
-            cls.logger.debug(f"Successfully fetched data from {url}")
+            cls.logger.debug("Successfully fetched data from %s", url)
         except requests.HTTPError as e:
-            cls.logger.error(f"HTTP error while fetching {outlet} feed: {e}")
+            cls.logger.error("HTTP error while fetching %s feed: %s", outlet, e)
             raise
 
-        try:
-            root = ET.fromstring(response.content)
-            cls.logger.debug(f"XML content parsed successfully for {outlet}")
-        except ET.ParseError as e:
-            cls.logger.error(f"Error parsing XML for {outlet}: {e}")
-            raise
-
-        items = root.findall('.//item')
-        cls.logger.info(f"Found {len(items)} items in {outlet} feed")
-
-        parsed_items = []
-        for item in items:
-            rss_item = cls._parse_item(item, outlet)
-            if rss_item:
-                parsed_items.append(rss_item)
-
-        cls.logger.info(f"Successfully parsed {len(parsed_items)} items for {outlet} feed")
+        if response.status_code == 304:
+            cls.logger.info("%s feed not modified since the last fetch", outlet)
+            metrics.record("feed_not_modified", 1, unit="Count", outlet=outlet)
+            return []
+        cls._remember_validators(url, response)
+
+        with metrics.timer("feed_parse", outlet=outlet):
+            try:
+                root = ET.fromstring(response.content)
+                cls.logger.debug("XML content parsed successfully for %s", outlet)
+            except ET.ParseError as e:
+                cls.logger.error("Error parsing XML for %s: %s", outlet, e)
+                raise
+
+            items = root.findall('.//item')
+            cls.logger.info("Found %s items in %s feed", len(items), outlet)
+
+            parsed_items = []
+            for item in items:
+                rss_item = cls._parse_item(item, outlet)
+                if rss_item:
+                    parsed_items.append(rss_item)
+
+        cls.logger.info("Successfully parsed %s items for %s feed", len(parsed_items), outlet)
         return parsed_items
 
+    @classmethod
+    def _remember_validators(cls, url: str, response: requests.Response) -> None:
+        """Store the cache validators of response for the next conditional GET of url."""
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        cls._validators[url] = validators
+
     @classmethod
     def _parse_item(cls, item: ET.Element, outlet: str) -> Optional[RSSItem]:
         """
@@ -95,10 +127,10 @@ class RSSService:
 
         try:
             rss_item = RSSItem(**item_dict)
-            cls.logger.debug(f"Parsed RSS item: {rss_item.title}")
+            cls.logger.debug("Parsed RSS item: %s", rss_item.title)
             return rss_item
         except ValidationError as e:
-            cls.logger.warning(f"Validation error parsing item from {outlet}: {e}")
+            cls.logger.warning("Validation error parsing item from %s: %s", outlet, e)
             return None
 
     @classmethod
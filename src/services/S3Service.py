@@ -1,131 +1,102 @@
 import logging
-from datetime import datetime, timezone
-from xml.etree import ElementTree as ET
+import os
+from typing import List, Optional, Tuple
+from urllib.parse import quote
 
 import boto3
 from botocore.exceptions import ClientError
 
-from src.models.Post import Post
-from src.models.RSSFeed import RSSFeed
+from src.services.StorageBackend import BlobNotFoundError, FeedBlobStore
+from src.utils import metrics
 
+# Error codes S3 answers for a key that does not exist (HeadObject-style calls only give the status).
+_MISSING_KEY_CODES = ('NoSuchKey', 'NotFound', '404')
 
-class S3Service:
+# Error codes of a conditional write whose precondition no longer holds.
+_CONDITION_FAILED_CODES = ('PreconditionFailed', 'ConditionalRequestConflict', '412', '409')
+
+
+class S3Service(FeedBlobStore):
     """Service for interacting with AWS S3 and managing RSS feeds."""
 
     def __init__(self):
-        self.s3 = boto3.client('s3')
+        # S3_ENDPOINT_URL points the service at an S3-compatible stand-in such as MinIO.
+        self.s3 = boto3.client('s3', endpoint_url=os.getenv("S3_ENDPOINT_URL") or None)
         self.logger = logging.getLogger("AppLogger")
         self.logger.debug("S3Service initialized with AWS S3 client.")
 
-    def update_rss_feed(self, bucket_name: str, key: str, post: Post) -> None:
+    def get_object(self, bucket_name: str, key: str) -> bytes:
+        """Reads an object from S3; see get_object_version."""
+        return self.get_object_version(bucket_name, key)[0]
+
+    def get_object_version(self, bucket_name: str, key: str) -> Tuple[bytes, str]:
         """
-        Updates the RSS feed XML file on S3 with the new post at the top.
+        Reads an object from S3, with its ETag as the version.
 
-        Args:
-            bucket_name (str): The name of the S3 bucket.
-            key (str): The key of the RSS feed file in S3.
-            post (Post): The new post to add to the RSS feed.
+        Raises:
+            BlobNotFoundError: If the key does not exist.
+            ClientError: On any other error (throttling, permissions, 5xx), so callers do not
+                mistake an unreadable object for a missing one and overwrite it.
         """
-        self.logger.info(f"Starting RSS feed update for bucket '{bucket_name}', key '{key}'.")
+        self.logger.debug("Fetching object from S3 bucket '%s', key '%s'.", bucket_name, key)
         try:
-            root = self._get_existing_rss(bucket_name, key)
-            self.logger.debug("Existing RSS feed retrieved successfully.")
+            with metrics.timer("s3_get"):
+                obj = self.s3.get_object(Bucket=bucket_name, Key=key)
+                body = obj['Body'].read()
         except ClientError as e:
-            self.logger.warning(f"Failed to retrieve existing RSS feed: {e}. Creating a new RSS feed.")
-            root = self._create_new_rss()
-            self.logger.debug("New RSS feed created.")
-
-        channel = root.find('channel')
-        if channel is not None:
-            self.logger.debug("Channel element found in RSS feed.")
-        else:
-            self.logger.error("Channel element not found in RSS feed.")
-            raise ValueError("Invalid RSS feed structure: 'channel' element is missing.")
-
-        self._update_last_build_date(channel)
-        self.logger.info("Updated lastBuildDate in RSS feed.")
-
-        self._add_new_item(channel, post)
-        self.logger.info(f"Added new post titled '{post.title}' to RSS feed.")
+            # Without s3:ListBucket a missing key surfaces as AccessDenied instead; the
+            # execution role needs it (see the README) for state objects to start empty.
+            if e.response.get('Error', {}).get('Code') in _MISSING_KEY_CODES:
+                raise BlobNotFoundError(f"s3://{bucket_name}/{key}: {e}") from e
+            self.logger.error("Failed to read object from S3 at '%s/%s': %s.", bucket_name, key, e)
+            raise
+        return body, obj['ETag']
 
-        rss_feed = ET.tostring(root, encoding='unicode', method='xml')
+    def put_object(self, bucket_name: str, key: str, body: bytes, content_type: str = "application/octet-stream") -> None:
+        """Uploads an object to S3."""
         try:
-            self.s3.put_object(
-                Bucket=bucket_name,
-                Key=key,
-                Body=rss_feed.encode('utf-8'),
-                ContentType='application/rss+xml'
-            )
-            self.logger.info(f"RSS feed successfully updated in S3 at '{bucket_name}/{key}'.")
+            with metrics.timer("s3_put"):
+                self.s3.put_object(
+                    Bucket=bucket_name,
+                    Key=key,
+                    Body=body,
+                    ContentType=content_type
+                )
+            self.logger.debug("Uploaded object to S3 at '%s/%s'.", bucket_name, key)
         except ClientError as e:
-            self.logger.error(f"Failed to upload updated RSS feed to S3: {e}.")
+            self.logger.error("Failed to upload object to S3 at '%s/%s': %s.", bucket_name, key, e)
             raise
 
-    def _get_existing_rss(self, bucket_name: str, key: str) -> ET.Element:
-        """Retrieves and parses the existing RSS feed from S3."""
-        self.logger.debug(f"Fetching existing RSS feed from S3 bucket '{bucket_name}', key '{key}'.")
-        obj = self.s3.get_object(Bucket=bucket_name, Key=key)
-        rss_content = obj['Body'].read().decode('utf-8')
-        parser = ET.XMLParser(encoding="utf-8")
-        root = ET.fromstring(rss_content, parser=parser)
-        self.logger.debug("Existing RSS feed parsed successfully.")
-        return root
-
-    def _create_new_rss(self) -> ET.Element:
-        """Creates a new RSS feed structure."""
-        self.logger.debug("Creating a new RSS feed structure.")
-        rss_feed = RSSFeed()
-        root = ET.Element('rss', version='2.0')
-        channel = ET.SubElement(root, 'channel')
-
-        for field, value in rss_feed.model_dump().items():
-            ET.SubElement(channel, field).text = value
-            self.logger.debug(f"Added '{field}' to channel with value '{value}'.")
-
-        pub_date = self._format_datetime(datetime.now(timezone.utc))
-        ET.SubElement(channel, 'pubDate').text = pub_date
-        self.logger.debug(f"Set 'pubDate' to '{pub_date}' in new RSS feed.")
-        return root
-
-    def _update_last_build_date(self, channel: ET.Element) -> None:
-        """Updates the lastBuildDate element in the RSS feed."""
-        self.logger.debug("Updating 'lastBuildDate' in RSS feed.")
-        last_build_date = channel.find('lastBuildDate')
-        formatted_date = self._format_datetime(datetime.now(timezone.utc))
-        if last_build_date is None:
-            ET.SubElement(channel, 'lastBuildDate').text = formatted_date
-            self.logger.debug("'lastBuildDate' element created and set.")
-        else:
-            last_build_date.text = formatted_date
-            self.logger.debug("'lastBuildDate' element updated.")
-
-    def _add_new_item(self, channel: ET.Element, post: Post) -> None:
-        """Adds a new item to the RSS feed based on the provided post."""
-        self.logger.debug(f"Adding new item for post titled '{post.title}'.")
-        item = ET.Element('item')
-        ET.SubElement(item, 'title').text = post.title
-        ET.SubElement(item, 'link').text = str(post.source_link)
-        ET.SubElement(item, 'image_link').text = str(post.image_link)
-
-        content = self._remove_last_line_if_hashtag(post.content)
-        source = 'TechCrunch' if 'techcrunch' in str(post.source_link).lower() else 'Ars Technica'
-        description = f"{content}\n\nSource: {source}\n{' '.join([f'#{tag}' for tag in post.tags])}"
-        ET.SubElement(item, 'description').text = description
-        ET.SubElement(item, 'pubDate').text = self._format_datetime(datetime.now(timezone.utc))
-
-        channel.insert(0, item)
-        self.logger.debug(f"New item for post titled '{post.title}' inserted at the top of the channel.")
-
-    @staticmethod
-    def _remove_last_line_if_hashtag(text: str) -> str:
-        """Removes the last line of the text if it contains a hashtag."""
-        lines = text.splitlines()
-        if lines and '#' in lines[-1]:
-            logging.debug("Last line contains a hashtag and will be removed.")
-            return '\n'.join(lines[:-1])
-        return text
-
-    @staticmethod
-    def _format_datetime(dt: datetime) -> str:
-        """Formats a datetime object to a string suitable for RSS feeds."""
-        return dt.strftime('%a, %d %b %Y %H:%M:%S %z')
+    def put_object_if_unchanged(self, bucket_name: str, key: str, body: bytes, version: Optional[str],
+                                content_type: str = "application/octet-stream") -> bool:
+        """Uploads an object if its ETag is still version (If-Match), or if it does not exist for None (If-None-Match)."""
+        condition = {'IfMatch': version} if version is not None else {'IfNoneMatch': '*'}
+        try:
+            with metrics.timer("s3_put"):
+                self.s3.put_object(Bucket=bucket_name, Key=key, Body=body, ContentType=content_type, **condition)
+            self.logger.debug("Uploaded object to S3 at '%s/%s'.", bucket_name, key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in _CONDITION_FAILED_CODES:
+                return False
+            self.logger.error("Failed to upload object to S3 at '%s/%s': %s.", bucket_name, key, e)
+            raise
+        return True
+
+    def list_objects(self, bucket_name: str, prefix: str = "") -> List[str]:
+        """Lists all keys under prefix, following pagination."""
+        keys = []
+        paginator = self.s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            keys.extend(obj['Key'] for obj in page.get('Contents', []))
+        return keys
+
+    def delete_object(self, bucket_name: str, key: str) -> None:
+        """Deletes an object from S3."""
+        self.s3.delete_object(Bucket=bucket_name, Key=key)
+
+    def public_url(self, bucket_name: str, key: str) -> str:
+        """Returns the virtual-hosted URL of an object (path-style on a custom endpoint)."""
+        endpoint = os.getenv("S3_ENDPOINT_URL")
+        if endpoint:
+            return f"{endpoint.rstrip('/')}/{bucket_name}/{quote(key)}"
+        return f"https://{bucket_name}.s3.amazonaws.com/{quote(key)}"
@@ -0,0 +1,505 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from src.models.Post import Post
+from src.models.RSSItem import RSSItem
+from src.services.StorageBackend import PostRepository, RSSItemRepository
+from src.utils import metrics
+
+# ==============================================================
+# Local stand-in for DynamoDBService.
+# The indexes mirror the DynamoDB GSIs so query plans (and their
+# costs) stay comparable when profiling the pipeline offline.
+# ==============================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rss_items (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    creator TEXT,
+    pub_date TEXT NOT NULL,
+    categories TEXT NOT NULL DEFAULT '[]',
+    guid TEXT NOT NULL,
+    description TEXT NOT NULL,
+    outlet TEXT NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0
+);
+-- link-index
+CREATE INDEX IF NOT EXISTS link_index ON rss_items (link);
+-- Sparse unprocessed index: only unprocessed rows are indexed (see DynamoDBService).
+DROP INDEX IF EXISTS processed_pub_date_index;
+CREATE INDEX IF NOT EXISTS unprocessed_pub_date_index ON rss_items (pub_date) WHERE processed = 0;
+
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '[]',
+    source_link TEXT NOT NULL,
+    post_time TEXT NOT NULL,
+    image_link TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS post_time_index ON posts (post_time);
+"""
+
+# Columns added after the initial schema; created on startup when missing.
+_ADDED_COLUMNS = {
+    'rss_items': {
+        'lease_owner': 'TEXT',
+        'lease_expires_at': 'INTEGER',
+        'article_key': 'TEXT',
+    },
+    'posts': {
+        'persona': "TEXT NOT NULL DEFAULT ''",
+    },
+}
+
+# Indexes on added columns, created once the columns exist.
+_ADDED_INDEXES = """
+CREATE INDEX IF NOT EXISTS persona_post_time_index ON posts (persona, post_time);
+"""
+
+_RSS_ITEM_COLUMNS = ('id', 'title', 'link', 'creator', 'pub_date', 'categories', 'guid', 'description', 'outlet',
+                     'processed', 'article_key')
+_POST_COLUMNS = ('id', 'title', 'content', 'tags', 'source_link', 'post_time', 'image_link', 'persona')
+
+
+class SQLiteService(RSSItemRepository, PostRepository):
+    """Service class storing RSS items and posts in a local SQLite database."""
+
+    def __init__(self, db_path: str = os.getenv("LOCAL_SQLITE_PATH", ".local_storage/linkedinfluencer.db")):
+        """
+        Initialize the SQLiteService.
+
+        Args:
+            db_path (str): Path of the database file, or ':memory:'.
+        """
+        self.logger = logging.getLogger("AppLogger")
+        self.logger.debug("Initializing SQLiteService with database: %s", db_path)
+        if db_path != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared between threads; the lock serialises access.
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self._lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(_SCHEMA)
+            self._add_missing_columns()
+            self.connection.executescript(_ADDED_INDEXES)
+
+    def save_rss_items(self, items: List[RSSItem], stored: Optional[List[RSSItem]] = None) -> List[RSSItem]:
+        """
+        Save unique RSSItem objects to SQLite.
+
+        Args:
+            items (List[RSSItem]): List of RSSItem objects to save.
+            stored (Optional[List[RSSItem]]): Receives the items whose link is already stored.
+
+        Returns:
+            List[RSSItem]: The items that were not stored yet and have been saved.
+        """
+        self.logger.info("Saving %s RSS items.", len(items))
+        saved = []
+        for item in items:
+            try:
+                if not self._item_exists(item.link):
+                    self._put_rss_item(item)
+                    saved.append(item)
+                    self.logger.debug("Saved RSS item with link: %s", item.link)
+                else:
+                    self.logger.info("Item with link %s already exists. Skipping.", item.link)
+                    if stored is not None:
+                        stored.append(item)
+            except sqlite3.Error as e:
+                self.logger.error("Error processing item with link %s: %s", item.link, e)
+        self.logger.info("Completed saving RSS items: %s new.", len(saved))
+        return saved
+
+    def update_rss_item(self, item: RSSItem) -> None:
+        """
+        Update an existing RSSItem in SQLite.
+
+        Args:
+            item (RSSItem): RSSItem object to update.
+        """
+        self.logger.info("Updating RSS item with link: %s", item.link)
+        try:
+            self._put_rss_item(item)
+            self.logger.debug("Updated RSS item with link: %s", item.link)
+        except sqlite3.Error as e:
+            self.logger.error("Error updating item with link %s: %s", item.link, e)
+
+    def set_rss_item_article_key(self, item: RSSItem, article_key: str) -> bool:
+        """
+        Store the key of the prefetched article on an existing RSSItem.
+
+        Args:
+            item (RSSItem): The item the article belongs to.
+            article_key (str): Blob store key of the article.
+
+        Returns:
+            bool: True if the item was updated, False if it is missing.
+        """
+        updated = self._execute("UPDATE rss_items SET article_key = ? WHERE id = ?",
+                                (article_key, str(item.id))) == 1
+        if updated:
+            item.article_key = article_key
+        return updated
+
+    def mark_rss_item_processed(self, item: RSSItem, owner: Optional[str] = None) -> bool:
+        """
+        Mark an RSSItem as processed, touching only the processed and lease columns.
+
+        Args:
+            item (RSSItem): The item to mark.
+            owner (Optional[str]): If given, only succeed while this worker holds the lease.
+
+        Returns:
+            bool: True if the item was marked, False if it was missing, already processed
+            or leased by someone else.
+        """
+        self.logger.info("Marking RSS item as processed: %s", item.link)
+        sql = ("UPDATE rss_items SET processed = 1, lease_owner = NULL, lease_expires_at = NULL "
+               "WHERE id = ? AND processed = 0")
+        params = (str(item.id),)
+        if owner is not None:
+            sql += " AND lease_owner = ?"
+            params += (owner,)
+        marked = self._execute(sql, params) == 1
+        if marked:
+            item.processed = True
+        else:
+            self.logger.warning("RSS item %s is missing, already processed or leased by another worker.", item.link)
+        return marked
+
+    def claim_rss_item(self, item: RSSItem, owner: str, lease_seconds: int) -> bool:
+        """
+        Claim an unprocessed RSSItem for owner; expired leases are reclaimed.
+
+        Returns:
+            bool: True if owner now holds the lease.
+        """
+        now = int(time.time())
+        claimed = self._execute(
+            "UPDATE rss_items SET lease_owner = ?, lease_expires_at = ? WHERE id = ? AND processed = 0 "
+            "AND (lease_expires_at IS NULL OR lease_expires_at < ? OR lease_owner = ?)",
+            (owner, now + lease_seconds, str(item.id), now, owner),
+        ) == 1
+        self.logger.info("Claim of %s by %s: %s", item.link, owner, "granted" if claimed else "refused")
+        return claimed
+
+    def renew_rss_item_lease(self, item: RSSItem, owner: str, lease_seconds: int) -> bool:
+        """
+        Extend owner's lease on an RSSItem (heartbeat).
+
+        Returns:
+            bool: False if owner no longer holds the lease.
+        """
+        return self._execute(
+            "UPDATE rss_items SET lease_expires_at = ? WHERE id = ? AND lease_owner = ? AND processed = 0",
+            (int(time.time()) + lease_seconds, str(item.id), owner),
+        ) == 1
+
+    def release_rss_item_lease(self, item: RSSItem, owner: str) -> bool:
+        """
+        Give up owner's lease so another worker can pick the item right away.
+
+        Returns:
+            bool: False if owner did not hold the lease.
+        """
+        return self._execute(
+            "UPDATE rss_items SET lease_owner = NULL, lease_expires_at = NULL WHERE id = ? AND lease_owner = ?",
+            (str(item.id), owner),
+        ) == 1
+
+    def migrate_unprocessed_index(self) -> int:
+        """The partial index is maintained by SQLite itself; nothing to migrate."""
+        return 0
+
+    def get_rss_item(self, item_id: str) -> Optional[RSSItem]:
+        """
+        Retrieve a stored item by id.
+
+        Args:
+            item_id (str): The id of the item.
+
+        Returns:
+            Optional[RSSItem]: The RSSItem, or None if there is no such item.
+        """
+        items = self._to_rss_items(self._query("SELECT * FROM rss_items WHERE id = ?", (str(item_id),)))
+        return items[0] if items else None
+
+    def get_random_unprocessed_item(self) -> Optional[RSSItem]:
+        """
+        Retrieve a random unprocessed item.
+
+        Returns:
+            Optional[RSSItem]: A random unprocessed RSSItem if available, None otherwise.
+        """
+        self.logger.debug("Fetching a random unprocessed RSS item.")
+        rows = self._query(
+            "SELECT * FROM (SELECT * FROM rss_items WHERE processed = 0 LIMIT 20) ORDER BY random() LIMIT 1"
+        )
+        items = self._to_rss_items(rows)
+        if not items:
+            self.logger.info("No unprocessed items found.")
+            return None
+        return items[0]
+
+    def get_last_unprocessed_rss_items(self, amount: int, exclude_leased: bool = False) -> List[RSSItem]:
+        """
+        Retrieve the last unprocessed RSSItems.
+
+        Args:
+            amount (int): Number of items to retrieve.
+            exclude_leased (bool): Skip items currently claimed by a worker.
+
+        Returns:
+            List[RSSItem]: List of unprocessed RSSItems.
+        """
+        self.logger.info("Retrieving the last %s unprocessed RSS items.", amount)
+        if exclude_leased:
+            rows = self._query(
+                "SELECT * FROM rss_items WHERE processed = 0 "
+                "AND (lease_expires_at IS NULL OR lease_expires_at < ?) ORDER BY pub_date DESC LIMIT ?",
+                (int(time.time()), amount),
+            )
+        else:
+            rows = self._query(
+                "SELECT * FROM rss_items WHERE processed = 0 ORDER BY pub_date DESC LIMIT ?", (amount,)
+            )
+        if not rows:
+            self.logger.info("No unprocessed items found.")
+            return []
+        self.logger.debug("Retrieved %s unprocessed RSS items.", len(rows))
+        return self._to_rss_items(rows)
+
+    def get_latest_posts(self, amount: int, persona: Optional[str] = None) -> List[Post]:
+        """
+        Retrieve the latest posts.
+
+        Args:
+            amount (int): Number of posts to retrieve.
+            persona (Optional[str]): Only retrieve the posts of this persona ('' is the default persona).
+
+        Returns:
+            List[Post]: List of the latest Post objects.
+        """
+        self.logger.info("Retrieving the latest %s posts.", amount)
+        if persona is None:
+            rows = self._query("SELECT * FROM posts ORDER BY post_time DESC LIMIT ?", (amount,))
+        else:
+            rows = self._query("SELECT * FROM posts WHERE persona = ? ORDER BY post_time DESC LIMIT ?",
+                               (persona, amount))
+        if not rows:
+            self.logger.info("No posts found.")
+            return []
+        self.logger.debug("Retrieved and sorted %s posts.", len(rows))
+        try:
+            return [Post.from_dynamodb_item(self._decode_post_row(row)) for row in rows]
+        except (KeyError, ValueError) as e:
+            self.logger.error("Error converting rows to Posts: %s", e)
+            return []
+
+    def get_rss_items(self) -> List[RSSItem]:
+        """
+        Retrieve all RSSItem objects.
+
+        Returns:
+            List[RSSItem]: List of all stored RSSItems.
+        """
+        self.logger.info("Retrieving all RSS items from the table.")
+        rows = self._query("SELECT * FROM rss_items")
+        self.logger.debug("Retrieved %s RSS items.", len(rows))
+        return self._to_rss_items(rows)
+
+    def get_rss_items_published_before(self, cutoff: datetime) -> List[RSSItem]:
+        """
+        Retrieve the RSSItems published before cutoff, oldest first.
+
+        Args:
+            cutoff (datetime): Timezone-aware upper bound of pub_date.
+
+        Returns:
+            List[RSSItem]: The older RSSItems.
+        """
+        self.logger.info("Retrieving RSS items published before %s.", cutoff.isoformat())
+        # pub_date is stored as ISO 8601 in UTC, so text comparison orders by time.
+        rows = self._query("SELECT * FROM rss_items WHERE pub_date < ? ORDER BY pub_date",
+                           (cutoff.astimezone(timezone.utc).isoformat(),))
+        return self._to_rss_items(rows)
+
+    def scan_rss_items(self, since: Optional[datetime] = None, segment: int = 0,
+                       total_segments: int = 1) -> List[RSSItem]:
+        """
+        Retrieve one segment of the RSSItems, optionally only those published after since.
+
+        Args:
+            since (Optional[datetime]): Timezone-aware lower bound (exclusive) of pub_date.
+            segment (int): Segment to read, from 0 to total_segments - 1.
+            total_segments (int): Number of disjoint segments the table is split into.
+
+        Returns:
+            List[RSSItem]: The RSSItems of the segment.
+        """
+        sql, params = "SELECT * FROM rss_items WHERE rowid % ? = ?", [total_segments, segment]
+        if since is not None:
+            sql += " AND pub_date > ?"
+            params.append(since.astimezone(timezone.utc).isoformat())
+        return self._convert_scanned(self._query(sql, tuple(params)),
+                                     lambda row: RSSItem.from_dynamodb_item(self._decode_rss_item_row(row)), "rss")
+
+    def scan_posts(self, since: Optional[datetime] = None, segment: int = 0, total_segments: int = 1) -> List[Post]:
+        """
+        Retrieve one segment of the posts, optionally only those created after since.
+
+        Args:
+            since (Optional[datetime]): Lower bound (exclusive) of post_time, in its stored form.
+            segment (int): Segment to read, from 0 to total_segments - 1.
+            total_segments (int): Number of disjoint segments the table is split into.
+
+        Returns:
+            List[Post]: The posts of the segment.
+        """
+        sql, params = "SELECT * FROM posts WHERE rowid % ? = ?", [total_segments, segment]
+        if since is not None:
+            sql += " AND post_time > ?"
+            params.append(since.isoformat())
+        return self._convert_scanned(self._query(sql, tuple(params)),
+                                     lambda row: Post.from_dynamodb_item(self._decode_post_row(row)), "posts")
+
+    def delete_rss_items(self, items: List[RSSItem]) -> int:
+        """
+        Delete RSSItems by id.
+
+        Args:
+            items (List[RSSItem]): The items to delete.
+
+        Returns:
+            int: The number of rows deleted.
+        """
+        deleted = 0
+        ids = [str(item.id) for item in items]
+        # Stay below SQLite's limit on bound parameters.
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            deleted += self._execute(f"DELETE FROM rss_items WHERE id IN ({', '.join('?' for _ in chunk)})",
+                                     tuple(chunk))
+        self.logger.info("Deleted %s RSS items.", deleted)
+        return deleted
+
+    def save_post(self, post: Post) -> None:
+        """
+        Save a Post object to SQLite.
+
+        Args:
+            post (Post): Post object to save.
+
+        Raises:
+            sqlite3.Error: If the write failed; the posting journal records the stage as failed.
+        """
+        self.logger.info("Saving post with ID: %s", post.id)
+        data = post.model_dump()
+        data['tags'] = json.dumps(data['tags'])
+        try:
+            self._upsert('posts', _POST_COLUMNS, data)
+            self.logger.debug("Post saved successfully with ID: %s", post.id)
+        except sqlite3.Error as e:
+            self.logger.error("Error saving post with ID %s: %s", post.id, e)
+            raise
+
+    def _item_exists(self, link: str) -> bool:
+        """
+        Check if an item with the given link exists, using link_index.
+
+        Args:
+            link (str): The link to check.
+
+        Returns:
+            bool: True if the item exists, False otherwise.
+        """
+        rows = self._query("SELECT 1 FROM rss_items WHERE link = ? LIMIT 1", (str(link),))
+        exists = bool(rows)
+        self.logger.debug("Item with link %s exists: %s", link, exists)
+        return exists
+
+    def _add_missing_columns(self) -> None:
+        """ALTER TABLE in the columns of _ADDED_COLUMNS that an older database lacks."""
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row['name'] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in columns.items():
+                if column not in existing:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def _put_rss_item(self, item: RSSItem) -> None:
+        """Insert or replace an RSSItem row."""
+        data = item.model_dump()
+        data['categories'] = json.dumps(data['categories'])
+        self._upsert('rss_items', _RSS_ITEM_COLUMNS, data)
+
+    def _upsert(self, table: str, columns: tuple, data: dict) -> None:
+        """INSERT OR REPLACE the given columns of data into table."""
+        placeholders = ', '.join('?' for _ in columns)
+        sql = f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        with metrics.timer("sqlite_write", table=table), self._lock, self.connection:
+            self.connection.execute(sql, tuple(data.get(column) for column in columns))
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Run a write statement and return the number of changed rows, 0 on errors."""
+        try:
+            with metrics.timer("sqlite_write"), self._lock, self.connection:
+                return self.connection.execute(sql, params).rowcount
+        except sqlite3.Error as e:
+            self.logger.error("Error writing to SQLite: %s", e)
+            return 0
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Run a read query, logging and swallowing database errors like DynamoDBService does."""
+        try:
+            with metrics.timer("sqlite_query"), self._lock:
+                return self.connection.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error("Error querying SQLite: %s", e)
+            return []
+
+    def _convert_scanned(self, rows: List[sqlite3.Row], convert: Callable[[sqlite3.Row], Any], table_name: str) -> list:
+        """Convert scanned rows, skipping and logging the ones that are not valid models, like DynamoDBService."""
+        models = []
+        for row in rows:
+            try:
+                models.append(convert(row))
+            except (KeyError, ValueError) as e:
+                self.logger.error("Skipping unreadable %s row %s: %s", table_name, row['id'], e)
+                metrics.record("unreadable_rows", 1, unit="Count", table=table_name)
+        return models
+
+    def _to_rss_items(self, rows: List[sqlite3.Row]) -> List[RSSItem]:
+        """Convert rss_items rows to RSSItems."""
+        try:
+            return [RSSItem.from_dynamodb_item(self._decode_rss_item_row(row)) for row in rows]
+        except (KeyError, ValueError) as e:
+            self.logger.error("Error converting rows to RSSItems: %s", e)
+            return []
+
+    @staticmethod
+    def _decode_rss_item_row(row: sqlite3.Row) -> dict:
+        """Turn an rss_items row into the dict shape DynamoDB returns."""
+        data = dict(row)
+        data['categories'] = json.loads(data['categories'])
+        return data
+
+    @staticmethod
+    def _decode_post_row(row: sqlite3.Row) -> dict:
+        """Turn a posts row into the dict shape DynamoDB returns."""
+        data = dict(row)
+        data['tags'] = json.loads(data['tags'])
+        return data
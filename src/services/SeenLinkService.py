@@ -0,0 +1,150 @@
+import bisect
+import hashlib
+import logging
+import os
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.models.RSSItem import RSSItem
+from src.services.StorageBackend import BlobNotFoundError, FeedBlobStore
+from src.utils import metrics
+
+# ==============================================================
+# Seen-link filter.
+#
+# A sorted array of 64-bit hashes of the canonical links of every
+# item saved so far, kept as a snapshot in the blob store and loaded
+# once per process. Feed items whose link is in it are dropped in
+# memory, so only probably-new items reach the item repository and
+# its per-item existence query.
+#
+# Exact hashes rather than a Bloom filter: a false positive would
+# silently drop a new story, and at 64 bits one is never expected.
+# Links are added once the repository confirmed them stored, newly
+# saved or found already there; a failed save is retried.
+#
+# Snapshot: MAGIC followed by the sorted hashes as little-endian
+# unsigned 64-bit integers. Saving merges with the stored snapshot,
+# so concurrent writers only ever add links.
+# ==============================================================
+
+MAGIC = b"SLF1"
+
+# Query parameters that only track where a reader came from.
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+
+def canonical_link(link: str) -> str:
+    """Normalize a link: lower-case scheme and host, no fragment, tracking parameters or trailing slash."""
+    parts = urlsplit(link.strip())
+    query = urlencode([(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not name.lower().startswith(_TRACKING_PARAMS)])
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def link_hash(link: str) -> int:
+    """64-bit hash of the canonical form of link."""
+    digest = hashlib.blake2b(canonical_link(link).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class SeenLinkService:
+    """Remembers which item links are already stored, persisted in the blob store."""
+
+    # Snapshot URL -> (sorted hashes, hashes added since), shared by every instance in the process.
+    _loaded: Dict[str, Tuple[array, Set[int]]] = {}
+
+    def __init__(self, feed_store: FeedBlobStore, bucket_name: Optional[str] = None, key: Optional[str] = None):
+        """
+        Initialize the SeenLinkService.
+
+        Args:
+            feed_store (FeedBlobStore): Where the snapshot is kept.
+            bucket_name (Optional[str]): Bucket of the snapshot. Defaults to S3_BUCKET_NAME.
+            key (Optional[str]): Key of the snapshot. Defaults to SEEN_LINKS_KEY or state/seen_links.bin.
+        """
+        self.logger = logging.getLogger("AppLogger")
+        self.feed_store = feed_store
+        self.bucket_name = bucket_name or os.getenv("S3_BUCKET_NAME", "linkedin-post-rss-feed")
+        self.key = key or os.getenv("SEEN_LINKS_KEY", "state/seen_links.bin")
+        # The URL tells stores apart, e.g. two local directories with the same bucket name.
+        self._location = feed_store.public_url(self.bucket_name, self.key)
+        self._hashes = array('Q')
+        self._added: Set[int] = set()
+
+    def load(self) -> None:
+        """Read the snapshot, unless this process already has; a missing or corrupt snapshot starts empty."""
+        cached = self._loaded.get(self._location)
+        if cached is None:
+            with metrics.timer("seen_links_load"):
+                cached = (self._read(), set())
+            self._loaded[self._location] = cached
+            self.logger.info("Loaded %s seen links from %s.", len(cached[0]), self.key)
+        self._hashes, self._added = cached
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._added)
+
+    def __contains__(self, link: str) -> bool:
+        return self._contains(link_hash(link))
+
+    def filter_new(self, items: Iterable[RSSItem]) -> List[RSSItem]:
+        """
+        Drop the items whose link was seen before.
+
+        Args:
+            items (Iterable[RSSItem]): Items from the feeds.
+
+        Returns:
+            List[RSSItem]: The items that are probably not stored yet, in order.
+        """
+        items = list(items)
+        new_items = [item for item in items if not self._contains(link_hash(str(item.link)))]
+        metrics.record("seen_links_rejected", len(items) - len(new_items), unit="Count")
+        metrics.record("seen_links_passed", len(new_items), unit="Count")
+        return new_items
+
+    def add(self, items: Iterable[RSSItem]) -> None:
+        """Remember the links of items that are now stored."""
+        for item in items:
+            value = link_hash(str(item.link))
+            if not self._contains(value):
+                self._added.add(value)
+
+    def save(self) -> None:
+        """Merge the links added since the last save into the stored snapshot and write it back."""
+        if not self._added:
+            return
+        with metrics.timer("seen_links_save"):
+            merged = sorted(set(self._read()) | set(self._hashes) | self._added)
+            self._hashes = array('Q', merged)
+            body = array('Q', merged)
+            if sys.byteorder != 'little':
+                body.byteswap()
+            self.feed_store.put_object(self.bucket_name, self.key, MAGIC + body.tobytes(),
+                                       content_type='application/octet-stream')
+        self.logger.info("Saved %s seen links (%s new) to %s.", len(merged), len(self._added), self.key)
+        self._added = set()
+        self._loaded[self._location] = (self._hashes, self._added)
+
+    def _contains(self, value: int) -> bool:
+        index = bisect.bisect_left(self._hashes, value)
+        return (index < len(self._hashes) and self._hashes[index] == value) or value in self._added
+
+    def _read(self) -> array:
+        """The stored hashes, sorted; empty if there is no readable snapshot."""
+        hashes = array('Q')
+        try:
+            body = self.feed_store.get_object(self.bucket_name, self.key)
+        except BlobNotFoundError:
+            return hashes
+        if not body.startswith(MAGIC) or (len(body) - len(MAGIC)) % hashes.itemsize:
+            self.logger.warning("Discarding unreadable seen-link snapshot %s.", self.key)
+            return hashes
+        hashes.frombytes(body[len(MAGIC):])
+        if sys.byteorder != 'little':
+            hashes.byteswap()
+        return hashes
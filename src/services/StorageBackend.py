@@ -0,0 +1,356 @@
+import hashlib
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+from xml.etree import ElementTree as ET
+
+from src.models.Post import Post
+from src.models.RSSFeed import RSSFeed
+from src.models.RSSItem import RSSItem
+from src.utils import metrics
+from src.utils.TextUtils import extract_hashtags, format_hashtags
+
+
+# ==============================================================
+# Storage interfaces shared by the AWS services (DynamoDB/S3)
+# and the local ones (SQLite/filesystem).
+#
+# Select the backend with STORAGE_BACKEND=aws|local in .env.
+# The local backend lets the whole pipeline run offline.
+# ==============================================================
+
+
+class BlobNotFoundError(KeyError):
+    """Raised by a FeedBlobStore when the requested object does not exist."""
+
+
+class FeedWriteConflictError(RuntimeError):
+    """Raised when a feed kept changing under update_rss_feed for FEED_WRITE_ATTEMPTS attempts."""
+
+
+class RSSItemRepository(ABC):
+    """Persistence for scraped RSS items."""
+
+    @abstractmethod
+    def save_rss_items(self, items: List[RSSItem], stored: Optional[List[RSSItem]] = None) -> List[RSSItem]:
+        """
+        Save RSSItems whose link is not stored yet. Returns the items that were inserted.
+
+        Items found already stored are appended to stored, if given; items that failed are in neither.
+        """
+
+    @abstractmethod
+    def update_rss_item(self, item: RSSItem) -> None:
+        """Overwrite an existing RSSItem."""
+
+    @abstractmethod
+    def set_rss_item_article_key(self, item: RSSItem, article_key: str) -> bool:
+        """Point a stored RSSItem at its prefetched article blob. Returns False if the item is missing."""
+
+    @abstractmethod
+    def mark_rss_item_processed(self, item: RSSItem, owner: Optional[str] = None) -> bool:
+        """
+        Mark an unprocessed RSSItem as processed and drop its lease.
+
+        Returns False if it was missing, already processed, or (when owner is given)
+        not leased by owner.
+        """
+
+    @abstractmethod
+    def claim_rss_item(self, item: RSSItem, owner: str, lease_seconds: int) -> bool:
+        """Lease an unprocessed RSSItem to owner unless another worker holds an unexpired lease."""
+
+    @abstractmethod
+    def renew_rss_item_lease(self, item: RSSItem, owner: str, lease_seconds: int) -> bool:
+        """Extend owner's lease. Returns False if owner lost it."""
+
+    @abstractmethod
+    def release_rss_item_lease(self, item: RSSItem, owner: str) -> bool:
+        """Drop owner's lease without processing the item."""
+
+    @abstractmethod
+    def migrate_unprocessed_index(self) -> int:
+        """Bring stored items to the sparse unprocessed index layout. Returns the number of items changed."""
+
+    @abstractmethod
+    def get_rss_item(self, item_id: str) -> Optional[RSSItem]:
+        """Return the stored RSSItem with this id, or None."""
+
+    @abstractmethod
+    def get_random_unprocessed_item(self) -> Optional[RSSItem]:
+        """Return a random unprocessed RSSItem, or None."""
+
+    @abstractmethod
+    def get_last_unprocessed_rss_items(self, amount: int, exclude_leased: bool = False) -> List[RSSItem]:
+        """Return the newest unprocessed RSSItems, newest first, optionally skipping leased ones."""
+
+    @abstractmethod
+    def get_rss_items(self) -> List[RSSItem]:
+        """Return every stored RSSItem."""
+
+    @abstractmethod
+    def get_rss_items_published_before(self, cutoff: datetime) -> List[RSSItem]:
+        """Return every stored RSSItem whose pub_date lies before cutoff."""
+
+    @abstractmethod
+    def delete_rss_items(self, items: List[RSSItem]) -> int:
+        """Delete stored RSSItems by id. Returns the number of items deleted."""
+
+    @abstractmethod
+    def scan_rss_items(self, since: Optional[datetime] = None, segment: int = 0,
+                       total_segments: int = 1) -> List[RSSItem]:
+        """
+        Return the RSSItems of one of total_segments disjoint segments of the store,
+        only those with pub_date after since if given. Segments can be read in parallel.
+        """
+
+
+class PostRepository(ABC):
+    """Persistence for generated posts."""
+
+    @abstractmethod
+    def save_post(self, post: Post) -> None:
+        """Save a Post. Raises if it was not saved, so a lost post is never taken for a saved one."""
+
+    @abstractmethod
+    def get_latest_posts(self, amount: int, persona: Optional[str] = None) -> List[Post]:
+        """Return the latest posts, newest first; only those of persona if given ('' is the default persona)."""
+
+    @abstractmethod
+    def scan_posts(self, since: Optional[datetime] = None, segment: int = 0, total_segments: int = 1) -> List[Post]:
+        """Like RSSItemRepository.scan_rss_items, for posts with post_time after since."""
+
+
+class FeedBlobStore(ABC):
+    """
+    Object storage holding YOUR RSS feed.
+
+    Subclasses only provide raw object access; the feed handling itself
+    is shared so both backends produce the exact same XML.
+    """
+
+    logger = logging.getLogger("AppLogger")
+
+    # Makes the default put_object_if_unchanged atomic within a process.
+    _conditional_put_lock = threading.Lock()
+
+    @abstractmethod
+    def get_object(self, bucket_name: str, key: str) -> bytes:
+        """
+        Read an object.
+
+        Raises:
+            BlobNotFoundError: If the object does not exist.
+        """
+
+    @abstractmethod
+    def put_object(self, bucket_name: str, key: str, body: bytes, content_type: str = "application/octet-stream") -> None:
+        """Create or overwrite an object."""
+
+    @abstractmethod
+    def list_objects(self, bucket_name: str, prefix: str = "") -> List[str]:
+        """Return the keys of all objects starting with prefix."""
+
+    @abstractmethod
+    def delete_object(self, bucket_name: str, key: str) -> None:
+        """Delete an object. Deleting a missing object is not an error."""
+
+    @abstractmethod
+    def public_url(self, bucket_name: str, key: str) -> str:
+        """Return the URL under which an object is served to feed readers."""
+
+    def get_object_version(self, bucket_name: str, key: str) -> Tuple[bytes, str]:
+        """
+        Read an object and the version put_object_if_unchanged compares against.
+
+        The default version is the MD5 hex digest of the body.
+
+        Raises:
+            BlobNotFoundError: If the object does not exist.
+        """
+        body = self.get_object(bucket_name, key)
+        return body, hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+    def put_object_if_unchanged(self, bucket_name: str, key: str, body: bytes, version: Optional[str],
+                                content_type: str = "application/octet-stream") -> bool:
+        """
+        Write an object only if it is still at version, as read by get_object_version.
+
+        Args:
+            version (Optional[str]): The version the write is based on; None if the object did not exist.
+
+        Returns:
+            bool: False if the object changed in the meantime and nothing was written.
+        """
+        # Only atomic within this process; S3Service overrides it with a conditional request.
+        with self._conditional_put_lock:
+            try:
+                current = self.get_object_version(bucket_name, key)[1]
+            except BlobNotFoundError:
+                current = None
+            if current != version:
+                return False
+            self.put_object(bucket_name, key, body, content_type)
+            return True
+
+    def update_rss_feed(self, bucket_name: str, key: str, post: Post, feed: Optional[RSSFeed] = None,
+                        outlet: Optional[str] = None) -> str:
+        """
+        Updates the RSS feed XML file with the new post at the top.
+
+        Idempotent: a post already in the feed (by its guid, the post id) is not added again.
+        Workers finishing items at the same time write the same feed, so the write is
+        conditional on the feed read; if another write came first the feed is read and
+        the post added again, up to FEED_WRITE_ATTEMPTS (default 5) times.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            key (str): The key of the RSS feed file.
+            post (Post): The new post to add to the RSS feed.
+            feed (Optional[RSSFeed]): Channel details used if the feed does not exist yet. Defaults to RSSFeed().
+            outlet (Optional[str]): The source shown under the post, the item's outlet. Defaults to the
+                host name of the post's source link.
+
+        Returns:
+            str: The MD5 hex digest of the feed as written, which S3 reports as its ETag.
+
+        Raises:
+            FeedWriteConflictError: If every attempt lost to a concurrent write.
+        """
+        self.logger.info("Starting RSS feed update for bucket '%s', key '%s'.", bucket_name, key)
+        attempts = int(os.getenv("FEED_WRITE_ATTEMPTS", "5"))
+        for attempt in range(1, attempts + 1):
+            digest = self._add_post_to_feed(bucket_name, key, post, feed, outlet)
+            if digest is not None:
+                return digest
+            self.logger.info("RSS feed '%s' changed while adding '%s' (attempt %s of %s); retrying.",
+                             key, post.title, attempt, attempts)
+            metrics.record("feed_write_conflicts", 1, unit="Count")
+        raise FeedWriteConflictError(f"RSS feed {bucket_name}/{key} kept changing; '{post.title}' was not added")
+
+    def _add_post_to_feed(self, bucket_name: str, key: str, post: Post, feed: Optional[RSSFeed],
+                          outlet: Optional[str]) -> Optional[str]:
+        """One read-modify-write of update_rss_feed. Returns the digest, or None if the feed changed meanwhile."""
+        try:
+            root, version = self._get_existing_rss(bucket_name, key)
+            self.logger.debug("Existing RSS feed retrieved successfully.")
+        except BlobNotFoundError as e:
+            self.logger.warning("Failed to retrieve existing RSS feed: %s. Creating a new RSS feed.", e)
+            root, version = self._create_new_rss(feed or RSSFeed()), None
+            self.logger.debug("New RSS feed created.")
+
+        channel = root.find('channel')
+        if channel is not None:
+            self.logger.debug("Channel element found in RSS feed.")
+        else:
+            self.logger.error("Channel element not found in RSS feed.")
+            raise ValueError("Invalid RSS feed structure: 'channel' element is missing.")
+
+        if any(guid.text == str(post.id) for guid in channel.iter('guid')):
+            self.logger.info("Post '%s' is already in the RSS feed.", post.title)
+            body = ET.tostring(root, encoding='unicode', method='xml').encode('utf-8')
+            return hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+        self._update_last_build_date(channel)
+        self.logger.info("Updated lastBuildDate in RSS feed.")
+
+        self._add_new_item(channel, post, outlet)
+        self.logger.info("Added new post titled '%s' to RSS feed.", post.title)
+
+        body = ET.tostring(root, encoding='unicode', method='xml').encode('utf-8')
+        if not self.put_object_if_unchanged(bucket_name, key, body, version, content_type='application/rss+xml'):
+            return None
+        self.logger.info("RSS feed successfully updated at '%s/%s'.", bucket_name, key)
+        return hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+    def _get_existing_rss(self, bucket_name: str, key: str) -> Tuple[ET.Element, str]:
+        """Retrieves and parses the existing RSS feed. Returns it with its version."""
+        self.logger.debug("Fetching existing RSS feed from bucket '%s', key '%s'.", bucket_name, key)
+        body, version = self.get_object_version(bucket_name, key)
+        parser = ET.XMLParser(encoding="utf-8")
+        root = ET.fromstring(body.decode('utf-8'), parser=parser)
+        self.logger.debug("Existing RSS feed parsed successfully.")
+        return root, version
+
+    def _create_new_rss(self, rss_feed: RSSFeed) -> ET.Element:
+        """Creates a new RSS feed structure."""
+        self.logger.debug("Creating a new RSS feed structure.")
+        root = ET.Element('rss', version='2.0')
+        channel = ET.SubElement(root, 'channel')
+
+        for field, value in rss_feed.model_dump().items():
+            ET.SubElement(channel, field).text = value
+            self.logger.debug("Added '%s' to channel with value '%s'.", field, value)
+
+        pub_date = self._format_datetime(datetime.now(timezone.utc))
+        ET.SubElement(channel, 'pubDate').text = pub_date
+        self.logger.debug("Set 'pubDate' to '%s' in new RSS feed.", pub_date)
+        return root
+
+    def _update_last_build_date(self, channel: ET.Element) -> None:
+        """Updates the lastBuildDate element in the RSS feed."""
+        self.logger.debug("Updating 'lastBuildDate' in RSS feed.")
+        last_build_date = channel.find('lastBuildDate')
+        formatted_date = self._format_datetime(datetime.now(timezone.utc))
+        if last_build_date is None:
+            ET.SubElement(channel, 'lastBuildDate').text = formatted_date
+            self.logger.debug("'lastBuildDate' element created and set.")
+        else:
+            last_build_date.text = formatted_date
+            self.logger.debug("'lastBuildDate' element updated.")
+
+    def _add_new_item(self, channel: ET.Element, post: Post, outlet: Optional[str] = None) -> None:
+        """Adds a new item to the RSS feed based on the provided post."""
+        self.logger.debug("Adding new item for post titled '%s'.", post.title)
+        item = ET.Element('item')
+        ET.SubElement(item, 'title').text = post.title
+        ET.SubElement(item, 'link').text = str(post.source_link)
+        ET.SubElement(item, 'guid', isPermaLink='false').text = str(post.id)
+        ET.SubElement(item, 'image_link').text = str(post.image_link)
+
+        content, _ = extract_hashtags(post.content)
+        source = outlet or (urlparse(str(post.source_link)).hostname or '').removeprefix('www.')
+        description = f"{content}\n\nSource: {source}\n{format_hashtags(post.tags)}"
+        ET.SubElement(item, 'description').text = description
+        ET.SubElement(item, 'pubDate').text = self._format_datetime(datetime.now(timezone.utc))
+
+        channel.insert(0, item)
+        self.logger.debug("New item for post titled '%s' inserted at the top of the channel.", post.title)
+
+    @staticmethod
+    def _format_datetime(dt: datetime) -> str:
+        """Formats a datetime object to a string suitable for RSS feeds."""
+        return dt.strftime('%a, %d %b %Y %H:%M:%S %z')
+
+
+def _use_local_backend() -> bool:
+    """Whether STORAGE_BACKEND selects the local SQLite/filesystem backend."""
+    return os.getenv("STORAGE_BACKEND", "aws").lower() == "local"
+
+
+def get_database_service():
+    """
+    Create the item/post repository for the configured backend.
+
+    Returns:
+        DynamoDBService or SQLiteService, both implementing RSSItemRepository and PostRepository.
+    """
+    # Imported lazily so the local backend does not require boto3.
+    if _use_local_backend():
+        from src.services.SQLiteService import SQLiteService
+        return SQLiteService()
+    from src.services.DynamoDBService import DynamoDBService
+    return DynamoDBService()
+
+
+def get_feed_store() -> FeedBlobStore:
+    """Create the feed blob store for the configured backend (S3Service or FileSystemService)."""
+    if _use_local_backend():
+        from src.services.FileSystemService import FileSystemService
+        return FileSystemService()
+    from src.services.S3Service import S3Service
+    return S3Service()
@@ -0,0 +1,127 @@
+from typing import Dict, List, Optional
+
+# ==============================================================
+# Incremental scanning of a streamed JSON object.
+#
+# The scanner is fed the completion text chunk by chunk and keeps
+# track of the top-level keys, the type of each top-level value and
+# the (partial) text of top-level string values, so a caller can
+# reject a response long before the stream ends. It only tracks
+# structure; the finished text is still parsed with json.loads.
+# ==============================================================
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_OPENERS = {'{': 'object', '[': 'array'}
+
+
+class InvalidStreamError(ValueError):
+    """Raised when streamed output can no longer become an acceptable response."""
+
+    def __init__(self, reason: str, detail: str = ""):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+
+
+class IncrementalObjectScanner:
+    """Tracks the top-level structure of a JSON object while it is being streamed."""
+
+    def __init__(self):
+        self.length = 0
+        self.complete = False
+        self.keys: List[str] = []
+        self.value_types: Dict[str, str] = {}
+        self._strings: Dict[str, List[str]] = {}
+        self._started = False
+        self._depth = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._unicode: Optional[str] = None
+        self._chars: List[str] = []
+
+    def feed(self, text: str) -> None:
+        """
+        Consume the next chunk of the stream.
+
+        Raises:
+            InvalidStreamError: If the text is not a single JSON object.
+        """
+        self.length += len(text)
+        for char in text:
+            self._step(char)
+
+    def string_value(self, key: str) -> str:
+        """The text received so far of the top-level string value of key ('' if none yet)."""
+        return ''.join(self._strings.get(key, ()))
+
+    def _step(self, char: str) -> None:
+        if self._in_string:
+            self._step_in_string(char)
+            return
+        if char.isspace():
+            return
+        if self.complete:
+            raise InvalidStreamError("trailing data", "text after the closing brace")
+        if not self._started:
+            if char != '{':
+                raise InvalidStreamError("not an object", f"starts with {char!r}")
+            self._started = True
+            self._depth = 1
+            self._expect_key = True
+            return
+
+        top_level = self._depth == 1
+        if char == '"':
+            self._in_string = True
+            self._string_is_key = top_level and self._expect_key
+            self._chars = []
+            if top_level and not self._expect_key:
+                self._set_type('string')
+                self._strings[self._key] = self._chars
+        elif char in _OPENERS:
+            if top_level:
+                self._set_type(_OPENERS[char])
+            self._depth += 1
+        elif char in '}]':
+            self._depth -= 1
+            if self._depth == 0:
+                self.complete = True
+        elif top_level and char == ':':
+            self._expect_key = False
+        elif top_level and char == ',':
+            self._expect_key = True
+        elif top_level:
+            self._set_type('literal')
+
+    def _step_in_string(self, char: str) -> None:
+        if self._unicode is not None:
+            self._unicode += char
+            if len(self._unicode) == 4:
+                self._append(chr(int(self._unicode, 16)) if all(c in '0123456789abcdefABCDEF' for c in self._unicode)
+                             else '�')
+                self._unicode = None
+        elif self._escape:
+            self._escape = False
+            if char == 'u':
+                self._unicode = ''
+            else:
+                self._append(_ESCAPES.get(char, char))
+        elif char == '\\':
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._string_is_key:
+                self._key = ''.join(self._chars)
+                self.keys.append(self._key)
+        else:
+            self._append(char)
+
+    def _append(self, char: str) -> None:
+        if self._depth == 1:
+            self._chars.append(char)
+
+    def _set_type(self, value_type: str) -> None:
+        if self._key is not None:
+            self.value_types.setdefault(self._key, value_type)
@@ -1,5 +1,62 @@
 import logging
 import re
+from typing import List, NamedTuple, Sequence, Tuple
+
+logger = logging.getLogger("AppLogger")
+
+# ==============================================================
+# Text analysis of generated posts.
+#
+# The markdown patterns are compiled once, at import, into a single
+# alternation, so one scan of the text finds every construct and
+# tells which one it is; detection, listing and stripping all share
+# it. Every alternative starts with a literal character, which lets
+# the regex engine skip straight to the positions where one could
+# start instead of trying each alternative at every character. For
+# that, line-start constructs match from the preceding newline, and
+# the text is scanned with a newline prepended. Their indentation is
+# any whitespace but a newline (\r, \v, \f, Unicode spaces), which
+# detects exactly what the former ^\s patterns did: a match whose \s
+# crossed a newline also matches from that newline.
+#
+# Hashtags are not part of the scan. The trailing hashtag line is
+# delimited by every str.splitlines boundary, and header, link and
+# code alternatives would consume its '#', changing which posts lose
+# their last line in the feed. extract_hashtags splits it off in a
+# separate pass of about 7 us per 2 KB post (benchmarks/text.py).
+# ==============================================================
+
+# (kind, leading literal, rest of the pattern). Alternatives are tried in
+# order, so longer constructs come before the ones they contain.
+_MARKDOWN_PATTERNS: Sequence[Tuple[str, str, str]] = (
+    ('fence', '`', r'``(?P<fence_text>[\s\S]*?)```'),  # Fenced code blocks: ```python ... ```
+    ('code', '`', r'`{0,2}(?P<code_text>[^`]+)`{1,3}'),  # Inline code: `code` or ```code```
+    ('rule', '\n', r'[^\S\n]{0,3}#{3,}\s*$'),  # Horizontal rules: ### or ---
+    ('header', '\n', r'[^\S\n]{0,3}(#{1,6})\s+'),  # Headers: # Header, ## Header, etc.
+    ('unordered_list', '\n', r'[^\S\n]{0,3}[-*+] '),  # Unordered lists: -, *, +
+    ('ordered_list', '\n', r'[^\S\n]*\d+\.\s+'),  # Ordered lists: 1., 2., etc.
+    ('bold', r'\*', r'\*(?P<bold_text>.*?)\*\*'),  # Bold: **bold**
+    ('italic', r'\*', r'(?P<italic_text>.*?)\*'),  # Italic: *italic*
+    ('underline_bold', '_', r'_(?P<underline_bold_text>.*?)__'),  # Bold: __bold__
+    ('underline_italic', '_', r'(?P<underline_italic_text>.*?)_'),  # Italic: _italic_
+    ('image', '!', r'\[(?P<image_text>.*?)\]\(.*?\)'),  # Images: ![alt](url)
+    ('link', r'\[', r'(?P<link_text>.*?)\]\(.*?\)'),  # Links: [text](url)
+    ('blockquote', '>', r'\s+'),  # Blockquotes: > quote
+    ('strikethrough', '~', r'~(?P<strikethrough_text>.*?)~~'),  # Strikethrough: ~~text~~
+)
+
+# The kind group follows the leading literal and closes last, so match.lastgroup is the kind.
+_MARKDOWN = re.compile('|'.join(f'{lead}(?P<{kind}>{rest})' for kind, lead, rest in _MARKDOWN_PATTERNS),
+                       re.MULTILINE | re.DOTALL)
+_LINE_KINDS = frozenset(kind for kind, lead, _ in _MARKDOWN_PATTERNS if lead == '\n')
+_HASHTAG = re.compile(r'#(\w+)')
+
+
+class MarkdownMatch(NamedTuple):
+    """One markdown construct found in a text."""
+    kind: str
+    start: int
+    end: int
 
 
 def contains_markdown(text: str) -> bool:
@@ -12,35 +69,74 @@ def contains_markdown(text: str) -> bool:
     Returns:
         bool: True if Markdown formatting is found, False otherwise.
     """
-    logger = logging.getLogger("AppLogger")
-    logger.debug("Checking for Markdown in the provided text.")
-
-    # Define regex patterns for various Markdown elements
-    markdown_patterns = [
-        r'^\s{0,3}(#{1,6})\s+',  # Headers: # Header, ## Header, etc.
-        r'\*\*(.*?)\*\*',  # Bold: **bold**
-        r'\*(.*?)\*',  # Italic: *italic*
-        r'__(.*?)__',  # Bold: __bold__
-        r'_(.*?)_',  # Italic: _italic_
-        r'!\[.*?\]\(.*?\)',  # Images: ![alt](url)
-        r'\[.*?\]\(.*?\)',  # Links: [text](url)
-        r'`{1,3}[^`]+`{1,3}',  # Inline code: `code` or ```code```
-        r'^\s{0,3}[-*+] ',  # Unordered lists: -, *, +
-        r'^\s*\d+\.\s+',  # Ordered lists: 1., 2., etc.
-        r'>\s+',  # Blockquotes: > quote
-        r'^\s{0,3}#{3,}\s*$',  # Horizontal rules: ### or ---
-        r'```[\s\S]*?```',  # Fenced code blocks: ```python ... ```
-        r'~~(.*?)~~',  # Strikethrough: ~~text~~
-    ]
-
-    # Compile the patterns for better performance
-    compiled_patterns = [re.compile(pattern, re.MULTILINE | re.DOTALL) for pattern in markdown_patterns]
-
-    # Check each pattern
-    for pattern in compiled_patterns:
-        if pattern.search(text):
-            logger.debug("Markdown pattern matched: %s", pattern.pattern)
-            return True
-
-    logger.debug("No Markdown patterns matched.")
-    return False
\ No newline at end of file
+    match = _MARKDOWN.search('\n' + text)
+    if match:
+        logger.debug("Markdown pattern matched: %s", match.lastgroup)
+        return True
+    return False
+
+
+def find_markdown(text: str) -> List[MarkdownMatch]:
+    """
+    Lists the Markdown constructs in the text, in one scan.
+
+    Args:
+        text (str): The input string to scan.
+
+    Returns:
+        List[MarkdownMatch]: The non-overlapping constructs, in order of position.
+    """
+    matches = []
+    for match in _MARKDOWN.finditer('\n' + text):
+        # Offsets are shifted by the prepended newline; line constructs start after theirs.
+        start = match.start() if match.lastgroup in _LINE_KINDS else match.start() - 1
+        matches.append(MarkdownMatch(match.lastgroup, start, match.end() - 1))
+    return matches
+
+
+def strip_markdown(text: str) -> str:
+    """
+    Removes Markdown formatting from the text, in one scan.
+
+    Emphasis, links, images and code keep their text; headers, list markers,
+    blockquote markers and rules are dropped. Constructs nested inside another
+    construct are not stripped.
+
+    Args:
+        text (str): The input string.
+
+    Returns:
+        str: The text without Markdown formatting.
+    """
+    return _MARKDOWN.sub(_plain_text, '\n' + text)[1:]
+
+
+def extract_hashtags(text: str) -> Tuple[str, List[str]]:
+    """
+    Splits a trailing hashtag line off the text.
+
+    Args:
+        text (str): Post content whose last line may hold hashtags.
+
+    Returns:
+        Tuple[str, List[str]]: The other lines joined with '\n' and the hashtags on the last one
+        (without '#'), if the last line contains a '#'; otherwise the text unchanged and no hashtags.
+        Lines are split by str.splitlines, as the feed writer always did.
+    """
+    lines = text.splitlines()
+    if not lines or '#' not in lines[-1]:
+        return text, []
+    return '\n'.join(lines[:-1]), _HASHTAG.findall(lines[-1])
+
+
+def format_hashtags(tags: Sequence[str]) -> str:
+    """Renders tags as a line of space-separated hashtags."""
+    return ' '.join(f'#{tag}' for tag in tags)
+
+
+def _plain_text(match: re.Match) -> str:
+    """The text a construct is replaced with when stripping; line constructs keep their newline."""
+    if match.lastgroup in _LINE_KINDS:
+        return '\n'
+    text_group = f'{match.lastgroup}_text'
+    return match.group(text_group) if text_group in match.re.groupindex else ''
@@ -0,0 +1,101 @@
+import logging
+import math
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger("AppLogger")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when too little time is left to start a step."""
+
+
+class Deadline:
+    """
+    Time budget of one invocation.
+
+    Usage:
+        with Deadline.from_lambda_context(context).activate():
+            ...  # anywhere below:
+            timeout = current_deadline().timeout(30)   # 30s, or less if the budget is nearly spent
+            if not current_deadline().allows(60): ...  # stop before starting a long step
+
+    An unbounded deadline (no Lambda context, no --deadline) never shortens a
+    timeout or stops anything. HTTP requests made through
+    src.utils.http_client.get_session and OpenAI requests take their timeouts
+    from the active deadline.
+    """
+
+    def __init__(self, expires_at: Optional[float] = None):
+        """
+        Args:
+            expires_at (Optional[float]): time.monotonic() value at which the budget is spent; None for unbounded.
+        """
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_seconds(cls, seconds: Optional[float]) -> "Deadline":
+        """A deadline seconds from now; unbounded if seconds is None."""
+        return cls(None if seconds is None else time.monotonic() + seconds)
+
+    @classmethod
+    def from_lambda_context(cls, context: object, reserve: Optional[float] = None) -> "Deadline":
+        """
+        The Lambda timeout minus reserve seconds (DEADLINE_RESERVE_SECONDS, default 5).
+
+        The reserve is left for the writes that finish an item once generation is
+        done, so they are not cut off by the Lambda timeout. Without a context
+        (local runs, tests) the deadline is unbounded.
+        """
+        get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+        if get_remaining is None:
+            return cls()
+        reserve = float(os.getenv("DEADLINE_RESERVE_SECONDS", "5")) if reserve is None else reserve
+        return cls.from_seconds(get_remaining() / 1000 - reserve)
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at is not None
+
+    def remaining(self) -> float:
+        """Seconds left; infinite when unbounded, negative once expired."""
+        return math.inf if self.expires_at is None else self.expires_at - time.monotonic()
+
+    def allows(self, seconds: float) -> bool:
+        """Whether a step expected to take seconds can still finish in time."""
+        return self.remaining() >= seconds
+
+    def timeout(self, default: float) -> float:
+        """
+        The timeout for a call that normally gets default seconds: default, capped to the time left.
+
+        Raises:
+            DeadlineExceeded: If the budget is spent.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("deadline exceeded")
+        return min(default, remaining)
+
+    @contextmanager
+    def activate(self) -> Iterator["Deadline"]:
+        """Make this the deadline returned by current_deadline() until the block exits."""
+        global _current
+        previous, _current = _current, self
+        try:
+            yield self
+        finally:
+            _current = previous
+            if self.bounded:
+                logger.debug("Deadline released with %.1fs left.", self.remaining())
+
+
+# Process-wide rather than a context variable, so worker threads (prefetch, lease heartbeat) see it too.
+_current = Deadline()
+
+
+def current_deadline() -> Deadline:
+    """The active deadline; unbounded outside Deadline.activate()."""
+    return _current
@@ -0,0 +1,35 @@
+import os
+import threading
+
+import requests
+
+from src.utils.deadline import current_deadline
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class _DeadlineSession(requests.Session):
+    """Session giving every request a timeout: the caller's or HTTP_TIMEOUT_SECONDS, capped by the deadline."""
+
+    def request(self, method, url, **kwargs):
+        timeout = kwargs.get('timeout') or float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+        kwargs['timeout'] = current_deadline().timeout(timeout)
+        return super().request(method, url, **kwargs)
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide requests.Session.
+
+    Sharing one session keeps connections to feed and article hosts alive
+    between requests, and gives the benchmarks a single place to mount a
+    fixture-replaying transport adapter. Every request gets a timeout that
+    respects the active deadline (see src.utils.deadline).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _DeadlineSession()
+    return _session
@@ -0,0 +1,69 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+
+from src.models.RSSItem import RSSItem
+
+logger = logging.getLogger("AppLogger")
+
+
+def default_worker_id() -> str:
+    """WORKER_ID from the environment, else host:pid plus a random suffix (unique per process)."""
+    return os.getenv("WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class ItemLease:
+    """
+    Holds a claim on an RSSItem while it is being processed.
+
+    Usage:
+        lease = ItemLease(db_service, item, owner, lease_seconds=120)
+        if lease.acquire():
+            with lease:
+                ...  # generate and publish
+                db_service.mark_rss_item_processed(item, owner)
+
+    While held, a daemon thread renews the lease every lease_seconds / 3, so a
+    slow OpenAI call does not let it expire. If the worker dies, renewals stop
+    and the item becomes claimable again once the lease runs out. On exit the
+    lease is released; after mark_rss_item_processed it is already gone and the
+    release is a no-op. The heartbeat calls db_service from its own thread, which
+    the repositories allow: DynamoDBService gives every thread its own resource
+    and SQLiteService serialises calls on a lock.
+    """
+
+    def __init__(self, db_service, item: RSSItem, owner: str, lease_seconds: int = 120):
+        self.db_service = db_service
+        self.item = item
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def acquire(self) -> bool:
+        """Claim the item. Returns False if another worker holds it or it is already processed."""
+        return self.db_service.claim_rss_item(self.item, self.owner, self.lease_seconds)
+
+    def __enter__(self) -> "ItemLease":
+        self._heartbeat = threading.Thread(target=self._renew_loop, name="lease-heartbeat", daemon=True)
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._heartbeat.join()
+        if not self.item.processed:
+            self.db_service.release_rss_item_lease(self.item, self.owner)
+
+    def _renew_loop(self) -> None:
+        interval = max(self.lease_seconds / 3, 1)
+        while not self._stop.wait(interval):
+            if self.item.processed:
+                return
+            if not self.db_service.renew_rss_item_lease(self.item, self.owner, self.lease_seconds):
+                self.lost = True
+                logger.warning("Lost lease on %s; another worker may pick it up.", self.item.link)
+                return
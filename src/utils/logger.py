@@ -1,5 +1,12 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 # Optional: Import colorama for cross-platform color support
 try:
@@ -8,6 +15,24 @@ try:
 except ImportError:
     colorama = None
 
+# ==============================================================
+# Logging is configured through the environment:
+#
+# LOG_LEVEL   DEBUG, INFO, WARNING, ... (default INFO)
+# LOG_FORMAT  color (human readable) or json (one object per line,
+#             no ANSI codes). Defaults to json on Lambda.
+# LOG_ASYNC   1 to format and write records on a background thread
+#             via QueueHandler/QueueListener. Defaults to 1 on Lambda.
+#
+# Call sites should log lazily, e.g. logger.debug("Saved %s", link),
+# so filtered records are never formatted.
+# ==============================================================
+
+_ON_LAMBDA = bool(os.getenv("AWS_EXECUTION_ENV"))
+
+_listener: Optional[QueueListener] = None
+
+
 # Define ANSI color codes
 class LogColors:
     RESET = "\033[0m"
@@ -18,65 +43,126 @@ class LogColors:
     RED = "\033[91m"      # ERROR
     MAGENTA = "\033[95m"  # CRITICAL
 
+
 class ColorColumnFormatter(logging.Formatter):
+    # Built once: per level, a format string with the colour codes already in place.
+    _LINE_FORMATS = {
+        level: f"{color}{{time:<20}} | {level:<8} | {{filename:<20}} | {{message:<50}}{LogColors.RESET}"
+        for level, color in (("ERROR", LogColors.RED), ("CRITICAL", LogColors.MAGENTA))
+    }
+    _LINE_FORMATS.update({
+        level: (f"{LogColors.GRAY}{{time:<20}}{LogColors.RESET} | "
+                f"{color}{level:<8}{LogColors.RESET} | "
+                f"{LogColors.GRAY}{{filename:<20}}{LogColors.RESET} | "
+                f"{LogColors.GRAY}{{message:<50}}{LogColors.RESET}")
+        for level, color in (("DEBUG", LogColors.CYAN), ("INFO", LogColors.BLUE), ("WARNING", LogColors.YELLOW))
+    })
+
     def format(self, record):
-        # Format the timestamp
-        time_str = self.formatTime(record, '%Y-%m-%d %H:%M:%S')
+        line_format = self._LINE_FORMATS.get(record.levelname)
+        if line_format is None:
+            line_format = (f"{LogColors.GRAY}{{time:<20}} | {record.levelname:<8} | "
+                           f"{{filename:<20}} | {{message:<50}}{LogColors.RESET}")
+
         message = record.getMessage()
-        level = record.levelname
-        filename = record.filename  # Get the filename
-
-        # Optional: Get the function name or line number
-        # function = record.funcName
-        # lineno = record.lineno
-
-        if level == 'ERROR':
-            # Entire line in red
-            color = LogColors.RED
-            formatted = f"{color}{time_str:<20} | {level:<8} | {filename:<20} | {message:<50}{LogColors.RESET}"
-        elif level == 'CRITICAL':
-            # Entire line in magenta
-            color = LogColors.MAGENTA
-            formatted = f"{color}{time_str:<20} | {level:<8} | {filename:<20} | {message:<50}{LogColors.RESET}"
-        else:
-            # Different colors for log levels
-            level_colors = {
-                "DEBUG": LogColors.CYAN,
-                "INFO": LogColors.BLUE,
-                "WARNING": LogColors.YELLOW,
-            }
-            level_color = level_colors.get(level, LogColors.GRAY)
-            time_colored = f"{LogColors.GRAY}{time_str:<20}{LogColors.RESET}"
-            level_colored = f"{level_color}{level:<8}{LogColors.RESET}"
-            filename_colored = f"{LogColors.GRAY}{filename:<20}{LogColors.RESET}"
-            message_colored = f"{LogColors.GRAY}{message:<50}{LogColors.RESET}"
-            formatted = f"{time_colored} | {level_colored} | {filename_colored} | {message_colored}"
-
-        return formatted
-
-def setup_logger(name="AppLogger", level=logging.DEBUG):
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+
+        return line_format.format(
+            time=self.formatTime(record, '%Y-%m-%d %H:%M:%S'),
+            filename=record.filename,
+            message=message,
+        )
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, without ANSI codes, for CloudWatch and other log pipelines."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "file": record.filename,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves message interpolation to the listener thread.
+
+    The stock handler calls format() in prepare(), i.e. on the logging thread.
+    Our call sites pass immutable arguments (str, int, links), so the record can
+    be enqueued as-is.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def _resolve_level(level) -> int:
+    """Turn a level name or number into a logging level, falling back to INFO."""
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(str(level).upper())
+    return resolved if isinstance(resolved, int) else logging.INFO
+
+
+def setup_logger(name="AppLogger", level=None):
     logger = logging.getLogger(name)
+    level = _resolve_level(level if level is not None else os.getenv("LOG_LEVEL", "INFO"))
     logger.setLevel(level)
 
+    # Avoid adding multiple handlers if the logger already has handlers
+    if logger.handlers:
+        return logger
+
+    log_format = os.getenv("LOG_FORMAT", "json" if _ON_LAMBDA else "color").lower()
+
     # Create Stream Handler (console)
     handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(level)
-    handler.setFormatter(ColorColumnFormatter())
+    handler.setFormatter(JsonFormatter() if log_format == "json" else ColorColumnFormatter())
 
-    # Avoid adding multiple handlers if the logger already has handlers
-    if not logger.handlers:
+    if os.getenv("LOG_ASYNC", "1" if _ON_LAMBDA else "0") == "1":
+        global _listener
+        # The request thread only enqueues; formatting and I/O happen on the listener thread.
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(DeferredQueueHandler(log_queue))
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    else:
         logger.addHandler(handler)
 
+    # Records are fully handled here; don't also pass them to the root logger.
+    logger.propagate = False
     return logger
 
 
+def flush_logs() -> None:
+    """
+    Write out every queued record.
+
+    Call at the end of a Lambda invocation: the sandbox may be frozen right
+    after the handler returns, before the listener thread drains the queue.
+    """
+    if _listener is not None:
+        _listener.stop()
+        _listener.start()
+
+
 # Example Usage
 if __name__ == "__main__":
-    logger = setup_logger()
+    logger = setup_logger(level=logging.DEBUG)
 
     # Log messages of various levels
     logger.debug("This is a debug message.")
     logger.info("This is an info message.")
     logger.warning("This is a warning message.")
     logger.error("This is an error message.")
-    logger.critical("This is a critical message.")
\ No newline at end of file
+    logger.critical("This is a critical message.")
+    flush_logs()
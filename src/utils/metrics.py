@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# ==============================================================
+# Lightweight timing instrumentation.
+#
+# Wrap external calls and pipeline stages in `timer(...)` and record
+# other values (token counts, ...) with `record(...)`. `flush()` emits
+# everything collected since the last flush to the configured sink and
+# logs an end-of-invocation summary.
+#
+# METRICS_SINK:
+#   emf        CloudWatch Embedded Metric Format JSON lines on stdout
+#   prometheus Prometheus text file at METRICS_PROMETHEUS_FILE
+#   none       summary log line only
+# Defaults to emf on Lambda and none elsewhere.
+# ==============================================================
+
+logger = logging.getLogger("AppLogger")
+
+MetricKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+_EMF_MAX_VALUES = 100  # CloudWatch limit of values per metric per log line
+
+
+class MetricsRegistry:
+    """Thread-safe in-memory store of metric samples, grouped by name, unit and dimensions."""
+
+    def __init__(self, namespace: str = "LinkedInfluencer"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._samples: Dict[MetricKey, List[float]] = defaultdict(list)
+
+    def record(self, name: str, value: float, unit: str = "Milliseconds", **dimensions) -> None:
+        """
+        Record one sample.
+
+        Args:
+            name (str): Metric name, e.g. 'feed_fetch'.
+            value (float): The sample.
+            unit (str): CloudWatch unit name.
+            **dimensions: Dimension values, e.g. outlet='TechCrunch'.
+        """
+        key = (name, unit, tuple(sorted((k, str(v)) for k, v in dimensions.items())))
+        with self._lock:
+            self._samples[key].append(value)
+
+    @contextmanager
+    def timer(self, name: str, **dimensions) -> Iterator[None]:
+        """Record the duration of the enclosed block in milliseconds. Failures add status='error'."""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if status == "error":
+                dimensions["status"] = status
+            self.record(name, elapsed_ms, **dimensions)
+
+    def drain(self) -> Dict[MetricKey, List[float]]:
+        """Return all samples and reset the registry."""
+        with self._lock:
+            samples, self._samples = self._samples, defaultdict(list)
+        return samples
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-metric statistics over the current samples, ignoring dimensions."""
+        merged: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+        with self._lock:
+            for (name, unit, _), values in self._samples.items():
+                merged[(name, unit)].extend(values)
+        return {name: _stats(values, unit) for (name, unit), values in merged.items()}
+
+    def flush(self) -> None:
+        """Emit the collected samples to the configured sink, log a summary, and reset."""
+        summary = self.summary()
+        samples = self.drain()
+        if not samples:
+            return
+
+        sink = os.getenv("METRICS_SINK", "emf" if os.getenv("AWS_EXECUTION_ENV") else "none").lower()
+        try:
+            if sink == "emf":
+                self._emit_emf(samples)
+            elif sink == "prometheus":
+                self._write_prometheus(samples, os.getenv("METRICS_PROMETHEUS_FILE", "metrics.prom"))
+        except OSError as e:
+            logger.error("Failed to emit metrics to %s sink: %s", sink, e)
+
+        logger.info("Invocation summary: %s", _format_summary(summary))
+
+    def _emit_emf(self, samples: Dict[MetricKey, List[float]]) -> None:
+        """Print one EMF JSON line per metric and dimension set."""
+        timestamp = int(time.time() * 1000)
+        for (name, unit, dims), values in samples.items():
+            for start in range(0, len(values), _EMF_MAX_VALUES):
+                document = {
+                    "_aws": {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [{
+                            "Namespace": self.namespace,
+                            "Dimensions": [[k for k, _ in dims]],
+                            "Metrics": [{"Name": name, "Unit": unit}],
+                        }],
+                    },
+                    name: values[start:start + _EMF_MAX_VALUES],
+                    **dict(dims),
+                }
+                sys.stdout.write(json.dumps(document) + "\n")
+        sys.stdout.flush()
+
+    def _write_prometheus(self, samples: Dict[MetricKey, List[float]], path: str) -> None:
+        """Write a Prometheus text file (summaries), atomically for the textfile collector."""
+        prefix = self.namespace.lower()
+        lines = []
+        typed = set()
+        for (name, unit, dims), values in sorted(samples.items()):
+            metric = f"{prefix}_{name}" if unit in ("Count", "None") else f"{prefix}_{name}_{unit.lower()}"
+            labels = ",".join(f'{k}="{v}"' for k, v in dims)
+            stats = _stats(values, unit)
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            for quantile, stat in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+                label_set = ",".join(filter(None, [labels, f'quantile="{quantile}"']))
+                lines.append(f"{metric}{{{label_set}}} {stats[stat]}")
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{metric}_sum{suffix} {stats['sum']}")
+            lines.append(f"{metric}_count{suffix} {stats['count']}")
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _stats(values: List[float], unit: str) -> Dict[str, float]:
+    """count/sum/p50/p90/p99/max of values."""
+    ordered = sorted(values)
+    return {
+        "unit": unit,
+        "count": len(ordered),
+        "sum": sum(ordered),
+        "p50": _percentile(ordered, 50),
+        "p90": _percentile(ordered, 90),
+        "p99": _percentile(ordered, 99),
+        "max": ordered[-1],
+    }
+
+
+def _format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """Render the summary sorted by total, largest first."""
+    parts = []
+    for name, stats in sorted(summary.items(), key=lambda kv: kv[1]["sum"], reverse=True):
+        if stats["unit"] == "Milliseconds":
+            parts.append(f"{name}: n={stats['count']} total={stats['sum']:.1f}ms "
+                         f"p50={stats['p50']:.1f}ms max={stats['max']:.1f}ms")
+        else:
+            parts.append(f"{name}: n={stats['count']} total={stats['sum']:g}")
+    return "; ".join(parts)
+
+
+metrics = MetricsRegistry(os.getenv("METRICS_NAMESPACE", "LinkedInfluencer"))
+
+# Module-level shortcuts for the process-wide registry.
+record = metrics.record
+timer = metrics.timer
+flush = metrics.flush